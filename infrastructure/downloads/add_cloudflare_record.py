@@ -1,235 +1,377 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import json
 import sys
+import threading
 import time
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def get_zone_id(auth_token: str, domain: str) -> Optional[str]:
-    """Get Cloudflare zone ID for domain."""
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-    }
-    
-    response = requests.get(
-        "https://api.cloudflare.com/client/v4/zones",
-        headers=headers,
-        params={"name": domain}
-    )
-    
-    if response.status_code == 200:
-        data = response.json()
-        if data["success"] and data["result"]:
-            return data["result"][0]["id"]
-    return None
+API_BASE = "https://api.cloudflare.com/client/v4"
+DOMAIN = "rinawarptech.com"
+DNS_PAGE_SIZE = 5000
+MAX_RETRIES = 5
+SYNC_WORKERS = 8
+BATCH_UNAVAILABLE = {404, 405, 501}
 
-def list_dns_records(auth_token: str, zone_id: str) -> list:
-    """List all DNS records in the zone."""
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-    }
-    
-    response = requests.get(
-        f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records",
-        headers=headers
-    )
-    
-    if response.status_code == 200:
-        data = response.json()
-        if data["success"]:
-            print("\nCurrent DNS Records:")
-            for record in data["result"]:
-                print(f"Name: {record['name']}")
-                print(f"Type: {record['type']}")
-                print(f"Content: {record['content']}")
-                print(f"Proxied: {record['proxied']}")
-                print("---")
-            return data["result"]
-    return []
-
-def update_dns_record(auth_token: str, zone_id: str, record_id: str, name: str, record_type: str, content: str, proxied: bool = False) -> bool:
-    """Update an existing DNS record in Cloudflare zone."""
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-    }
-    
-    # Remove domain from record name if present
-    if name.endswith('.rinawarptech.com'):
-        name = name.replace('.rinawarptech.com', '')
-    
-    data = {
-        "type": record_type,
-        "name": name,
-        "content": content,
-        "ttl": 1,
-        "proxied": proxied
-    }
-    
-    response = requests.put(
-        f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records/{record_id}",
-        headers=headers,
-        json=data
-    )
-    
-    if response.status_code == 200:
-        result = response.json()
-        return result["success"]
-    return False
-
-def list_dns_records(auth_token: str, zone_id: str) -> None:
-    """List all DNS records in the zone."""
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-    }
-    
-    response = requests.get(
-        f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records",
-        headers=headers
-    )
-    
-    if response.status_code == 200:
-        data = response.json()
-        if data["success"]:
-            print("\nCurrent DNS Records:")
-            for record in data["result"]:
-                print(f"Name: {record['name']}")
-                print(f"Type: {record['type']}")
-                print(f"Content: {record['content']}")
-                print(f"Proxied: {record['proxied']}")
-                print("---")
-        return data["result"]
-    return None
-    
-    response = requests.get(
-        "https://api.cloudflare.com/client/v4/zones",
-        headers=headers,
-        params={"name": domain}
-    )
-    
-    if response.status_code == 200:
-        data = response.json()
-        if data["success"] and data["result"]:
-            return data["result"][0]["id"]
-    return None
+# Sync only ever deletes records carrying this comment
+MANAGED_COMMENT = "managed-by: rinawarp add_cloudflare_record.py --sync"
 
-def add_dns_record(auth_token: str, zone_id: str, name: str, record_type: str, content: str, proxied: bool = False) -> bool:
-    """Add DNS record to Cloudflare zone."""
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-    }
-    
-    # Remove domain from validation record name if present
-    if name.endswith('.rinawarptech.com'):
-        name = name.replace('.rinawarptech.com', '')
-    
-    data = {
-        "type": record_type,
-        "name": name,
-        "content": content,
-        "ttl": 1,  # Auto TTL
-        "proxied": proxied
+class CloudflareError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def record_key(name: str, record_type: str) -> Tuple[str, str]:
+    """Index key for a record: fully qualified lowercase name and type."""
+    name = name.rstrip('.').lower()
+    if name != DOMAIN and not name.endswith(f'.{DOMAIN}'):
+        name = f'{name}.{DOMAIN}'
+    return name, record_type.upper()
+
+class CloudflareClient:
+    """Cloudflare API client with a pooled session and an index of zone records."""
+
+    def __init__(self, auth_token: str, pool_size: int = 8):
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {auth_token}",
+            "Content-Type": "application/json",
+        })
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._records: Dict[str, Dict[Tuple[str, str], List[dict]]] = {}
+        self._lock = threading.Lock()
+
+    def request(self, method: str, path: str, **kwargs) -> dict:
+        """Call the API, retrying rate limits and server errors; return the decoded body."""
+        for attempt in range(MAX_RETRIES):
+            response = self.session.request(method, f"{API_BASE}{path}", **kwargs)
+            if response.status_code != 429 and response.status_code < 500:
+                break
+            if attempt == MAX_RETRIES - 1:
+                break
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+            print(f"Cloudflare returned {response.status_code}; retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise CloudflareError(f"{method} {path}: HTTP {response.status_code}", response.status_code)
+        if not response.ok or not data.get("success"):
+            errors = "; ".join(error.get("message", "") for error in data.get("errors", []))
+            raise CloudflareError(f"{method} {path}: HTTP {response.status_code} {errors}".rstrip(),
+                                  response.status_code)
+        return data
+
+    def paginate(self, path: str, params: Optional[dict] = None, per_page: int = DNS_PAGE_SIZE) -> Iterator[dict]:
+        page = 1
+        while True:
+            data = self.request("GET", path, params={**(params or {}), "page": page, "per_page": per_page})
+            yield from data["result"]
+            info = data.get("result_info") or {}
+            if page >= info.get("total_pages", 1):
+                return
+            page += 1
+
+    def get_zone_id(self, domain: str = DOMAIN) -> Optional[str]:
+        """Get Cloudflare zone ID for domain."""
+        zones = self.request("GET", "/zones", params={"name": domain})["result"]
+        return zones[0]["id"] if zones else None
+
+    def records(self, zone_id: str, refresh: bool = False) -> Dict[Tuple[str, str], List[dict]]:
+        """All records in the zone indexed by (name, type), fetched once per client."""
+        if refresh or zone_id not in self._records:
+            index: Dict[Tuple[str, str], List[dict]] = {}
+            for record in self.paginate(f"/zones/{zone_id}/dns_records"):
+                index.setdefault(record_key(record["name"], record["type"]), []).append(record)
+            self._records[zone_id] = index
+        return self._records[zone_id]
+
+    def list_dns_records(self, zone_id: str) -> List[dict]:
+        return [record for records in self.records(zone_id).values() for record in records]
+
+    def find_record(self, zone_id: str, name: str, record_type: str) -> Optional[dict]:
+        matches = self.records(zone_id).get(record_key(name, record_type))
+        return matches[0] if matches else None
+
+    def _remember(self, zone_id: str, record: Optional[dict], replaces: Optional[dict] = None) -> Optional[dict]:
+        with self._lock:
+            if zone_id in self._records:
+                if replaces:
+                    matches = self._records[zone_id].get(record_key(replaces["name"], replaces["type"]), [])
+                    if replaces in matches:
+                        matches.remove(replaces)
+                if record:
+                    self._records[zone_id].setdefault(record_key(record["name"], record["type"]), []).append(record)
+        return record
+
+    def add_dns_record(self, zone_id: str, name: str, record_type: str, content: str,
+                       proxied: bool = False, **fields) -> dict:
+        """Add DNS record to Cloudflare zone."""
+        data = {"type": record_type, "name": record_key(name, record_type)[0], "content": content,
+                "ttl": 1, "proxied": proxied, **fields}
+        record = self.request("POST", f"/zones/{zone_id}/dns_records", json=data)["result"]
+        return self._remember(zone_id, record)
+
+    def update_dns_record(self, zone_id: str, record: dict, content: str,
+                          proxied: bool = False, **fields) -> dict:
+        """Update an existing DNS record in Cloudflare zone."""
+        data = {"type": record["type"], "name": record["name"], "content": content,
+                "ttl": 1, "proxied": proxied, **fields}
+        updated = self.request("PUT", f"/zones/{zone_id}/dns_records/{record['id']}", json=data)["result"]
+        return self._remember(zone_id, updated, replaces=record)
+
+    def delete_dns_record(self, zone_id: str, record: dict) -> None:
+        self.request("DELETE", f"/zones/{zone_id}/dns_records/{record['id']}")
+        self._remember(zone_id, None, replaces=record)
+
+    def batch_dns_records(self, zone_id: str, posts: List[dict], puts: List[dict], deletes: List[dict]) -> dict:
+        """Apply creates, updates and deletes in one atomic batch request."""
+        result = self.request("POST", f"/zones/{zone_id}/dns_records/batch", json={
+            "deletes": [{"id": record["id"]} for record in deletes],
+            "puts": puts,
+            "posts": posts
+        })["result"]
+        # Cheaper to refetch on next use than to replay the batch into the index
+        self._records.pop(zone_id, None)
+        return result
+
+    def upsert_dns_record(self, zone_id: str, name: str, record_type: str, content: str,
+                          proxied: bool = False, **fields) -> Tuple[str, dict]:
+        """Create or update the (name, type) record; returns (action, record)."""
+        existing = self.find_record(zone_id, name, record_type)
+        if not existing:
+            return "created", self.add_dns_record(zone_id, name, record_type, content, proxied, **fields)
+        if (existing["content"].rstrip('.').lower() == content.rstrip('.').lower()
+                and existing.get("proxied", False) == proxied
+                and all(existing.get(key) == value for key, value in fields.items())):
+            return "unchanged", existing
+        return "updated", self.update_dns_record(zone_id, existing, content, proxied, **fields)
+
+@dataclass
+class SyncPlan:
+    creates: List[dict] = field(default_factory=list)
+    updates: List[Tuple[dict, dict]] = field(default_factory=list)  # (existing, desired)
+    deletes: List[dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.creates or self.updates or self.deletes)
+
+def desired_records_from_tfstate(tf_state: dict) -> List[dict]:
+    """Records the Terraform-managed download infrastructure needs in Cloudflare."""
+    desired = {}
+    for resource in tf_state.get('resources', []):
+        for instance in resource.get('instances', []):
+            attributes = instance['attributes']
+            if resource['type'] == 'aws_acm_certificate':
+                for option in attributes.get('domain_validation_options') or []:
+                    record = {
+                        'name': option['resource_record_name'],
+                        'type': option['resource_record_type'],
+                        'content': option['resource_record_value'],
+                        'proxied': False  # DNS only for validation
+                    }
+                    desired[record_key(record['name'], record['type'])] = record
+            elif (resource['type'] == 'aws_cloudfront_distribution' and attributes.get('domain_name')
+                  and (f'downloads.{DOMAIN}' in (attributes.get('aliases') or []) or resource['name'] == 'downloads')):
+                desired[record_key('downloads', 'CNAME')] = {
+                    'name': 'downloads',
+                    'type': 'CNAME',
+                    'content': attributes['domain_name'],
+                    'proxied': True
+                }
+    return list(desired.values())
+
+def load_desired_records(path: str) -> List[dict]:
+    """Desired records from a terraform.tfstate file or a JSON list of records."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'resources' in data:
+        return desired_records_from_tfstate(data)
+    return data
+
+def record_payload(desired: dict) -> dict:
+    return {
+        "type": desired["type"].upper(),
+        "name": record_key(desired["name"], desired["type"])[0],
+        "content": desired["content"],
+        "ttl": desired.get("ttl", 1),
+        "proxied": desired.get("proxied", False),
+        "comment": MANAGED_COMMENT
     }
-    
-    response = requests.post(
-        f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records",
-        headers=headers,
-        json=data
-    )
-    
-    if response.status_code == 200:
-        result = response.json()
-        return result["success"]
-    return False
+
+def plan_sync(client: CloudflareClient, zone_id: str, desired: List[dict], prune: bool = True) -> SyncPlan:
+    """Diff the desired records against the zone (one paginated list call)."""
+    index = client.records(zone_id)
+    plan = SyncPlan()
+    wanted = set()
+    for record in desired:
+        payload = record_payload(record)
+        key = record_key(payload["name"], payload["type"])
+        wanted.add(key)
+        existing = (index.get(key) or [None])[0]
+        if existing is None:
+            plan.creates.append(payload)
+        elif (existing["content"].rstrip('.').lower() != payload["content"].rstrip('.').lower()
+              or existing.get("proxied", False) != payload["proxied"]
+              or existing.get("ttl", 1) != payload["ttl"]
+              or existing.get("comment") != MANAGED_COMMENT):
+            plan.updates.append((existing, payload))
+
+    if prune:
+        plan.deletes = [
+            record
+            for key, records in index.items() if key not in wanted
+            for record in records if record.get("comment") == MANAGED_COMMENT
+        ]
+    return plan
+
+def apply_sync(client: CloudflareClient, zone_id: str, plan: SyncPlan, workers: int = SYNC_WORKERS) -> None:
+    """Apply a plan through the batch endpoint, falling back to concurrent calls."""
+    if not plan:
+        return
+    try:
+        client.batch_dns_records(
+            zone_id,
+            posts=plan.creates,
+            puts=[{**payload, "id": existing["id"]} for existing, payload in plan.updates],
+            deletes=plan.deletes
+        )
+        return
+    except CloudflareError as e:
+        if e.status_code not in BATCH_UNAVAILABLE:
+            raise
+        print(f"Batch apply unavailable ({e}); applying changes individually")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(client.delete_dns_record, zone_id, record) for record in plan.deletes]
+        futures += [
+            executor.submit(client.update_dns_record, zone_id, existing, payload["content"], payload["proxied"],
+                            ttl=payload["ttl"], comment=payload["comment"])
+            for existing, payload in plan.updates
+        ]
+        futures += [
+            executor.submit(client.add_dns_record, zone_id, payload["name"], payload["type"], payload["content"],
+                            payload["proxied"], ttl=payload["ttl"], comment=payload["comment"])
+            for payload in plan.creates
+        ]
+        for future in futures:
+            future.result()
+
+def print_sync_plan(plan: SyncPlan) -> None:
+    for payload in plan.creates:
+        print(f"+ {payload['type']} {payload['name']} -> {payload['content']}")
+    for existing, payload in plan.updates:
+        print(f"~ {payload['type']} {payload['name']}: {existing['content']} -> {payload['content']}")
+    for record in plan.deletes:
+        print(f"- {record['type']} {record['name']} ({record['content']})")
+    print(f"{len(plan.creates)} to create, {len(plan.updates)} to update, {len(plan.deletes)} to delete")
+
+def print_dns_records(records: List[dict]) -> None:
+    print("\nCurrent DNS Records:")
+    for record in records:
+        print(f"Name: {record['name']}")
+        print(f"Type: {record['type']}")
+        print(f"Content: {record['content']}")
+        print(f"Proxied: {record['proxied']}")
+        print("---")
+
+def get_cloudfront_domain(alias: str) -> Optional[str]:
+    """Domain name of the CloudFront distribution serving ``alias``."""
+    import boto3
+
+    paginator = boto3.client('cloudfront').get_paginator('list_distributions')
+    for page in paginator.paginate():
+        for distribution in page['DistributionList'].get('Items', []):
+            if alias in distribution.get('Aliases', {}).get('Items', []):
+                return distribution['DomainName']
+    return None
 
 def monitor_certificate(cert_arn: str) -> bool:
     """Monitor ACM certificate validation status."""
-    import boto3
-    
-    acm = boto3.client('acm', region_name='us-east-1')
-    max_attempts = 30  # 5 minutes total (10 second intervals)
+    from cert_waiter import wait_for_certificates
     
     print("Monitoring certificate validation status...")
-    for attempt in range(max_attempts):
-        response = acm.describe_certificate(CertificateArn=cert_arn)
-        status = response['Certificate']['Status']
-        
-        if status == 'ISSUED':
-            print("\nCertificate has been validated successfully!")
-            return True
-        elif status == 'FAILED':
-            print("\nCertificate validation failed!")
-            return False
-        
-        print(".", end="", flush=True)
-        time.sleep(10)
-    
-    print("\nTimeout waiting for certificate validation")
-    return False
+    return all(result.issued for result in wait_for_certificates([cert_arn]))
 
 def main():
-    # Check command line arguments
-    if len(sys.argv) > 1:
-        auth_token = os.getenv('CLOUDFLARE_API_TOKEN')
-        if not auth_token:
-            print("Error: CLOUDFLARE_API_TOKEN environment variable is required")
-            sys.exit(1)
-        
-        zone_id = get_zone_id(auth_token, "rinawarptech.com")
-        if not zone_id:
-            print("Error: Could not find Cloudflare zone ID for domain")
-            sys.exit(1)
-
-        if sys.argv[1] == "--list":
-            list_dns_records(auth_token, zone_id)
-            sys.exit(0)
-        elif sys.argv[1] == "--update-cloudfront":
-            # Get records
-            records = list_dns_records(auth_token, zone_id)
-            cloudfront_record = next((r for r in records if r['name'] == 'downloads.rinawarptech.com' and r['type'] == 'CNAME'), None)
-            
-            if not cloudfront_record:
-                print("Error: Could not find CloudFront DNS record")
-                sys.exit(1)
-            
-            # Get current CloudFront domain
-            cloudfront_info = json.loads(os.popen('aws cloudfront list-distributions --query "DistributionList.Items[?Aliases.Items[?contains(@, \'downloads.rinawarptech.com\')]].DomainName" --output json').read())
-            if not cloudfront_info or not cloudfront_info[0]:
-                print("Error: Could not find CloudFront distribution")
-                sys.exit(1)
-            
-            cloudfront_domain = cloudfront_info[0]
-            
-            # Update record
-            print(f"Updating CloudFront record to point to {cloudfront_domain}...")
-            success = update_dns_record(
-                auth_token,
-                zone_id,
-                cloudfront_record['id'],
-                'downloads',
-                'CNAME',
-                cloudfront_domain,
-                proxied=True
-            )
-            
-            if success:
-                print("CloudFront DNS record updated successfully!")
-            else:
-                print("Error: Failed to update CloudFront DNS record")
-                sys.exit(1)
-            
-            sys.exit(0)
-
+    parser = argparse.ArgumentParser(description="Manage RinaWarp download DNS records in Cloudflare")
+    parser.add_argument("--list", action="store_true", help="List DNS records in the zone")
+    parser.add_argument("--update-cloudfront", action="store_true",
+                        help="Point the downloads record at the current CloudFront distribution")
+    parser.add_argument("--sync", nargs="?", const="terraform.tfstate", metavar="DESIRED",
+                        help="Sync records to a desired state (terraform.tfstate or a JSON list of records)")
+    parser.add_argument("--dry-run", action="store_true", help="With --sync, print the plan without applying it")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="With --sync, keep managed records that are no longer desired")
+    
+    args = parser.parse_args()
+    
     # Check environment variables
     auth_token = os.getenv('CLOUDFLARE_API_TOKEN')
     if not auth_token:
         print("Error: CLOUDFLARE_API_TOKEN environment variable is required")
         sys.exit(1)
+
+    client = CloudflareClient(auth_token)
+    try:
+        zone_id = os.getenv('CLOUDFLARE_ZONE_ID') or client.get_zone_id(DOMAIN)
+    except CloudflareError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not zone_id:
+        print("Error: Could not find Cloudflare zone ID for domain")
+        sys.exit(1)
+
+    if args.list:
+        print_dns_records(client.list_dns_records(zone_id))
+        sys.exit(0)
+    
+    if args.sync:
+        try:
+            desired = load_desired_records(args.sync)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load desired records from {args.sync}: {e}")
+            sys.exit(1)
+        try:
+            plan = plan_sync(client, zone_id, desired, prune=not args.no_prune)
+            print_sync_plan(plan)
+            if plan and not args.dry_run:
+                apply_sync(client, zone_id, plan)
+                print("DNS records synced successfully!")
+        except CloudflareError as e:
+            print(f"Error: DNS sync failed: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
+    if args.update_cloudfront:
+        cloudfront_record = client.find_record(zone_id, f'downloads.{DOMAIN}', 'CNAME')
+        if not cloudfront_record:
+            print("Error: Could not find CloudFront DNS record")
+            sys.exit(1)
+        
+        # Get current CloudFront domain
+        cloudfront_domain = get_cloudfront_domain(f'downloads.{DOMAIN}')
+        if not cloudfront_domain:
+            print("Error: Could not find CloudFront distribution")
+            sys.exit(1)
+        
+        # Update record
+        print(f"Updating CloudFront record to point to {cloudfront_domain}...")
+        try:
+            action, _ = client.upsert_dns_record(zone_id, 'downloads', 'CNAME', cloudfront_domain, proxied=True)
+        except CloudflareError as e:
+            print(f"Error: Failed to update CloudFront DNS record: {e}")
+            sys.exit(1)
+        
+        print(f"CloudFront DNS record {action}!")
+        sys.exit(0)
     
     # Get Terraform output
     try:
@@ -239,67 +381,30 @@ def main():
         print("Error: terraform.tfstate file not found")
         sys.exit(1)
     
-    # Extract validation record and CloudFront details from state
-    validation_record = None
-    cert_arn = None
-    cloudfront_domain = None
+    # Extract certificate, validation record and CloudFront details from state
+    cert_arn = next((resource['instances'][0]['attributes']['arn']
+                     for resource in tf_state.get('resources', [])
+                     if resource['type'] == 'aws_acm_certificate'), None)
+    desired = desired_records_from_tfstate(tf_state)
     
-    for resource in tf_state.get('resources', []):
-        if resource['type'] == 'aws_acm_certificate':
-            cert_arn = resource['instances'][0]['attributes']['arn']
-            validation_options = resource['instances'][0]['attributes']['domain_validation_options']
-            if validation_options:
-                validation_record = {
-                    'name': validation_options[0]['resource_record_name'],
-                    'type': validation_options[0]['resource_record_type'],
-                    'value': validation_options[0]['resource_record_value']
-                }
-        elif resource['type'] == 'aws_cloudfront_distribution':
-            cloudfront_domain = resource['instances'][0]['attributes']['domain_name']
+    has_cloudfront = any(record['name'] == 'downloads' for record in desired)
+    has_validation = len(desired) > has_cloudfront
     
-    if not validation_record or not cert_arn or not cloudfront_domain:
+    if not cert_arn or not has_cloudfront or not has_validation:
         print("Error: Could not find required details in Terraform state")
         sys.exit(1)
     
-    # Get zone ID for domain
-    zone_id = get_zone_id(auth_token, "rinawarptech.com")
-    if not zone_id:
-        print("Error: Could not find Cloudflare zone ID for domain")
-        sys.exit(1)
-    
-    # Add CloudFront DNS record
-    print("Adding CloudFront DNS record to Cloudflare...")
-    success = add_dns_record(
-        auth_token,
-        zone_id,
-        "downloads",
-        "CNAME",
-        cloudfront_domain,
-        proxied=True  # Enable Cloudflare proxy
-    )
-    
-    if not success:
-        print("Error: Failed to add CloudFront DNS record")
-        sys.exit(1)
-    
-    print("CloudFront DNS record added successfully!")
-    
-    # Add ACM validation record
-    print("Adding ACM validation record to Cloudflare...")
-    success = add_dns_record(
-        auth_token,
-        zone_id,
-        validation_record['name'],
-        validation_record['type'],
-        validation_record['value'],
-        proxied=False  # DNS only for validation
-    )
-    
-    if not success:
-        print("Error: Failed to add validation record")
+    # Add CloudFront and ACM validation records (existing records are updated in place)
+    print("Adding CloudFront and ACM validation DNS records to Cloudflare...")
+    try:
+        plan = plan_sync(client, zone_id, desired, prune=False)
+        print_sync_plan(plan)
+        apply_sync(client, zone_id, plan)
+    except CloudflareError as e:
+        print(f"Error: Failed to add DNS records: {e}")
         sys.exit(1)
     
-    print("ACM validation record added successfully!")
+    print("DNS records added successfully!")
     
     # Monitor certificate validation
     if monitor_certificate(cert_arn):
@@ -26,6 +26,8 @@ resource "aws_dynamodb_table" "downloads" {
     type = "S"
   }
 
+  # year_month is written as YYYY-MM#N (N < year_month_shards) so a month's
+  # writes spread over several index partitions
   global_secondary_index {
     name            = "YearMonthIndex"
     hash_key        = "year_month"
@@ -43,6 +45,28 @@ resource "aws_dynamodb_table" "downloads" {
   point_in_time_recovery {
     enabled = true
   }
+
+  # Set at ingest to archive_after_days + archive_grace_days (see archive.tf)
+  ttl {
+    attribute_name = "exp"
+    enabled        = true
+  }
+}
+
+# User-agent dictionary: download items store only a 64-bit hash of the UA
+resource "aws_dynamodb_table" "user_agents" {
+  name         = "rinawarp-user-agents-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "ua_hash"
+
+  attribute {
+    name = "ua_hash"
+    type = "S"
+  }
+
+  point_in_time_recovery {
+    enabled = true
+  }
 }
 
 # Lambda function for processing download logs
@@ -58,7 +82,13 @@ resource "aws_lambda_function" "process_downloads" {
   environment {
     variables = {
       DOWNLOADS_TABLE  = aws_dynamodb_table.downloads.name
+      USER_AGENTS_TABLE = aws_dynamodb_table.user_agents.name
       MANIFEST_BUCKET = aws_s3_bucket.downloads.id
+      STAGE_METRICS   = var.stage_metrics_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      PROFILE_BUCKET      = aws_s3_bucket.reports.id
+      YEAR_MONTH_SHARDS   = var.year_month_shards
+      DOWNLOAD_TTL_DAYS   = var.archive_after_days + var.archive_grace_days
     }
   }
 }
@@ -108,6 +138,15 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "${aws_dynamodb_table.downloads.arn}/index/*"
         ]
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:PutItem"
+        ]
+        Resource = [
+          aws_dynamodb_table.user_agents.arn
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -117,6 +156,15 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "${aws_s3_bucket.downloads.arn}/*"
         ]
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject"
+        ]
+        Resource = [
+          "${aws_s3_bucket.reports.arn}/profiles/*"
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -378,6 +426,24 @@ resource "aws_cloudwatch_dashboard" "downloads_analytics" {
           period  = 300
           title   = "Download Performance"
         }
+      },
+      {
+        type   = "metric"
+        width  = 12
+        height = 6
+        properties = {
+          metrics = [
+            ["RinaWarp/Lambda", "Duration", "Function", "process_download_logs", "Stage", "handler", { stat = "p99" }],
+            ["...", "parse", { stat = "p99" }],
+            ["...", "dynamodb", { stat = "p99" }],
+            ["...", "cloudwatch", { stat = "p99" }]
+          ]
+          view    = "timeSeries"
+          stacked = false
+          region  = var.aws_region
+          period  = 300
+          title   = "Ingest Stage Latency (p99 ms)"
+        }
       }
     ]
   })
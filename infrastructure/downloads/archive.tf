@@ -0,0 +1,133 @@
+# Download records older than archive_after_days are exported to S3 as daily
+# gzip JSON-lines partitions and then expire from DynamoDB via TTL (exp)
+
+resource "aws_s3_bucket" "downloads_archive" {
+  bucket = "${var.project_name}-downloads-archive-${var.environment}"
+}
+
+resource "aws_s3_bucket_public_access_block" "downloads_archive" {
+  bucket = aws_s3_bucket.downloads_archive.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "downloads_archive" {
+  bucket = aws_s3_bucket.downloads_archive.id
+
+  rule {
+    id     = "tier_archived_downloads"
+    status = "Enabled"
+
+    filter {
+      prefix = "archive/downloads/"
+    }
+
+    transition {
+      days          = var.standard_ia_transition_days
+      storage_class = "STANDARD_IA"
+    }
+
+    # Instant Retrieval keeps partitions readable by the report Lambda
+    transition {
+      days          = var.glacier_transition_days
+      storage_class = "GLACIER_IR"
+    }
+  }
+}
+
+# Lambda function for archiving download records
+resource "aws_lambda_function" "archive_downloads" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "rinawarp-archive-downloads-${var.environment}"
+  role            = aws_iam_role.lambda_role.arn
+  handler         = "archive_downloads.lambda_handler"
+  runtime         = "python3.10"
+  timeout         = 900
+  memory_size     = 512
+
+  environment {
+    variables = {
+      DOWNLOADS_TABLE     = aws_dynamodb_table.downloads.name
+      ARCHIVE_BUCKET      = aws_s3_bucket.downloads_archive.id
+      ARCHIVE_AFTER_DAYS  = var.archive_after_days
+      ARCHIVE_GRACE_DAYS  = var.archive_grace_days
+      YEAR_MONTH_SHARDS   = var.year_month_shards
+      STAGE_METRICS       = var.stage_metrics_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      PROFILE_BUCKET      = aws_s3_bucket.reports.id
+    }
+  }
+}
+
+resource "aws_iam_role_policy" "archive_downloads" {
+  name = "rinawarp-downloads-archive-policy-${var.environment}"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject",
+          "s3:GetObject"
+        ]
+        Resource = [
+          "${aws_s3_bucket.downloads_archive.arn}/*"
+        ]
+      },
+      {
+        # Lets HeadObject report missing partitions as 404 rather than 403
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket"
+        ]
+        Resource = [
+          aws_s3_bucket.downloads_archive.arn
+        ]
+      }
+    ]
+  })
+}
+
+# Daily archive run
+resource "aws_cloudwatch_event_rule" "archive_downloads" {
+  name                = "archive-downloads-${var.environment}"
+  description         = "Archive download records older than ${var.archive_after_days} days"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "archive_downloads" {
+  rule      = aws_cloudwatch_event_rule.archive_downloads.name
+  target_id = "ArchiveDownloads"
+  arn       = aws_lambda_function.archive_downloads.arn
+}
+
+resource "aws_lambda_permission" "archive_downloads" {
+  statement_id  = "AllowCloudWatchInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.archive_downloads.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.archive_downloads.arn
+}
+
+# A failed run has archive_grace_days to catch up before records expire
+resource "aws_cloudwatch_metric_alarm" "archive_downloads_errors" {
+  alarm_name          = "archive-downloads-errors-${var.environment}"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = 1
+  metric_name         = "Errors"
+  namespace           = "AWS/Lambda"
+  period              = 86400
+  statistic           = "Sum"
+  threshold           = 0
+  alarm_description   = "Download archival failed; records expire ${var.archive_grace_days} days after they are due for archiving"
+  alarm_actions       = [aws_sns_topic.download_alerts.arn]
+
+  dimensions = {
+    FunctionName = aws_lambda_function.archive_downloads.function_name
+  }
+}
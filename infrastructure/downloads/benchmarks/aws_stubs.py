@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""In-process stand-ins for the AWS services the Lambdas use.
+
+Only the calls the handlers make are implemented. Every call is counted per
+service and operation and can be delayed by an injected latency, so
+benchmarks can model network round trips without touching AWS::
+
+    aws = FakeAWS(latency=0.005)
+    with aws.installed():
+        import process_download_logs   # module-level boto3 clients are fakes
+        process_download_logs.lambda_handler(event, None)
+    print(aws.calls)
+"""
+import io
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from unittest import mock
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+# Captured before benchmarks patch time.sleep, so injected latency still applies
+_sleep = time.sleep
+
+class FakeService:
+    service = ''
+
+    def __init__(self, aws: 'FakeAWS'):
+        self.aws = aws
+
+    def _call(self, operation: str) -> None:
+        self.aws.record(self.service, operation)
+
+    def _error(self, code: str, operation: str) -> ClientError:
+        return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+class NoSuchKey(ClientError):
+    def __init__(self, operation: str):
+        super().__init__({'Error': {'Code': 'NoSuchKey', 'Message': 'NoSuchKey'}}, operation)
+
+class FakeS3(FakeService):
+    service = 's3'
+
+    class exceptions:
+        ClientError = ClientError
+        NoSuchKey = NoSuchKey
+
+    def put_object(self, Bucket: str, Key: str, Body=b'', **kwargs) -> Dict:
+        self._call('PutObject')
+        body = Body.encode() if isinstance(Body, str) else Body
+        self.aws.objects[(Bucket, Key)] = {'Body': bytes(body), **kwargs}
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict:
+        self._call('GetObject')
+        try:
+            stored = self.aws.objects[(Bucket, Key)]
+        except KeyError:
+            raise NoSuchKey('GetObject')
+        return {'Body': io.BytesIO(stored['Body']), 'ContentLength': len(stored['Body'])}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> Dict:
+        self._call('HeadObject')
+        if (Bucket, Key) not in self.aws.objects:
+            raise self._error('404', 'HeadObject')
+        return {'ContentLength': len(self.aws.objects[(Bucket, Key)]['Body'])}
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> Dict:
+        self._call('DeleteObject')
+        self.aws.objects.pop((Bucket, Key), None)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = '', **kwargs) -> Dict:
+        self._call('ListObjectsV2')
+        contents = [{'Key': key, 'Size': len(stored['Body'])}
+                    for (bucket, key), stored in sorted(self.aws.objects.items())
+                    if bucket == Bucket and key.startswith(Prefix)]
+        return {'Contents': contents, 'KeyCount': len(contents), 'IsTruncated': False}
+
+    def get_bucket_versioning(self, Bucket: str) -> Dict:
+        self._call('GetBucketVersioning')
+        return {'Status': 'Enabled'}
+
+    def get_bucket_encryption(self, Bucket: str) -> Dict:
+        self._call('GetBucketEncryption')
+        return {'ServerSideEncryptionConfiguration': {'Rules': [
+            {'ApplyServerSideEncryptionByDefault': {'SSEAlgorithm': 'AES256'}}
+        ]}}
+
+    def get_bucket_lifecycle_configuration(self, Bucket: str) -> Dict:
+        self._call('GetBucketLifecycleConfiguration')
+        return {'Rules': [{'ID': 'archive_old_versions'}, {'ID': 'clean_old_artifacts'}]}
+
+class FakeCloudWatch(FakeService):
+    service = 'cloudwatch'
+
+    def put_metric_data(self, Namespace: str, MetricData: List[Dict]) -> Dict:
+        self._call('PutMetricData')
+        self.aws.metrics.extend((Namespace, datum) for datum in MetricData)
+        return {}
+
+    def get_metric_statistics(self, **kwargs) -> Dict:
+        self._call('GetMetricStatistics')
+        return {'Datapoints': [{'Average': 120.0}]}
+
+class FakeSNS(FakeService):
+    service = 'sns'
+
+    def publish(self, TopicArn: str, Message: str, **kwargs) -> Dict:
+        self._call('Publish')
+        self.aws.messages.append((TopicArn, Message))
+        return {'MessageId': str(len(self.aws.messages))}
+
+class FakeTable(FakeService):
+    """DynamoDB Table resource with equality key conditions and GSI queries."""
+    service = 'dynamodb'
+    page_size = 1000
+    # Hash key of each table the Lambdas write, by the attribute that identifies it
+    key_attributes = ('download_id', 'ua_hash')
+
+    def __init__(self, aws: 'FakeAWS', name: str):
+        super().__init__(aws)
+        self.name = name
+        self.items = aws.tables.setdefault(name, {})
+
+    def put_item(self, Item: Dict, ConditionExpression: Optional[str] = None, **kwargs) -> Dict:
+        self._call('PutItem')
+        key = next(Item[attribute] for attribute in self.key_attributes if attribute in Item)
+        # Only the "attribute_not_exists(<hash key>)" idempotency guard is supported
+        if ConditionExpression and 'attribute_not_exists' in ConditionExpression and key in self.items:
+            raise self._error('ConditionalCheckFailedException', 'PutItem')
+        self.items[key] = dict(Item)
+        return {}
+
+    def update_item(self, Key: Dict, UpdateExpression: str, ExpressionAttributeValues: Dict, **kwargs) -> Dict:
+        self._call('UpdateItem')
+        # Supports "SET a = :v, b = :w"
+        item = self.items.setdefault(next(iter(Key.values())), dict(Key))
+        for assignment in UpdateExpression[len('SET '):].split(','):
+            attribute, placeholder = (part.strip() for part in assignment.split('='))
+            item[attribute] = ExpressionAttributeValues[placeholder]
+        return {}
+
+    def query(self, KeyConditionExpression: str, ExpressionAttributeValues: Dict,
+              IndexName: Optional[str] = None, ExclusiveStartKey: Optional[Dict] = None, **kwargs) -> Dict:
+        self._call('Query')
+        # Supports "attr = :value" conditions joined by AND
+        conditions = []
+        for clause in KeyConditionExpression.split(' AND '):
+            attribute, placeholder = (part.strip() for part in clause.split('='))
+            conditions.append((attribute, ExpressionAttributeValues[placeholder]))
+
+        matches = [item for item in self.items.values()
+                   if all(item.get(attribute) == value for attribute, value in conditions)]
+        start = ExclusiveStartKey['_offset'] if ExclusiveStartKey else 0
+        page = matches[start:start + self.page_size]
+        response = {'Items': page, 'Count': len(page)}
+        if start + self.page_size < len(matches):
+            response['LastEvaluatedKey'] = {'_offset': start + self.page_size}
+        return response
+
+class FakeDynamoDBResource:
+    def __init__(self, aws: 'FakeAWS'):
+        self.aws = aws
+
+    def Table(self, name: str) -> FakeTable:
+        return FakeTable(self.aws, name)
+
+class FakeQueryPaginator:
+    def __init__(self, client: 'FakeDynamoDBClient'):
+        self.client = client
+
+    def paginate(self, TableName: str, ExpressionAttributeValues: Dict, **kwargs):
+        # Same pages as the Table resource, in low-level attribute-value form
+        table = FakeTable(self.client.aws, TableName)
+        values = {name: self.client.deserializer.deserialize(value)
+                  for name, value in ExpressionAttributeValues.items()}
+        start_key = None
+        while True:
+            response = table.query(ExpressionAttributeValues=values, ExclusiveStartKey=start_key, **kwargs)
+            response['Items'] = [{key: self.client.serializer.serialize(value) for key, value in item.items()}
+                                 for item in response['Items']]
+            yield response
+            start_key = response.get('LastEvaluatedKey')
+            if not start_key:
+                return
+
+class FakeDynamoDBClient(FakeService):
+    """Low-level DynamoDB client; only the query paginator is implemented."""
+    service = 'dynamodb'
+
+    def __init__(self, aws: 'FakeAWS'):
+        super().__init__(aws)
+        self.serializer = TypeSerializer()
+        self.deserializer = TypeDeserializer()
+
+    def get_paginator(self, operation: str) -> FakeQueryPaginator:
+        if operation != 'query':
+            raise NotImplementedError(f"No fake paginator for '{operation}'")
+        return FakeQueryPaginator(self)
+
+class FakeAWS:
+    """Shared state, call counts and latency for all fake clients."""
+
+    clients = {
+        's3': FakeS3,
+        'cloudwatch': FakeCloudWatch,
+        'sns': FakeSNS,
+        'dynamodb': FakeDynamoDBClient
+    }
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.objects: Dict = {}
+        self.tables: Dict[str, Dict] = {}
+        self.metrics: List = []
+        self.messages: List = []
+        self._lock = threading.Lock()
+
+    def record(self, service: str, operation: str) -> None:
+        with self._lock:
+            self.calls[f'{service}:{operation}'] += 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            _sleep(delay)
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+
+    def client(self, service: str, *args, **kwargs):
+        try:
+            return self.clients[service](self)
+        except KeyError:
+            raise NotImplementedError(f"No fake for boto3 client '{service}'")
+
+    def resource(self, service: str, *args, **kwargs):
+        if service != 'dynamodb':
+            raise NotImplementedError(f"No fake for boto3 resource '{service}'")
+        return FakeDynamoDBResource(self)
+
+    @contextmanager
+    def installed(self):
+        """Route boto3.client/boto3.resource to the fakes."""
+        with mock.patch.object(boto3, 'client', self.client), \
+                mock.patch.object(boto3, 'resource', self.resource):
+            yield self
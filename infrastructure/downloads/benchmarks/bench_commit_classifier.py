@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Throughput of conventional-commit classification on a synthetic log.
+
+Compares the previous approach (pattern string handed to re.match per commit,
+if/elif routing) with the precompiled CommitClassifier. The two run at about
+the same rate: re caches compiled patterns, so precompiling saves little, and
+the classifier also checks for breaking changes. This guards against the
+breaking-change detection and type map slowing classification down.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from conventional_commits import COMMIT_TYPES, CommitClassifier, parse_conventional_commit
+
+SCOPES = [None, 'ui', 'api', 'installer', 'updater', 'plugins', 'themes']
+WORDS = ['add', 'remove', 'update', 'support', 'terminal', 'tabs', 'cache', 'config',
+         'crash', 'memory', 'startup', 'render', 'font', 'shell', 'path', '|', 'arm64']
+
+def synthetic_log(count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """Build (subject, body) pairs with a realistic mix of commit styles."""
+    rng = random.Random(seed)
+    commits = []
+    for _ in range(count):
+        description = ' '.join(rng.choices(WORDS, k=rng.randint(2, 8)))
+        roll = rng.random()
+        if roll < 0.15:
+            subject, body = f"Merge branch 'feature/{description.split()[0]}'", ''
+        else:
+            scope = rng.choice(SCOPES)
+            bang = '!' if roll > 0.98 else ''
+            subject = f"{rng.choice(COMMIT_TYPES)}{f'({scope})' if scope else ''}{bang}: {description}"
+            body = 'BREAKING CHANGE: config moved' if roll > 0.97 else ''
+        commits.append((subject, body))
+    return commits
+
+def legacy_classify(commits: List[Tuple[str, str]]) -> Dict[str, int]:
+    categories = {'Features': 0, 'Bug Fixes': 0, 'Performance': 0, 'Other Changes': 0}
+    for subject, _ in commits:
+        pattern = r'^(?P<type>feat|fix|docs|style|refactor|perf|test|build|ci|chore)(?:\((?P<scope>[^)]+)\))?: (?P<description>.+)$'
+        match = re.match(pattern, subject)
+        parsed = match.groupdict() if match else {'type': 'other', 'scope': None, 'description': subject}
+        if parsed['type'] == 'feat':
+            categories['Features'] += 1
+        elif parsed['type'] == 'fix':
+            categories['Bug Fixes'] += 1
+        elif parsed['type'] == 'perf':
+            categories['Performance'] += 1
+        else:
+            categories['Other Changes'] += 1
+    return categories
+
+def compiled_classify(commits: List[Tuple[str, str]]) -> Dict[str, int]:
+    classifier = CommitClassifier()
+    categories = dict.fromkeys(classifier.categories, 0)
+    for subject, body in commits:
+        parsed = parse_conventional_commit(subject, body)
+        categories[classifier.category(parsed['type'], parsed['breaking'])] += 1
+    return categories
+
+def run(name: str, func, commits: List[Tuple[str, str]], repeat: int) -> None:
+    best = min(_timed(func, commits) for _ in range(repeat))
+    counts = func(commits)
+    print(f"{name:<10} {len(commits) / best:>12,.0f} commits/s  ({best * 1000:.1f} ms)  {counts}")
+
+def _timed(func, commits) -> float:
+    start = time.perf_counter()
+    func(commits)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark conventional-commit classification")
+    parser.add_argument("--commits", type=int, default=100_000, help="Synthetic log size")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per approach (best is reported)")
+
+    args = parser.parse_args()
+    commits = synthetic_log(args.commits)
+    run('legacy', legacy_classify, commits, args.repeat)
+    run('compiled', compiled_classify, commits, args.repeat)
+
+if __name__ == '__main__':
+    main()
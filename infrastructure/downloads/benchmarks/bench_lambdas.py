@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Throughput, latency and memory of the download-analytics Lambda handlers.
+
+Each (handler, batch size) scenario runs in a fresh process against the
+in-process AWS fakes in aws_stubs.py, so peak RSS includes module import
+just like a cold Lambda. Reports events/sec, p50/p99 handler latency, AWS API
+calls per event and peak RSS.
+
+    python benchmarks/bench_lambdas.py --batch-sizes 1,10,100 --latency-ms 5
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import uuid
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Tuple
+from unittest import mock
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FUNCTIONS_DIR = os.path.join(BENCH_DIR, '..', 'functions')
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, FUNCTIONS_DIR)
+
+from aws_stubs import FakeAWS
+from boto3.dynamodb.types import TypeSerializer
+from download_records import encode_download, user_agent_hash
+
+HANDLERS = ['process', 'notify-stream', 'notify-report', 'backup']
+
+ENVIRONMENT = {
+    'DOWNLOADS_TABLE': 'rinawarp-downloads',
+    'USER_AGENTS_TABLE': 'rinawarp-user-agents',
+    'MANIFEST_BUCKET': 'rinawarp-downloads-production',
+    'REPORTS_BUCKET': 'rinawarp-reports',
+    'TOPIC_ARN': 'arn:aws:sns:us-east-1:000000000000:downloads',
+    'PRIMARY_BUCKET': 'rinawarp-downloads-production',
+    'AWS_DEFAULT_REGION': 'us-east-1'
+}
+
+PLATFORM_FILES = {
+    'macos': 'RinaWarp-Terminal.dmg',
+    'windows': 'RinaWarp-Terminal-Setup.exe',
+    'linux': 'RinaWarp-Terminal.AppImage'
+}
+VERSIONS = ['1.0.0', '1.0.1', '1.1.0', '1.2.0']
+COUNTRIES = ['US', 'DE', 'GB', 'IN', 'JP', 'BR', 'FR', 'CA']
+
+def cloudfront_records(count: int, rng: random.Random) -> List[Dict]:
+    records = []
+    for _ in range(count):
+        platform = rng.choice(list(PLATFORM_FILES))
+        request = {
+            'uri': f"/v{rng.choice(VERSIONS)}/{platform}/{PLATFORM_FILES[platform]}",
+            'headers': {
+                'user-agent': [{'value': 'Mozilla/5.0'}],
+                'cloudfront-viewer-country': [{'value': rng.choice(COUNTRIES)}]
+            }
+        }
+        records.append({'cf': {
+            'config': {'requestId': str(uuid.UUID(int=rng.getrandbits(128)))},
+            'request': json.dumps(request)
+        }})
+    return records
+
+def download_item(rng: random.Random, timestamp: datetime) -> Dict:
+    platform = rng.choice(list(PLATFORM_FILES))
+    version = rng.choice(VERSIONS)
+    download_id = f"{platform}#{version}#{uuid.UUID(int=rng.getrandbits(128))}"
+    return encode_download(download_id, version, platform, int(timestamp.timestamp()),
+                           rng.choice(COUNTRIES), user_agent_hash('Mozilla/5.0'))
+
+def stream_records(count: int, rng: random.Random) -> List[Dict]:
+    serializer = TypeSerializer()
+    records = []
+    for _ in range(count):
+        item = download_item(rng, datetime.now())
+        records.append({
+            'eventName': 'INSERT',
+            'dynamodb': {'NewImage': {key: serializer.serialize(value) for key, value in item.items()}}
+        })
+    return records
+
+def setup_scenario(handler: str, batch_size: int, aws: FakeAWS, rng: random.Random) -> Tuple[str, Callable[[], Dict]]:
+    """Seed fake state and return (module name, event factory) for a scenario."""
+    if handler == 'process':
+        return 'process_download_logs', lambda: {'Records': cloudfront_records(batch_size, rng)}
+    if handler == 'notify-stream':
+        return 'notify_downloads', lambda: {'Records': stream_records(batch_size, rng)}
+    if handler == 'notify-report':
+        # One scheduled invocation over a week holding batch_size downloads
+        table = aws.tables.setdefault(ENVIRONMENT['DOWNLOADS_TABLE'], {})
+        now = datetime.now()
+        for _ in range(batch_size):
+            item = download_item(rng, now - timedelta(seconds=rng.uniform(0, 6 * 86400)))
+            table[item['download_id']] = item
+        return 'notify_downloads', lambda: {'source': 'aws.events'}
+    if handler == 'backup':
+        os.environ['BACKUP_BUCKETS'] = json.dumps({
+            f'rinawarp-downloads-backup-{index}': 'us-west-2' for index in range(batch_size)
+        })
+        return 'backup_monitor', lambda: {}
+    raise ValueError(f"Unknown handler: {handler}")
+
+def events_per_invocation(handler: str, batch_size: int) -> int:
+    # Backup checks the primary bucket plus each backup bucket
+    return batch_size + 1 if handler == 'backup' else batch_size
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def run_scenario(handler: str, batch_size: int, iterations: int, latency: float, seed: int) -> Dict:
+    """Run one scenario; meant to execute in a fresh process."""
+    os.environ.update(ENVIRONMENT)
+    rng = random.Random(seed)
+    aws = FakeAWS(latency=latency, seed=seed)
+
+    # Handlers sleep for real (e.g. waiting on replication); only count that time
+    slept = []
+    with aws.installed(), mock.patch('time.sleep', slept.append):
+        module_name, make_event = setup_scenario(handler, batch_size, aws, rng)
+        init_start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        init_seconds = time.perf_counter() - init_start
+
+        events = [make_event() for _ in range(iterations)]
+        aws.reset_calls()
+        latencies = []
+        for event in events:
+            start = time.perf_counter()
+            response = module.lambda_handler(event, None)
+            latencies.append(time.perf_counter() - start)
+            if response and response.get('statusCode', 200) != 200:
+                raise RuntimeError(f"{handler} returned {response}")
+
+    total_events = events_per_invocation(handler, batch_size) * iterations
+    elapsed = sum(latencies)
+    return {
+        'handler': handler,
+        'batch_size': batch_size,
+        'iterations': iterations,
+        'init_ms': init_seconds * 1000,
+        'events_per_sec': total_events / elapsed if elapsed else float('inf'),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'api_calls_per_event': aws.total_calls() / total_events,
+        'api_calls': dict(aws.calls),
+        'skipped_sleep_s': sum(slept),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the download-analytics Lambda handlers offline")
+    parser.add_argument("--handlers", default=','.join(HANDLERS),
+                        help=f"Comma-separated handlers ({', '.join(HANDLERS)})")
+    parser.add_argument("--batch-sizes", default="1,10,100",
+                        help="Comma-separated records per invocation")
+    parser.add_argument("--iterations", type=int, default=20, help="Invocations per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per AWS call")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for synthetic events")
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+    handlers = args.handlers.split(',')
+    unknown = set(handlers) - set(HANDLERS)
+    if unknown:
+        parser.error(f"unknown handlers: {', '.join(sorted(unknown))}")
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+
+    results = []
+    print(f"{'handler':<14} {'batch':>6} {'events/s':>11} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'calls/evt':>10} {'init ms':>8} {'peak RSS':>9}")
+    for handler in handlers:
+        for batch_size in batch_sizes:
+            # A fresh process per scenario keeps imports and RSS independent
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                result = executor.submit(run_scenario, handler, batch_size, args.iterations,
+                                         args.latency_ms / 1000, args.seed).result()
+            results.append(result)
+            print(f"{handler:<14} {batch_size:>6} {result['events_per_sec']:>11,.0f} "
+                  f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                  f"{result['api_calls_per_event']:>10.2f} {result['init_ms']:>8.0f} "
+                  f"{result['peak_rss_mb']:>7.0f}MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'latency_ms': args.latency_ms, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == '__main__':
+    main()
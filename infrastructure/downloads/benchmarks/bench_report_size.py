@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Track the size of the visual comparison report.
+
+Compares the legacy layout (plotly.js inlined by every ``fig.to_html`` call)
+with the current single-include report in both plotly.js modes.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import generate_visual_report as gvr
+
+def legacy_report_size(manifest: dict, versions: list) -> int:
+    """Size of the figure markup when each figure inlines plotly.js."""
+    data = gvr.build_chart_data(manifest, versions)
+    figures = [
+        gvr.create_release_timeline(data.releases),
+        gvr.create_size_comparison_chart(data.platforms),
+        gvr.create_download_stats_chart(data.stats),
+        gvr.create_subscription_chart(data.tiers),
+        gvr.create_geographic_chart(data.regions),
+        gvr.create_architecture_chart(data.platforms),
+    ]
+    return sum(len(fig.to_html(full_html=False).encode('utf-8')) for fig in figures)
+
+def measure(manifest: dict, versions: list, mode: str) -> dict:
+    start = time.perf_counter()
+    html = gvr.build_report_html(manifest, versions, mode).encode('utf-8')
+    elapsed = time.perf_counter() - start
+    return {
+        'mode': mode,
+        'bytes': len(html),
+        'gzip_bytes': len(gzip.compress(html)),
+        'seconds': round(elapsed, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark visual report size")
+    parser.add_argument("versions", nargs="*", help="Versions to include (default: all)")
+    parser.add_argument("--manifest", default="test-manifest.json",
+                      help="Path to version manifest")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+
+    args = parser.parse_args()
+    manifest = gvr.load_manifest(args.manifest)
+    versions = args.versions or list(manifest.get('versions', {})) + list(manifest.get('beta', {}))
+
+    results = {
+        'versions': versions,
+        'legacy_bytes': legacy_report_size(manifest, versions),
+        'reports': [measure(manifest, versions, mode) for mode in gvr.PLOTLYJS_MODES]
+    }
+
+    print(f"legacy (plotly.js per figure): {results['legacy_bytes']:>12,} bytes")
+    for report in results['reports']:
+        print(f"{report['mode']:<29}: {report['bytes']:>12,} bytes "
+              f"({report['gzip_bytes']:,} gzip, {report['seconds']}s)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
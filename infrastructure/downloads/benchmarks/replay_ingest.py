@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Replay synthetic release-day traffic through process_download_logs.
+
+Generates CloudFront request records with a realistic mix:
+
+- a Zipf distribution over versions, with the newest release most popular
+- beta and stable paths in the layout extract_version_from_path expects
+- a weighted platform split, viewer countries and user agents
+- a share of non-download requests such as manifest fetches
+- optionally, a share of redelivered records to exercise deduplication
+
+Arrivals follow a rate profile, for example a steady baseline with a 50x
+spike. They are grouped into batches as the log stream would deliver them.
+Every batch runs through the real handler against the AWS fakes in
+aws_stubs.py. The measured service times then drive a queue simulation with
+N concurrent Lambdas, which shows whether the ingest path keeps up and how
+far it lags during the spike. Time inside the handler is broken down by stage.
+
+    python benchmarks/replay_ingest.py --rate 50 --spike 50 --duration 60 --concurrency 4
+"""
+import argparse
+import heapq
+import importlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from bisect import bisect
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Callable, Dict, Iterator, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'functions'))
+
+from aws_stubs import FakeAWS
+from bench_lambdas import ENVIRONMENT, percentile
+
+STABLE_VERSIONS = ['1.4.0', '1.3.2', '1.3.1', '1.3.0', '1.2.0', '1.1.0', '1.0.0']
+BETA_VERSIONS = ['1.5.0-beta.2', '1.5.0-beta.1']
+PLATFORMS = {
+    'windows': ('RinaWarp.exe', 0.55),
+    'macos': ('RinaWarp.dmg', 0.30),
+    'linux': ('RinaWarp.AppImage', 0.15)
+}
+COUNTRIES = {
+    'US': 0.32, 'IN': 0.10, 'DE': 0.08, 'GB': 0.07, 'BR': 0.06, 'CN': 0.05,
+    'FR': 0.05, 'JP': 0.05, 'CA': 0.04, 'RU': 0.03, 'KR': 0.03, 'AU': 0.03,
+    'NL': 0.03, 'PL': 0.02, 'SE': 0.02, 'ES': 0.02
+}
+USER_AGENTS = {
+    'windows': [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:127.0) Gecko/20100101 Firefox/127.0',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36 Edg/126.0.0.0'
+    ],
+    'macos': [
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
+    ],
+    'linux': [
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0',
+        'curl/8.5.0',
+        'Wget/1.21.4'
+    ]
+}
+NON_DOWNLOAD_PATHS = ['/manifest.json', '/manifest.current.json', '/beta/manifest.json', '/favicon.ico']
+
+# Handler stages timed for the breakdown: (module attribute, label)
+STAGES = [
+    ('extract_version_from_path', 'parse'),
+    ('extract_platform', 'parse'),
+    ('put_download_record', 'dynamodb'),
+    ('put_metrics', 'cloudwatch')
+]
+
+class TrafficGenerator:
+    """Synthetic CloudFront viewer requests for the downloads distribution."""
+
+    def __init__(self, seed: int = 7, zipf_s: float = 1.1, beta_share: float = 0.08,
+                 non_download_share: float = 0.2, duplicate_share: float = 0.0):
+        self.rng = random.Random(seed)
+        self.duplicate_share = duplicate_share
+        self.recent = deque(maxlen=1000)
+        self.beta_share = beta_share
+        self.non_download_share = non_download_share
+        self.stable = self._sampler(STABLE_VERSIONS, [1 / rank ** zipf_s for rank in range(1, len(STABLE_VERSIONS) + 1)])
+        self.beta = self._sampler(BETA_VERSIONS, [1 / rank ** zipf_s for rank in range(1, len(BETA_VERSIONS) + 1)])
+        self.platform = self._sampler(list(PLATFORMS), [weight for _, weight in PLATFORMS.values()])
+        self.country = self._sampler(list(COUNTRIES), list(COUNTRIES.values()))
+
+    def _sampler(self, values: List[str], weights: List[float]) -> Callable[[], str]:
+        cumulative = list(accumulate(weights))
+        total = cumulative[-1]
+        return lambda: values[min(bisect(cumulative, self.rng.random() * total), len(values) - 1)]
+
+    def request(self) -> Dict:
+        rng = self.rng
+        platform = self.platform()
+        if rng.random() < self.non_download_share:
+            uri = rng.choice(NON_DOWNLOAD_PATHS)
+        elif rng.random() < self.beta_share:
+            uri = f"/beta/v{self.beta()}/{platform}/{PLATFORMS[platform][0]}"
+        else:
+            uri = f"/v{self.stable()}/{platform}/{PLATFORMS[platform][0]}"
+        return {
+            'clientIp': f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            'method': 'GET',
+            'uri': uri,
+            'querystring': '',
+            'headers': {
+                'host': [{'key': 'Host', 'value': 'downloads.rinawarptech.com'}],
+                'user-agent': [{'key': 'User-Agent', 'value': rng.choice(USER_AGENTS[platform])}],
+                'cloudfront-viewer-country': [{'key': 'CloudFront-Viewer-Country', 'value': self.country()}]
+            }
+        }
+
+    def record(self) -> Dict:
+        # A redelivery repeats a recent record verbatim, request ID included
+        if self.recent and self.rng.random() < self.duplicate_share:
+            return self.rng.choice(self.recent)
+        record = {'cf': {
+            'config': {'requestId': str(uuid.UUID(int=self.rng.getrandbits(128)))},
+            'request': json.dumps(self.request())
+        }}
+        self.recent.append(record)
+        return record
+
+def spike_profile(rate: float, spike: float, spike_at: float, spike_duration: float,
+                  ramp: float) -> Callable[[float], float]:
+    """Events/sec at time t: ``rate``, rising linearly to ``rate * spike`` and back."""
+    def profile(t: float) -> float:
+        if spike <= 1 or t < spike_at - ramp or t > spike_at + spike_duration + ramp:
+            return rate
+        if t < spike_at:
+            factor = 1 + (spike - 1) * (t - (spike_at - ramp)) / ramp
+        elif t <= spike_at + spike_duration:
+            factor = spike
+        else:
+            factor = spike - (spike - 1) * (t - spike_at - spike_duration) / ramp
+        return rate * factor
+    return profile
+
+@dataclass
+class Batch:
+    ready: float       # when the last record arrived
+    arrivals: List[float]
+    records: List[Dict]
+
+def arrivals(profile: Callable[[float], float], duration: float, rng: random.Random) -> Iterator[float]:
+    """Poisson arrivals with a time-varying rate (thinning)."""
+    peak = max(profile(step / 10) for step in range(int(duration * 10) + 1))
+    t = 0.0
+    while True:
+        t += rng.expovariate(peak)
+        if t >= duration:
+            return
+        if rng.random() < profile(t) / peak:
+            yield t
+
+def make_batches(times: Iterator[float], generator: TrafficGenerator, batch_size: int,
+                 batch_window: float) -> List[Batch]:
+    """Group arrivals like a log stream: flush at batch_size records or batch_window seconds."""
+    batches = []
+    current = None
+    for t in times:
+        if current and (len(current.records) >= batch_size or t - current.arrivals[0] >= batch_window):
+            batches.append(current)
+            current = None
+        if current is None:
+            current = Batch(t, [], [])
+        current.arrivals.append(t)
+        current.records.append(generator.record())
+        current.ready = t
+    if current:
+        batches.append(current)
+    return batches
+
+def instrument(module, totals: Dict[str, float]) -> None:
+    """Wrap handler stages so their time is accumulated into ``totals``."""
+    for attribute, label in STAGES:
+        original = getattr(module, attribute)
+
+        def timed(*args, _original=original, _label=label, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                totals[_label] += time.perf_counter() - start
+        setattr(module, attribute, timed)
+
+def simulate(batches: List[Batch], service_times: List[float], concurrency: int) -> List[Tuple[float, float]]:
+    """FIFO dispatch to ``concurrency`` workers; returns (arrival, completion) per record."""
+    free = [0.0] * concurrency
+    completions = []
+    for batch, service in zip(batches, service_times):
+        start = max(batch.ready, heapq.heappop(free))
+        end = start + service
+        heapq.heappush(free, end)
+        completions.extend((arrival, end) for arrival in batch.arrivals)
+    return completions
+
+def phase_report(name: str, completions: List[Tuple[float, float]], start: float, end: float) -> Dict:
+    window = [(arrival, done) for arrival, done in completions if start <= arrival < end]
+    if not window:
+        return {'phase': name, 'events': 0}
+    lags = [done - arrival for arrival, done in window]
+    return {
+        'phase': name,
+        'events': len(window),
+        'offered_per_sec': len(window) / (end - start),
+        'p50_lag_ms': percentile(lags, 50) * 1000,
+        'p99_lag_ms': percentile(lags, 99) * 1000,
+        'max_lag_ms': max(lags) * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay synthetic release-day traffic through the ingest Lambda")
+    parser.add_argument("--rate", type=float, default=50, help="Baseline requests/sec")
+    parser.add_argument("--spike", type=float, default=50, help="Spike multiplier over the baseline (1 = steady)")
+    parser.add_argument("--duration", type=float, default=60, help="Simulated seconds of traffic")
+    parser.add_argument("--spike-at", type=float, default=20, help="Seconds into the replay the spike peaks")
+    parser.add_argument("--spike-duration", type=float, default=10, help="Seconds the spike holds at its peak")
+    parser.add_argument("--ramp", type=float, default=2, help="Seconds to ramp up to and down from the spike")
+    parser.add_argument("--batch-size", type=int, default=100, help="Max records per invocation")
+    parser.add_argument("--batch-window", type=float, default=1.0, help="Max seconds a batch waits to fill")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent Lambda instances")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Injected latency per AWS call")
+    parser.add_argument("--duplicate-share", type=float, default=0.0,
+                        help="Fraction of records that are redeliveries of a recent record")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+    os.environ.update(ENVIRONMENT)
+    rng = random.Random(args.seed)
+    generator = TrafficGenerator(args.seed, duplicate_share=args.duplicate_share)
+    profile = spike_profile(args.rate, args.spike, args.spike_at, args.spike_duration, args.ramp)
+    batches = make_batches(arrivals(profile, args.duration, rng), generator, args.batch_size, args.batch_window)
+    total_records = sum(len(batch.records) for batch in batches)
+    print(f"Replaying {total_records:,} requests in {len(batches):,} batches "
+          f"({args.rate:g}/s baseline, {args.spike:g}x spike, {args.concurrency} concurrent)")
+
+    aws = FakeAWS(latency=args.latency_ms / 1000, seed=args.seed)
+    totals: Dict[str, float] = defaultdict(float)
+    with aws.installed():
+        handler_module = importlib.import_module('process_download_logs')
+        instrument(handler_module, totals)
+
+        service_times = []
+        for batch in batches:
+            start = time.perf_counter()
+            handler_module.lambda_handler({'Records': batch.records}, None)
+            service_times.append(time.perf_counter() - start)
+
+    busy = sum(service_times)
+    completions = simulate(batches, service_times, args.concurrency)
+    spike_start = args.spike_at - args.ramp
+    spike_end = args.spike_at + args.spike_duration + args.ramp
+    phases = [
+        phase_report('before spike', completions, 0, spike_start),
+        phase_report('spike', completions, spike_start, spike_end),
+        phase_report('after spike', completions, spike_end, args.duration)
+    ]
+    drained_at = max(done for _, done in completions) if completions else 0
+    capacity = total_records / busy * args.concurrency if busy else float('inf')
+    peak_rate = args.rate * max(args.spike, 1)
+
+    print(f"\nSustained capacity: {capacity:,.0f} requests/s "
+          f"({total_records / busy:,.0f}/s per instance); peak offered {peak_rate:,.0f}/s")
+    print(f"Backlog drained {max(drained_at - args.duration, 0):.2f}s after the last request")
+    print(f"\n{'phase':<14} {'events':>8} {'offered/s':>10} {'p50 lag':>10} {'p99 lag':>10} {'max lag':>10}")
+    for phase in phases:
+        if phase['events']:
+            print(f"{phase['phase']:<14} {phase['events']:>8,} {phase['offered_per_sec']:>10,.0f} "
+                  f"{phase['p50_lag_ms']:>8.0f}ms {phase['p99_lag_ms']:>8.0f}ms {phase['max_lag_ms']:>8.0f}ms")
+
+    accounted = sum(totals.values())
+    breakdown = dict(totals, handler=busy - accounted)
+    print("\nTime in handler:")
+    for label, seconds in sorted(breakdown.items(), key=lambda item: -item[1]):
+        print(f"  {label:<12} {seconds:8.3f}s  {seconds / busy:6.1%}")
+    print(f"  API calls per request: {aws.total_calls() / total_records:.2f} ({dict(aws.calls)})")
+    stored = len(aws.tables.get(ENVIRONMENT['DOWNLOADS_TABLE'], {}))
+    print(f"  Download records stored: {stored:,}")
+
+    keeps_up = capacity >= peak_rate
+    print(f"\n{'✅ Keeps up' if keeps_up else '❌ Falls behind'} with a {args.spike:g}x spike")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'args': vars(args),
+                'requests': total_records,
+                'batches': len(batches),
+                'capacity_per_sec': capacity,
+                'peak_offered_per_sec': peak_rate,
+                'keeps_up': keeps_up,
+                'phases': phases,
+                'breakdown_s': breakdown,
+                'api_calls': dict(aws.calls)
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == '__main__':
+    main()
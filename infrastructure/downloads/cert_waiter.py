@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Wait for one or more ACM certificates to be issued.
+
+Certificates are polled concurrently with jittered exponential backoff, so a
+multi-domain rollout finishes as soon as the last certificate validates. The
+DNS validation CNAMEs are resolved locally while waiting. If they still have
+not propagated after a grace period, the wait fails fast instead of polling
+ACM until the timeout.
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Optional
+
+import boto3
+import requests
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:  # dnspython is optional; fall back to DNS-over-HTTPS
+    dns = None
+
+DOH_URL = "https://cloudflare-dns.com/dns-query"
+FAILED_STATUSES = {'FAILED', 'VALIDATION_TIMED_OUT', 'REVOKED', 'EXPIRED', 'INACTIVE'}
+
+DEFAULT_TIMEOUT = 1800
+DEFAULT_DNS_GRACE = 600
+BASE_DELAY = 5
+MAX_DELAY = 60
+
+@dataclass
+class CertificateResult:
+    arn: str
+    status: str
+    elapsed: float
+    reason: str = ""
+
+    @property
+    def issued(self) -> bool:
+        return self.status == 'ISSUED'
+
+def normalize(name: str) -> str:
+    return name.rstrip('.').lower()
+
+def resolve_cname(name: str) -> Optional[str]:
+    """Resolve a CNAME target, or None if it does not resolve (yet).
+
+    Lookup failures such as timeouts also count as unresolved, so callers
+    keep polling.
+    """
+    if dns is not None:
+        try:
+            answer = dns.resolver.resolve(name, 'CNAME')
+        except dns.exception.DNSException:  # NXDOMAIN, NoAnswer, Timeout, ...
+            return None
+        return normalize(answer[0].target.to_text())
+
+    try:
+        response = requests.get(DOH_URL, params={"name": name, "type": "CNAME"},
+                                headers={"Accept": "application/dns-json"}, timeout=10)
+        response.raise_for_status()
+        answers = response.json().get("Answer", [])
+    except (requests.RequestException, ValueError):  # Includes non-JSON or truncated bodies
+        return None
+    for answer in answers:
+        if answer.get("type") == 5:  # CNAME
+            return normalize(answer["data"])
+    return None
+
+def missing_validation_records(certificate: dict) -> List[str]:
+    """Validation CNAMEs that don't resolve to the value ACM expects."""
+    missing = []
+    for option in certificate.get('DomainValidationOptions', []):
+        record = option.get('ResourceRecord')
+        if option.get('ValidationMethod', 'DNS') != 'DNS' or not record:
+            continue
+        if option.get('ValidationStatus') == 'SUCCESS':
+            continue
+        target = resolve_cname(record['Name'])
+        if target != normalize(record['Value']):
+            missing.append(f"{normalize(record['Name'])} -> {target or 'not found'}")
+    return missing
+
+def wait_for_certificate(acm, arn: str, timeout: float = DEFAULT_TIMEOUT,
+                         dns_grace: float = DEFAULT_DNS_GRACE, check_dns: bool = True) -> CertificateResult:
+    """Poll one certificate until it is issued, fails, or can't validate."""
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        certificate = acm.describe_certificate(CertificateArn=arn)['Certificate']
+        status = certificate['Status']
+        elapsed = time.monotonic() - started
+
+        if status == 'ISSUED':
+            return CertificateResult(arn, status, elapsed)
+        if status in FAILED_STATUSES:
+            return CertificateResult(arn, status, elapsed, certificate.get('FailureReason', ''))
+
+        if check_dns and status == 'PENDING_VALIDATION':
+            missing = missing_validation_records(certificate)
+            if missing and elapsed >= dns_grace:
+                return CertificateResult(arn, status, elapsed,
+                                         f"validation records not propagated: {', '.join(missing)}")
+
+        if elapsed >= timeout:
+            return CertificateResult(arn, 'TIMED_OUT', elapsed, f"still {status}")
+
+        # Full jitter keeps concurrent waiters from polling ACM in lockstep
+        delay = random.uniform(BASE_DELAY / 2, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+        time.sleep(min(delay, max(timeout - elapsed, 0)))
+        attempt += 1
+
+def wait_for_certificates(arns: List[str], timeout: float = DEFAULT_TIMEOUT,
+                          dns_grace: float = DEFAULT_DNS_GRACE, check_dns: bool = True,
+                          region: str = 'us-east-1') -> List[CertificateResult]:
+    """Wait for every certificate concurrently; report each as it finishes."""
+    acm = boto3.client('acm', region_name=region)
+    results = []
+    with ThreadPoolExecutor(max_workers=max(len(arns), 1)) as executor:
+        futures = [executor.submit(wait_for_certificate, acm, arn, timeout, dns_grace, check_dns)
+                   for arn in arns]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.issued:
+                print(f"✅ {result.arn} issued after {result.elapsed:.1f}s")
+            else:
+                print(f"❌ {result.arn} {result.status} after {result.elapsed:.1f}s: {result.reason}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Wait for ACM certificates to be issued")
+    parser.add_argument("arns", nargs="+", help="Certificate ARNs")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Seconds to wait for each certificate")
+    parser.add_argument("--dns-grace", type=float, default=DEFAULT_DNS_GRACE,
+                        help="Seconds to allow validation CNAMEs to propagate before giving up")
+    parser.add_argument("--skip-dns-check", action="store_true",
+                        help="Don't resolve validation CNAMEs while waiting")
+    parser.add_argument("--region", default="us-east-1", help="ACM region")
+
+    args = parser.parse_args()
+
+    print(f"Waiting for {len(args.arns)} certificate(s)...")
+    results = wait_for_certificates(args.arns, args.timeout, args.dns_grace,
+                                    not args.skip_dns_check, args.region)
+    if not all(result.issued for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
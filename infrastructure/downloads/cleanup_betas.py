@@ -6,6 +6,9 @@ from datetime import datetime
 import sys
 import os
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'functions'))
+from publishing import publish_manifest
+
 def load_manifest(s3_client, bucket: str) -> dict:
     """Load manifest from S3."""
     try:
@@ -16,15 +19,9 @@ def load_manifest(s3_client, bucket: str) -> dict:
         sys.exit(1)
 
 def save_manifest(s3_client, bucket: str, manifest: dict) -> None:
-    """Save manifest back to S3."""
+    """Save manifest back to S3, refreshing the hashed copies and pointer too."""
     try:
-        s3_client.put_object(
-            Bucket=bucket,
-            Key='manifest.json',
-            Body=json.dumps(manifest, indent=2),
-            ContentType='application/json',
-            CacheControl='no-cache'
-        )
+        publish_manifest(s3_client, bucket, json.dumps(manifest, indent=2))
     except Exception as e:
         print(f"Error saving manifest: {e}")
         sys.exit(1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Persistent cache of parsed commits keyed by commit hash.
+
+Commits are immutable, so once a hash has been read and classified it never
+needs to be parsed again. Range queries list hashes with ``git rev-list``
+(cheap: no commit data) and only read and parse the commits that are not yet
+cached. The cache is an SQLite file inside the repository's git directory,
+shared by generate_notes.py, compare_versions.py and github_release.py.
+"""
+import argparse
+import os
+import sqlite3
+import subprocess
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from conventional_commits import PARSER_VERSION, parse_conventional_commit
+from git_history import Commit, iter_commits, iter_revisions
+
+CACHE_FILENAME = 'rinawarp-commit-cache.sqlite'
+BATCH_SIZE = 500
+
+RAW_COLUMNS = ['hash', 'short_hash', 'author', 'timestamp', 'subject', 'body']
+COLUMNS = RAW_COLUMNS + ['type', 'scope', 'description', 'breaking']
+
+@dataclass
+class CachedCommit(Commit):
+    type: str
+    scope: Optional[str]
+    description: str
+    breaking: bool
+
+def default_cache_path() -> str:
+    """Cache location: $COMMIT_CACHE_PATH, else inside the git directory."""
+    if os.environ.get('COMMIT_CACHE_PATH'):
+        return os.environ['COMMIT_CACHE_PATH']
+    git_dir = subprocess.check_output(['git', 'rev-parse', '--git-common-dir'], text=True).strip()
+    return os.path.join(git_dir, CACHE_FILENAME)
+
+def classify(commit: Commit) -> CachedCommit:
+    parsed = parse_conventional_commit(commit.subject, commit.body)
+    return CachedCommit(
+        **commit.to_dict(),
+        type=parsed['type'],
+        scope=parsed['scope'],
+        description=parsed['description'],
+        breaking=parsed['breaking']
+    )
+
+class CommitCache:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_cache_path()
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS commits ({', '.join(COLUMNS)}, PRIMARY KEY (hash))")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._check_parser_version()
+
+    def _check_parser_version(self) -> None:
+        """Re-classify cached commits if the parser changed since they were stored."""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'parser_version'").fetchone()
+        if row and int(row[0]) == PARSER_VERSION:
+            return
+        # Subjects and bodies are still valid; only the parsed columns are rebuilt
+        rows = self.db.execute(f"SELECT {', '.join(RAW_COLUMNS)} FROM commits").fetchall()
+        with self.db:
+            self.db.execute("DROP TABLE commits")
+            self.db.execute(f"CREATE TABLE commits ({', '.join(COLUMNS)}, PRIMARY KEY (hash))")
+        self._store(classify(Commit(*row)) for row in rows)
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('parser_version', ?)", (str(PARSER_VERSION),))
+
+    def _store(self, commits: Iterable[CachedCommit]) -> None:
+        with self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO commits VALUES ({', '.join('?' * len(COLUMNS))})",
+                ([getattr(commit, column) for column in COLUMNS] for commit in commits)
+            )
+
+    def lookup(self, hashes: List[str]) -> Dict[str, CachedCommit]:
+        rows = self.db.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM commits WHERE hash IN ({', '.join('?' * len(hashes))})",
+            hashes
+        )
+        return {row[0]: CachedCommit(*row[:-1], breaking=bool(row[-1])) for row in rows}
+
+    def commits(self, rev_range: str, no_merges: bool = True) -> Iterator[CachedCommit]:
+        """Yield parsed commits in ``rev_range`` (newest first), parsing only cache misses."""
+        return self.resolve(iter_revisions(rev_range, no_merges), no_merges)
+
+    def resolve(self, revisions: Iterable[str], no_merges: bool = True) -> Iterator[CachedCommit]:
+        """Yield parsed commits for ``revisions`` in the given order, parsing only cache misses."""
+        revisions = iter(revisions)
+        while True:
+            batch = list(islice(revisions, BATCH_SIZE))
+            if not batch:
+                return
+            found = self.lookup(batch)
+            missing = [rev for rev in batch if rev not in found]
+            if missing:
+                parsed = [classify(commit) for commit in iter_commits(revs=missing, no_merges=no_merges)]
+                self._store(parsed)
+                found.update((commit.hash, commit) for commit in parsed)
+            for rev in batch:
+                if rev in found:
+                    yield found[rev]
+
+    def close(self) -> None:
+        self.db.close()
+
+def cached_commits(rev_range: str, no_merges: bool = True) -> Iterator[CachedCommit]:
+    """Yield parsed commits for a range through the shared on-disk cache."""
+    cache = CommitCache()
+    try:
+        yield from cache.commits(rev_range, no_merges)
+    finally:
+        cache.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm or inspect the commit metadata cache")
+    parser.add_argument("rev_range", nargs="?", default="HEAD", help="Revision range to cache")
+    parser.add_argument("--cache", help="Cache file (default: inside the git directory)")
+
+    args = parser.parse_args()
+    cache = CommitCache(args.cache)
+    count = sum(1 for _ in cache.commits(args.rev_range))
+    total = cache.db.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+    cache.close()
+    print(f"{count} commits in {args.rev_range}; {total} cached in {cache.path}")
+
+if __name__ == "__main__":
+    main()
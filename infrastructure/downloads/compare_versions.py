@@ -7,6 +7,9 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import semantic_version
 
+from commit_cache import CommitCache, cached_commits
+from git_history import iter_parents
+
 @dataclass
 class VersionChange:
     type: str  # added, removed, modified
@@ -58,44 +61,16 @@ def compare_platform_info(old_info: dict, new_info: dict) -> List[VersionChange]
 
 def get_commit_details(from_ref: str, to_ref: str) -> List[dict]:
     """Get detailed commit information between two refs."""
-    cmd = [
-        'git', 'log', '--no-merges',
-        '--pretty=format:%H|%s|%an|%at|%b',
-        f'{from_ref}..{to_ref}'
-    ]
-    
     try:
-        output = subprocess.check_output(cmd, text=True)
-        commits = []
-        for line in output.split('\n'):
-            if not line:
-                continue
-            parts = line.split('|', 4)
-            if len(parts) >= 4:
-                hash, subject, author, timestamp = parts[:4]
-                body = parts[4] if len(parts) > 4 else ''
-                commits.append({
-                    'hash': hash,
-                    'subject': subject,
-                    'author': author,
-                    'timestamp': int(timestamp),
-                    'body': body
-                })
-        return commits
+        return [commit.to_dict() for commit in cached_commits(f'{from_ref}..{to_ref}')]
     except subprocess.CalledProcessError:
         return []
 
-def compare_versions(old_version: str, new_version: str, manifest_path: str) -> Tuple[List[VersionChange], List[dict]]:
-    """Compare two versions and generate changelog."""
-    manifest = load_manifest(manifest_path)
-    
-    old_details = get_version_details(manifest, old_version, True)
-    new_details = get_version_details(manifest, new_version, True)
-    
-    if not old_details or not new_details:
-        print("Error: One or both versions not found in manifest")
-        sys.exit(1)
-    
+def parse_version(version: str) -> semantic_version.Version:
+    return semantic_version.Version(version)
+
+def diff_version_details(old_details: dict, new_details: dict) -> List[VersionChange]:
+    """Compare the manifest entries of two versions."""
     changes = []
     
     # Compare release notes
@@ -142,11 +117,100 @@ def compare_versions(old_version: str, new_version: str, manifest_path: str) ->
         new_platform = new_details['platforms'][platform]
         changes.extend(compare_platform_info(old_platform, new_platform))
     
+    return changes
+
+def compare_versions(old_version: str, new_version: str, manifest_path: str) -> Tuple[List[VersionChange], List[dict]]:
+    """Compare two versions and generate changelog."""
+    manifest = load_manifest(manifest_path)
+    
+    old_details = get_version_details(manifest, old_version, True)
+    new_details = get_version_details(manifest, new_version, True)
+    
+    if not old_details or not new_details:
+        print("Error: One or both versions not found in manifest")
+        sys.exit(1)
+    
+    changes = diff_version_details(old_details, new_details)
+    
     # Get commit history between versions
     commits = get_commit_details(f'v{old_version}', f'v{new_version}')
     
     return changes, commits
 
+def existing_tags() -> set:
+    try:
+        output = subprocess.check_output(['git', 'tag', '--list'], text=True)
+    except subprocess.CalledProcessError:
+        return set()
+    return set(output.split())
+
+def bucket_commits(tags: List[str]) -> Dict[str, List[str]]:
+    """Assign each commit in ``tags[0]..tags[-1]`` to the first tag (ascending) that contains it.
+
+    History is walked once with ``git rev-list --parents`` over the whole range;
+    commits are then bucketed by a breadth-first walk from each tag in order,
+    stopping at commits already claimed by an earlier tag. The result maps each
+    tag after the first to its non-merge commits (newest first).
+    """
+    buckets = {tag: [] for tag in tags[1:]}
+    known = existing_tags()
+    present = [tag for tag in tags if tag in known]
+    if len(present) < 2:
+        return buckets
+
+    order = []
+    parents = {}
+    try:
+        for rev, *rev_parents in iter_parents(present[:0:-1] + [f'^{present[0]}']):
+            order.append(rev)
+            parents[rev] = rev_parents
+    except subprocess.CalledProcessError:
+        return buckets
+
+    tips = subprocess.check_output(['git', 'rev-parse'] + [f'{tag}^{{commit}}' for tag in present[1:]], text=True).split()
+    owner = {}
+    for tag, tip in zip(present[1:], tips):
+        stack = [tip] if tip in parents and tip not in owner else []
+        while stack:
+            rev = stack.pop()
+            if rev in owner:
+                continue
+            owner[rev] = tag
+            stack.extend(parent for parent in parents[rev] if parent in parents and parent not in owner)
+
+    for rev in order:
+        if rev in owner and len(parents[rev]) <= 1:
+            buckets[owner[rev]].append(rev)
+    return buckets
+
+def compare_version_matrix(versions: List[str], manifest_path: str) -> List[Tuple[str, str, List[VersionChange], List[dict]]]:
+    """Compare every adjacent pair of ``versions`` with one manifest load and one history walk.
+
+    Returns ``(old_version, new_version, changes, commits)`` for each pair, in
+    ascending version order.
+    """
+    manifest = load_manifest(manifest_path)
+    versions = sorted(set(versions), key=parse_version)
+    
+    details = {version: get_version_details(manifest, version, True) for version in versions}
+    missing = [version for version, entry in details.items() if not entry]
+    if missing:
+        print(f"Error: Versions not found in manifest: {', '.join(missing)}")
+        sys.exit(1)
+    
+    tags = [f'v{version}' for version in versions]
+    buckets = bucket_commits(tags)
+    cache = CommitCache()
+    try:
+        commits = {tag: [commit.to_dict() for commit in cache.resolve(revs)] for tag, revs in buckets.items()}
+    finally:
+        cache.close()
+    
+    return [
+        (old, new, diff_version_details(details[old], details[new]), commits[f'v{new}'])
+        for old, new in zip(versions, versions[1:])
+    ]
+
 def format_changelog(changes: List[VersionChange], commits: List[dict], format: str = 'markdown') -> str:
     """Format changelog in the specified format."""
     if format == 'markdown':
@@ -186,10 +250,28 @@ def format_changelog(changes: List[VersionChange], commits: List[dict], format:
     else:
         return "Unsupported format"
 
+def format_matrix(results: List[Tuple[str, str, List[VersionChange], List[dict]]], format: str = 'markdown') -> str:
+    """Format the changelogs of several adjacent version pairs."""
+    if format == 'json':
+        return json.dumps([
+            {
+                'from': old,
+                'to': new,
+                'changes': [vars(c) for c in changes],
+                'commits': commits
+            }
+            for old, new, changes, commits in results
+        ], indent=2)
+    
+    sections = []
+    for old, new, changes, commits in reversed(results):
+        sections.append(f"# {old} → {new}\n" + format_changelog(changes, commits, format))
+    return '\n\n'.join(sections)
+
 def main():
-    parser = argparse.ArgumentParser(description="Compare two versions and generate changelog")
-    parser.add_argument("old_version", help="Old version number")
-    parser.add_argument("new_version", help="New version number")
+    parser = argparse.ArgumentParser(description="Compare versions and generate changelogs")
+    parser.add_argument("versions", nargs='+',
+                      help="Old and new version numbers, or more versions for a changelog of every adjacent pair")
     parser.add_argument("--manifest", default="version-manifest.json",
                       help="Path to version manifest")
     parser.add_argument("--format", choices=['markdown', 'json'],
@@ -198,19 +280,23 @@ def main():
     
     args = parser.parse_args()
     
+    if len(args.versions) < 2:
+        parser.error("at least two versions are required")
+    
     try:
-        old_ver = semantic_version.Version(args.old_version.replace('-beta.', '-beta'))
-        new_ver = semantic_version.Version(args.new_version.replace('-beta.', '-beta'))
-        
-        if old_ver >= new_ver:
-            print("Error: Old version must be less than new version")
-            sys.exit(1)
+        parsed = [parse_version(version) for version in args.versions]
     except ValueError as e:
         print(f"Error: Invalid version format - {e}")
         sys.exit(1)
     
-    changes, commits = compare_versions(args.old_version, args.new_version, args.manifest)
-    output = format_changelog(changes, commits, args.format)
+    if len(args.versions) == 2:
+        if parsed[0] >= parsed[1]:
+            print("Error: Old version must be less than new version")
+            sys.exit(1)
+        changes, commits = compare_versions(args.versions[0], args.versions[1], args.manifest)
+        output = format_changelog(changes, commits, args.format)
+    else:
+        output = format_matrix(compare_version_matrix(args.versions, args.manifest), args.format)
     
     if args.output:
         with open(args.output, 'w') as f:
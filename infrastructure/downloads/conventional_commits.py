@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Conventional commit parsing and classification shared by the release tooling."""
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Bump whenever parsing output changes so cached parses are recomputed
+PARSER_VERSION = 2
+
+COMMIT_TYPES = ('feat', 'fix', 'docs', 'style', 'refactor', 'perf', 'test', 'build', 'ci', 'chore')
+
+COMMIT_PATTERN = re.compile(
+    r'(?P<type>' + '|'.join(COMMIT_TYPES) + r')(?:\((?P<scope>[^)]+)\))?(?P<breaking>!)?: (?P<description>.+)'
+)
+BREAKING_FOOTER = re.compile(r'^BREAKING[ -]CHANGE: ', re.MULTILINE)
+
+BREAKING_CATEGORY = 'Breaking Changes'
+DEFAULT_CATEGORY = 'Other Changes'
+DEFAULT_TYPE_MAP = {
+    'feat': 'Features',
+    'fix': 'Bug Fixes',
+    'perf': 'Performance'
+}
+
+def parse_conventional_commit(message: str, body: str = '') -> Dict:
+    """Parse a conventional commit subject (and body, for BREAKING CHANGE footers)."""
+    match = COMMIT_PATTERN.fullmatch(message)
+    if match and match['breaking']:
+        breaking = True
+    else:
+        breaking = bool(body) and BREAKING_FOOTER.search(body) is not None
+    if not match:
+        return {'type': 'other', 'scope': None, 'description': message, 'breaking': breaking}
+
+    return {
+        'type': match['type'],
+        'scope': match['scope'],
+        'description': match['description'],
+        'breaking': breaking
+    }
+
+def load_type_map(value: Optional[str]) -> Optional[Dict[str, str]]:
+    """Load a type-to-category map from inline JSON or a JSON file path."""
+    if not value:
+        return None
+    if value.lstrip().startswith('{'):
+        return json.loads(value)
+    with open(value, 'r') as f:
+        return json.load(f)
+
+class CommitClassifier:
+    """Route parsed commits to release-note categories through a dict lookup."""
+
+    def __init__(self, type_map: Optional[Dict[str, str]] = None,
+                 default_category: str = DEFAULT_CATEGORY,
+                 breaking_category: Optional[str] = BREAKING_CATEGORY):
+        self.type_map = dict(DEFAULT_TYPE_MAP if type_map is None else type_map)
+        self.default_category = default_category
+        self.breaking_category = breaking_category
+
+        # Category order for output: breaking first, then map order, default last
+        order = [breaking_category] if breaking_category else []
+        order.extend(self.type_map.values())
+        order.append(default_category)
+        self.categories = list(dict.fromkeys(order))
+
+    def category(self, commit_type: str, breaking: bool = False) -> str:
+        if breaking and self.breaking_category:
+            return self.breaking_category
+        return self.type_map.get(commit_type, self.default_category)
+
+    def empty_categories(self) -> Dict[str, List]:
+        return {category: [] for category in self.categories}
+
+    def classify(self, messages: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Parse and bucket raw commit subjects."""
+        categories = self.empty_categories()
+        for message in messages:
+            parsed = parse_conventional_commit(message)
+            categories[self.category(parsed['type'], parsed['breaking'])].append(parsed)
+        return categories
@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+import time
+import boto3
+from datetime import datetime, timedelta
+from typing import Dict, List, Any
+
+from download_records import ARCHIVE_AFTER_DAYS, archive_key, query_downloads
+from instrumentation import instrumented, stage
+from profiling import profiled
+
+# Low-level client for the parallel queries; the Table resource backfills TTLs
+dynamodb = boto3.client('dynamodb')
+s3 = boto3.client('s3')
+downloads_table_name = os.environ['DOWNLOADS_TABLE']
+downloads_table = boto3.resource('dynamodb').Table(downloads_table_name)
+archive_bucket = os.environ['ARCHIVE_BUCKET']
+
+# Days stay in the table this long after they become eligible for archiving,
+# so a job that fails can catch up on its next runs
+GRACE_DAYS = int(os.environ.get('ARCHIVE_GRACE_DAYS', '14'))
+
+def is_archived(day: str) -> bool:
+    """Check whether a day partition already exists."""
+    try:
+        s3.head_object(Bucket=archive_bucket, Key=archive_key(day))
+        return True
+    except s3.exceptions.ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return False
+        raise
+
+def write_partition(day: str, downloads: List[Dict]) -> None:
+    """Write one day as gzip-compressed JSON lines, oldest first."""
+    lines = [
+        json.dumps({key: value for key, value in d.items() if key != 'exp'}, default=str)
+        for d in sorted(downloads, key=lambda d: d['timestamp'])
+    ]
+    s3.put_object(
+        Bucket=archive_bucket,
+        Key=archive_key(day),
+        Body=gzip.compress('\n'.join(lines).encode(), compresslevel=9),
+        ContentType='application/x-ndjson',
+        ContentEncoding='gzip'
+    )
+
+def expire_legacy_items(downloads: List[Dict]) -> int:
+    """Set a TTL on archived items written before downloads carried one."""
+    expires = int(time.time()) + GRACE_DAYS * 86400
+    expired = 0
+    for download in downloads:
+        if 'exp' in download:
+            continue
+        downloads_table.update_item(
+            Key={'download_id': download['download_id']},
+            UpdateExpression='SET exp = :exp',
+            ExpressionAttributeValues={':exp': expires}
+        )
+        expired += 1
+    return expired
+
+def archive_days(days: List[str]) -> Dict:
+    """Archive complete days; each month is queried once."""
+    summary = {'days': 0, 'downloads': 0, 'legacy_expired': 0}
+    months = sorted({day[:7] for day in days})
+    for month in months:
+        month_days = [day for day in days if day.startswith(month)]
+        with stage('dynamodb'):
+            downloads = query_downloads(dynamodb, downloads_table_name,
+                                        f"{month_days[0]}T00:00:00", f"{month_days[-1]}T23:59:59.999999")
+        by_day = {day: [] for day in month_days}
+        for download in downloads:
+            # The query spans the month's first to last pending day; skip the
+            # days in between that are already archived
+            day_downloads = by_day.get(download['timestamp'][:10])
+            if day_downloads is not None:
+                day_downloads.append(download)
+
+        for day, day_downloads in by_day.items():
+            # The partition marks the day done, so backfill TTLs first: a
+            # failed backfill leaves the day unarchived and it is retried
+            with stage('ttl'):
+                summary['legacy_expired'] += expire_legacy_items(day_downloads)
+            # Empty days are written too, so they are not queried again
+            with stage('s3'):
+                write_partition(day, day_downloads)
+            summary['days'] += 1
+            summary['downloads'] += len(day_downloads)
+            print(f"Archived {len(day_downloads)} downloads for {day}")
+    return summary
+
+@instrumented('archive_downloads')
+@profiled('archive_downloads')
+def lambda_handler(event: Dict, context: Any) -> Dict:
+    """Archive every complete day older than ARCHIVE_AFTER_DAYS that isn't archived yet.
+
+    Pass {"since": "YYYY-MM-DD"} to backfill from an earlier day than the
+    grace window.
+    """
+    try:
+        cutoff = datetime.utcnow().date() - timedelta(days=ARCHIVE_AFTER_DAYS)
+        since = event.get('since') or (cutoff - timedelta(days=GRACE_DAYS)).isoformat()
+        day = datetime.strptime(since, '%Y-%m-%d').date()
+
+        candidates = []
+        while day < cutoff:
+            candidates.append(day.isoformat())
+            day += timedelta(days=1)
+        with stage('s3'):
+            pending = [day for day in candidates if not is_archived(day)]
+
+        summary = archive_days(pending) if pending else {'days': 0, 'downloads': 0, 'legacy_expired': 0}
+        return {
+            'statusCode': 200,
+            'body': json.dumps(summary)
+        }
+
+    except Exception as e:
+        print(f"Error archiving downloads: {e}")
+        raise
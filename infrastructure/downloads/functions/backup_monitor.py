@@ -6,6 +6,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 
+from instrumentation import instrumented, stage
+from profiling import profiled
+
 # Set up logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -126,7 +129,8 @@ def check_backup_compliance(bucket_name: str, region: str) -> Dict:
         
         # Wait briefly for replication
         import time
-        time.sleep(5)
+        with stage('replication_wait'):
+            time.sleep(5)
         
         # Verify file exists and is readable
         response = s3.get_object(
@@ -208,6 +212,8 @@ def store_compliance_report(results: Dict) -> None:
         ContentType='application/json'
     )
 
+@instrumented('backup_monitor')
+@profiled('backup_monitor')
 def lambda_handler(event: Dict, context: Dict) -> Dict:
     """Main Lambda handler for backup testing and compliance monitoring."""
     try:
@@ -219,19 +225,25 @@ def lambda_handler(event: Dict, context: Dict) -> Dict:
         all_results = []
         
         # Check primary bucket
-        results = check_backup_compliance(primary_bucket, 'us-east-1')
+        with stage('compliance'):
+            results = check_backup_compliance(primary_bucket, 'us-east-1')
         all_results.append(results)
-        store_compliance_report(results)
+        with stage('s3'):
+            store_compliance_report(results)
         if slack_webhook:
-            notify_slack(slack_webhook, results)
+            with stage('slack'):
+                notify_slack(slack_webhook, results)
         
         # Check backup buckets
         for bucket, region in backup_buckets.items():
-            results = check_backup_compliance(bucket, region)
+            with stage('compliance'):
+                results = check_backup_compliance(bucket, region)
             all_results.append(results)
-            store_compliance_report(results)
+            with stage('s3'):
+                store_compliance_report(results)
             if slack_webhook:
-                notify_slack(slack_webhook, results)
+                with stage('slack'):
+                    notify_slack(slack_webhook, results)
         
         return {
             'statusCode': 200,
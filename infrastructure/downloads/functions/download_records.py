@@ -0,0 +1,181 @@
+"""Item encoding and write-sharded index keys for the downloads table.
+
+Items are stored compactly. The table and index keys keep their names
+(download_id, year_month, platform, version). The remaining fields use short
+attribute names:
+
+    t    epoch seconds (int)
+    c    viewer country
+    uah  user-agent hash; the string lives once in the user-agents table
+
+``decode_download`` turns both compact and pre-compaction items back into
+the long form (timestamp, country, user_agent_hash).
+
+Items also carry ``exp``, a TTL of DOWNLOAD_TTL_DAYS. Days older than
+ARCHIVE_AFTER_DAYS are exported by archive_downloads.py to
+``archive/downloads/dt=YYYY-MM-DD/downloads.jsonl.gz``, before DynamoDB
+expires them. ``get_downloads`` reads from both tiers.
+
+Every download in a month used to share one ``year_month`` GSI hash key, so a
+release day's writes all landed on a single index partition. Items now carry
+``YYYY-MM#N`` with N taken from a hash of the download ID. Readers query every
+shard of every month in range, plus the unsharded ``YYYY-MM`` key written
+before sharding.
+
+YEAR_MONTH_SHARDS may be raised but never lowered. Readers only query shards
+below the current count.
+"""
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from boto3.dynamodb.types import TypeDeserializer
+
+SHARDS = int(os.environ.get('YEAR_MONTH_SHARDS', '8'))
+TTL_DAYS = int(os.environ.get('DOWNLOAD_TTL_DAYS', '0'))
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '90'))
+ARCHIVE_PREFIX = 'archive/downloads'
+QUERY_WORKERS = 16
+
+deserializer = TypeDeserializer()
+
+def shard_key(year_month: str, download_id: str, shards: int = SHARDS) -> str:
+    """GSI hash key for a download, e.g. ``2024-06#3``."""
+    shard = int(hashlib.md5(download_id.encode()).hexdigest()[:8], 16) % shards
+    return f"{year_month}#{shard}"
+
+def months_between(start_time: str, end_time: str) -> List[str]:
+    """``YYYY-MM`` for every month from start_time through end_time (ISO timestamps)."""
+    year, month = int(start_time[:4]), int(start_time[5:7])
+    last = end_time[:7]
+    months = []
+    while True:
+        current = f"{year:04d}-{month:02d}"
+        months.append(current)
+        if current >= last:
+            return months
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def partition_keys(start_time: str, end_time: str = None, shards: int = SHARDS) -> List[str]:
+    """Every GSI hash key that can hold downloads between start_time and end_time."""
+    end_time = end_time or datetime.now().isoformat()
+    keys = []
+    for year_month in months_between(start_time, end_time):
+        keys.append(year_month)  # Items written before sharding
+        keys.extend(f"{year_month}#{shard}" for shard in range(shards))
+    return keys
+
+def user_agent_hash(user_agent: str) -> str:
+    """Key of a user agent in the user-agents table (64 bits of SHA-1, hex)."""
+    return hashlib.sha1(user_agent.encode()).hexdigest()[:16]
+
+def encode_download(download_id: str, version: str, platform: str, epoch: int,
+                    country: str, ua_hash: str, ttl_days: int = TTL_DAYS) -> Dict:
+    """Compact downloads-table item."""
+    year_month = datetime.utcfromtimestamp(epoch).strftime('%Y-%m')
+    item = {
+        'download_id': download_id,
+        'year_month': shard_key(year_month, download_id),
+        'platform': platform,
+        'version': version,
+        't': epoch,
+        'c': country,
+        'uah': ua_hash
+    }
+    if ttl_days:
+        item['exp'] = epoch + ttl_days * 86400
+    return item
+
+def decode_download(item: Dict) -> Dict:
+    """Long-form download from a compact or pre-compaction item."""
+    if 't' not in item:
+        return dict(item)  # Written before compaction
+    download = {
+        'download_id': item['download_id'],
+        'platform': item['platform'],
+        'version': item['version'],
+        'timestamp': datetime.utcfromtimestamp(int(item['t'])).isoformat(),
+        'country': item['c'],
+        'user_agent_hash': item['uah']
+    }
+    if 'exp' in item:
+        download['exp'] = int(item['exp'])
+    return download
+
+def query_partition(client, table: str, year_month: str) -> List[Dict]:
+    """Every download under one YearMonthIndex hash key, decoded."""
+    downloads = []
+    paginator = client.get_paginator('query')
+    for page in paginator.paginate(
+        TableName=table,
+        IndexName='YearMonthIndex',
+        KeyConditionExpression='year_month = :ym',
+        ExpressionAttributeValues={
+            ':ym': {'S': year_month}
+        }
+    ):
+        downloads.extend(
+            decode_download({key: deserializer.deserialize(value) for key, value in item.items()})
+            for item in page.get('Items', [])
+        )
+    return downloads
+
+def query_downloads(client, table: str, start_time: str, end_time: str) -> List[Dict]:
+    """Downloads in the table between two ISO timestamps, querying every month and shard in parallel.
+
+    ``client`` must be a low-level DynamoDB client; unlike Table resources it
+    is safe to share across the query threads.
+    """
+    keys = partition_keys(start_time, end_time)
+    with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(keys))) as executor:
+        partitions = list(executor.map(lambda key: query_partition(client, table, key), keys))
+    return [d for downloads in partitions for d in downloads if start_time <= d['timestamp'] <= end_time]
+
+def days_between(start_time: str, end_time: str) -> List[str]:
+    """``YYYY-MM-DD`` for every day from start_time through end_time."""
+    day = datetime.strptime(start_time[:10], '%Y-%m-%d')
+    last = end_time[:10]
+    days = []
+    while day.strftime('%Y-%m-%d') <= last:
+        days.append(day.strftime('%Y-%m-%d'))
+        day += timedelta(days=1)
+    return days
+
+def archive_key(day: str) -> str:
+    return f"{ARCHIVE_PREFIX}/dt={day}/downloads.jsonl.gz"
+
+def read_archive_day(s3, bucket: str, day: str) -> List[Dict]:
+    """Downloads archived for one day; empty if the day was never archived."""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=archive_key(day))
+    except s3.exceptions.NoSuchKey:
+        return []
+    lines = gzip.decompress(response['Body'].read()).splitlines()
+    return [json.loads(line) for line in lines if line]
+
+def read_archive(s3, bucket: str, start_time: str, end_time: str) -> List[Dict]:
+    """Archived downloads between two ISO timestamps, reading day partitions in parallel."""
+    days = days_between(start_time, end_time)
+    with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(days))) as executor:
+        partitions = list(executor.map(lambda day: read_archive_day(s3, bucket, day), days))
+    return [d for downloads in partitions for d in downloads if start_time <= d['timestamp'] <= end_time]
+
+def get_downloads(client, table: str, s3, archive_bucket: Optional[str],
+                  start_time: str, end_time: str, now: Optional[datetime] = None) -> List[Dict]:
+    """Downloads between two ISO timestamps from the table and, for old ranges, the archive."""
+    now = now or datetime.now()
+    archived_before = (now - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+    expired_before = (now - timedelta(days=TTL_DAYS)).isoformat() if TTL_DAYS else ''
+
+    downloads = []
+    if archive_bucket and start_time < archived_before:
+        downloads.extend(read_archive(s3, archive_bucket, start_time, min(end_time, archived_before)))
+    if end_time >= expired_before:
+        downloads.extend(query_downloads(client, table, max(start_time, expired_before), end_time))
+
+    # A day stays in the table for a grace period after it is archived
+    return list({d['download_id']: d for d in downloads}.values())
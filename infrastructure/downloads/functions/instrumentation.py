@@ -0,0 +1,93 @@
+"""Per-stage timing for Lambda handlers, emitted as CloudWatch Embedded Metric Format.
+
+    @instrumented('process_download_logs')
+    def lambda_handler(event, context):
+        with stage('parse'):
+            ...
+
+Each invocation prints one EMF log line per stage, with the stage's total
+Duration (ms) and Calls, and one line for the whole handler. CloudWatch turns
+these into metrics under ``RinaWarp/Lambda`` with Function and Stage
+dimensions. When ``STAGE_METRICS`` is unset or false, ``instrumented`` returns
+the handler unchanged and ``stage`` returns a shared no-op context manager.
+"""
+import functools
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Callable, Dict, List
+
+NAMESPACE = 'RinaWarp/Lambda'
+ENABLED = os.environ.get('STAGE_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+_NOOP = nullcontext()
+_durations: Dict[str, float] = defaultdict(float)
+_calls: Dict[str, int] = defaultdict(int)
+
+class _Stage:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _durations[self.name] += time.perf_counter() - self.start
+        _calls[self.name] += 1
+        return False
+
+def stage(name: str):
+    """Time a block as part of stage ``name`` (no-op when disabled)."""
+    if not ENABLED:
+        return _NOOP
+    return _Stage(name)
+
+def emf_records(function: str, durations: Dict[str, float], calls: Dict[str, int],
+                properties: Dict) -> List[Dict]:
+    timestamp = int(time.time() * 1000)
+    return [
+        {
+            '_aws': {
+                'Timestamp': timestamp,
+                'CloudWatchMetrics': [{
+                    'Namespace': NAMESPACE,
+                    'Dimensions': [['Function', 'Stage']],
+                    'Metrics': [
+                        {'Name': 'Duration', 'Unit': 'Milliseconds'},
+                        {'Name': 'Calls', 'Unit': 'Count'}
+                    ]
+                }]
+            },
+            'Function': function,
+            'Stage': name,
+            'Duration': round(durations[name] * 1000, 3),
+            'Calls': calls[name],
+            **properties
+        }
+        for name in durations
+    ]
+
+def instrumented(function: str) -> Callable:
+    """Decorate a handler to reset stage timers per invocation and emit them afterwards."""
+    def decorator(handler: Callable) -> Callable:
+        if not ENABLED:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            _durations.clear()
+            _calls.clear()
+            try:
+                with _Stage('handler'):
+                    return handler(event, context)
+            finally:
+                properties = {'RequestId': getattr(context, 'aws_request_id', None)}
+                for record in emf_records(function, _durations, _calls, properties):
+                    print(json.dumps(record))
+        return wrapper
+    return decorator
@@ -1,17 +1,57 @@
+import hashlib
 import json
 import os
+import time
 import boto3
-from datetime import datetime
+from collections import OrderedDict
 import urllib.parse
+from botocore.exceptions import ClientError
+
+from download_records import encode_download, user_agent_hash
+from instrumentation import instrumented, stage
+from profiling import profiled
 
 dynamodb = boto3.resource('dynamodb')
 downloads_table = dynamodb.Table(os.environ['DOWNLOADS_TABLE'])
+user_agents_table = dynamodb.Table(os.environ['USER_AGENTS_TABLE'])
 manifest_bucket = os.environ['MANIFEST_BUCKET']
 manifest_key = 'manifest.json'
 
 s3 = boto3.client('s3')
 cloudwatch = boto3.client('cloudwatch')
 
+class SeenEvents:
+    """Bounded LRU set of event IDs already recorded by this (warm) Lambda instance."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._ids = OrderedDict()
+
+    def __contains__(self, event_id):
+        if event_id in self._ids:
+            self._ids.move_to_end(event_id)
+            return True
+        return False
+
+    def add(self, event_id):
+        self._ids[event_id] = None
+        self._ids.move_to_end(event_id)
+        if len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+
+# Survives across warm invocations; retries that land on another instance are
+# caught by the conditional write instead
+seen_events = SeenEvents(int(os.environ.get('DEDUP_CACHE_SIZE', '10000')))
+# User-agent hashes already present in the user-agents table
+known_user_agents = SeenEvents(int(os.environ.get('USER_AGENT_CACHE_SIZE', '5000')))
+
+def event_id(record):
+    """CloudFront request ID, or a hash of the raw record when there isn't one."""
+    request_id = record['cf'].get('config', {}).get('requestId')
+    if request_id:
+        return request_id
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode()).hexdigest()
+
 def extract_version_from_path(path):
     """Extract version from download path."""
     parts = path.split('/')
@@ -42,20 +82,52 @@ def get_manifest():
         print(f"Error reading manifest: {e}")
         return None
 
-def put_download_record(version, platform, user_agent, country, timestamp):
-    """Record download in DynamoDB."""
+def put_user_agent(user_agent):
+    """Store a user agent in the dictionary table once; returns its hash."""
+    ua_hash = user_agent_hash(user_agent)
+    if ua_hash in known_user_agents:
+        return ua_hash
+    try:
+        user_agents_table.put_item(
+            Item={'ua_hash': ua_hash, 'user_agent': user_agent},
+            ConditionExpression='attribute_not_exists(ua_hash)'
+        )
+        known_user_agents.add(ua_hash)
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            known_user_agents.add(ua_hash)
+        else:
+            print(f"Error recording user agent: {e}")
+    except Exception as e:
+        print(f"Error recording user agent: {e}")
+    return ua_hash
+
+def put_download_record(request_id, version, platform, user_agent, country, timestamp):
+    """Record download in DynamoDB.
+
+    Returns True if recorded, False if this request was already recorded, or
+    None if the write failed.
+    """
     try:
-        downloads_table.put_item(Item={
-            'download_id': f"{platform}#{version}#{timestamp}",
-            'version': version,
-            'platform': platform,
-            'timestamp': timestamp,
-            'user_agent': user_agent,
-            'country': country,
-            'year_month': timestamp[:7]  # YYYY-MM for partition
-        })
+        downloads_table.put_item(
+            Item=encode_download(
+                f"{platform}#{version}#{request_id}",
+                version,
+                platform,
+                timestamp,
+                country,
+                put_user_agent(user_agent)
+            ),
+            ConditionExpression='attribute_not_exists(download_id)'
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        print(f"Error recording download: {e}")
     except Exception as e:
         print(f"Error recording download: {e}")
+    return None
 
 def put_metrics(version, platform):
     """Put download metrics to CloudWatch."""
@@ -77,35 +149,49 @@ def put_metrics(version, platform):
     except Exception as e:
         print(f"Error putting metrics: {e}")
 
+@instrumented('process_download_logs')
+@profiled('process_download_logs')
 def lambda_handler(event, context):
     """Process CloudFront log events."""
     try:
         for record in event['Records']:
-            # Parse CloudFront log
-            cf_event = json.loads(record['cf']['request'])
-            
-            # Extract info
-            path = cf_event['uri']
-            user_agent = cf_event.get('headers', {}).get('user-agent', [{}])[0].get('value', 'Unknown')
-            country = cf_event.get('headers', {}).get('cloudfront-viewer-country', [{}])[0].get('value', 'Unknown')
-            timestamp = datetime.now().isoformat()
-            
-            # Only process actual downloads
-            if not any(ext in path.lower() for ext in ['.dmg', '.exe', '.appimage']):
+            # Retried deliveries are dropped before any network I/O
+            request_id = event_id(record)
+            if request_id in seen_events:
                 continue
             
-            # Extract version and platform
-            version = extract_version_from_path(path)
-            platform = extract_platform(path)
+            with stage('parse'):
+                # Parse CloudFront log
+                cf_event = json.loads(record['cf']['request'])
+                
+                # Extract info
+                path = cf_event['uri']
+                user_agent = cf_event.get('headers', {}).get('user-agent', [{}])[0].get('value', 'Unknown')
+                country = cf_event.get('headers', {}).get('cloudfront-viewer-country', [{}])[0].get('value', 'Unknown')
+                timestamp = int(time.time())
+                
+                # Only process actual downloads
+                if not any(ext in path.lower() for ext in ['.dmg', '.exe', '.appimage']):
+                    continue
+                
+                # Extract version and platform
+                version = extract_version_from_path(path)
+                platform = extract_platform(path)
             
             if not version or platform == 'unknown':
                 continue
             
             # Record download
-            put_download_record(version, platform, user_agent, country, timestamp)
+            with stage('dynamodb'):
+                recorded = put_download_record(request_id, version, platform, user_agent, country, timestamp)
+            if recorded is not None:
+                seen_events.add(request_id)
+            if recorded is False:
+                continue  # Duplicate delivery; count it once
             
             # Update metrics
-            put_metrics(version, platform)
+            with stage('cloudwatch'):
+                put_metrics(version, platform)
             
         return {
             'statusCode': 200,
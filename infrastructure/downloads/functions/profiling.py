@@ -0,0 +1,100 @@
+"""On-demand cProfile and tracemalloc captures for Lambda handlers.
+
+Set ``PROFILE_SAMPLE_RATE`` (0-1) to profile that fraction of invocations.
+Each sampled invocation uploads to ``PROFILE_BUCKET``:
+
+    profiles/<function>/<request id>/profile.pstats      cProfile stats
+    profiles/<function>/<request id>/allocations.snapshot tracemalloc snapshot
+    profiles/<function>/<request id>/summary.json         timing, peak memory, top allocations
+
+``profile_report.py`` merges captures into a ranked hot-function report.
+"""
+import cProfile
+import functools
+import json
+import marshal
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from typing import Callable, Dict
+
+import boto3
+
+SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0') or 0)
+PROFILE_BUCKET = os.environ.get('PROFILE_BUCKET', os.environ.get('REPORTS_BUCKET', ''))
+PROFILE_PREFIX = 'profiles'
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 20
+
+_s3 = None
+
+def profile_key(function: str, request_id: str, name: str) -> str:
+    return f"{PROFILE_PREFIX}/{function}/{request_id}/{name}"
+
+def upload_capture(function: str, request_id: str, profiler: cProfile.Profile,
+                   snapshot: tracemalloc.Snapshot, summary: Dict) -> None:
+    """Upload the pstats dump, allocation snapshot and summary for one invocation."""
+    global _s3
+    if _s3 is None:
+        _s3 = boto3.client('s3')
+
+    profiler.create_stats()
+    # pstats.Stats reads a marshalled stats dict, the same format as Profile.dump_stats
+    bodies = {'profile.pstats': marshal.dumps(profiler.stats)}
+    with tempfile.NamedTemporaryFile(dir='/tmp', suffix='.snapshot') as f:
+        snapshot.dump(f.name)
+        bodies['allocations.snapshot'] = f.read()
+    bodies['summary.json'] = json.dumps(summary, indent=2).encode()
+
+    for name, body in bodies.items():
+        _s3.put_object(
+            Bucket=PROFILE_BUCKET,
+            Key=profile_key(function, request_id, name),
+            Body=body
+        )
+    print(f"Profile captured: s3://{PROFILE_BUCKET}/{profile_key(function, request_id, '')}")
+
+def profiled(function: str) -> Callable:
+    """Decorate a handler to profile a sample of invocations (no-op when disabled)."""
+    def decorator(handler: Callable) -> Callable:
+        if SAMPLE_RATE <= 0 or not PROFILE_BUCKET:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            if random.random() >= SAMPLE_RATE:
+                return handler(event, context)
+
+            request_id = getattr(context, 'aws_request_id', None) or str(uuid.uuid4())
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                return profiler.runcall(handler, event, context)
+            finally:
+                elapsed = time.perf_counter() - start
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                summary = {
+                    'function': function,
+                    'request_id': request_id,
+                    'captured_at': datetime.utcnow().isoformat(),
+                    'duration_ms': round(elapsed * 1000, 3),
+                    'peak_traced_bytes': peak,
+                    'top_allocations': [
+                        {'location': str(stat.traceback[0]), 'size': stat.size, 'count': stat.count}
+                        for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+                    ]
+                }
+                try:
+                    upload_capture(function, request_id, profiler, snapshot, summary)
+                except Exception as e:
+                    # Never fail the invocation because the profile couldn't be stored
+                    print(f"Error uploading profile: {e}")
+        return wrapper
+    return decorator
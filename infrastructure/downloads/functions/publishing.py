@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Union
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip and identity are always published
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+POINTER_CACHE_CONTROL = 'no-cache'
+MANIFEST_KEY = 'manifest.json'
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """Return the body in every supported Content-Encoding."""
+    variants = {
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=9, mtime=0)
+    }
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    return variants
+
+def hashed_key(key: str, digest: str) -> str:
+    """Insert a content hash before the extension: manifest.json -> manifest.<hash>.json"""
+    root, ext = os.path.splitext(key)
+    return f"{root}.{digest[:16]}{ext}"
+
+def pointer_key(key: str) -> str:
+    """Key of the no-cache pointer object referencing the current hashed key."""
+    root, _ = os.path.splitext(key)
+    return f"{root}.current.json"
+
+def publish_object(s3_client, bucket: str, key: str, body: Union[str, bytes],
+                   content_type: str, pointer: Optional[str] = None) -> Dict:
+    """Upload precompressed, content-addressed copies of an object plus a pointer.
+
+    Every encoding is stored under its own immutable key (``.gz``/``.br`` suffixes
+    carry ``Content-Encoding``) so CloudFront can cache them for a year. Only the
+    tiny pointer object is ``no-cache``; it is rewritten on each publish.
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+
+    digest = hashlib.sha256(body).hexdigest()
+    base_key = hashed_key(key, digest)
+    suffixes = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+
+    encodings = {}
+    for encoding, data in compress_variants(body).items():
+        object_key = base_key + suffixes[encoding]
+        extra = {} if encoding == 'identity' else {'ContentEncoding': encoding}
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=object_key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+            Metadata={'sha256': digest},
+            **extra
+        )
+        encodings[encoding] = {'key': object_key, 'size': len(data)}
+
+    record = {
+        'sha256': digest,
+        'key': base_key,
+        'content_type': content_type,
+        'encodings': encodings
+    }
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=pointer or pointer_key(key),
+        Body=json.dumps(record, separators=(',', ':')).encode('utf-8'),
+        ContentType='application/json',
+        CacheControl=POINTER_CACHE_CONTROL
+    )
+    return record
+
+def publish_manifest(s3_client, bucket: str, body: Union[str, bytes]) -> Dict:
+    """Publish the version manifest: hashed copies, pointer, and the legacy manifest.json.
+
+    Every manifest write goes through here so the three never disagree.
+    Older app builds still fetch the plain ``manifest.json``; it is written
+    last, once the hashed copies it describes exist.
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    record = publish_object(s3_client, bucket, MANIFEST_KEY, body, 'application/json')
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=MANIFEST_KEY,
+        Body=body,
+        ContentType='application/json',
+        CacheControl=POINTER_CACHE_CONTROL
+    )
+    return record
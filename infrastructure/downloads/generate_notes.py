@@ -1,70 +1,37 @@
 #!/usr/bin/env python3
 import subprocess
-import re
 import argparse
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional
 from datetime import datetime
 
-def get_git_log(from_tag: Optional[str], to_ref: str = 'HEAD') -> str:
-    """Get git log between two references."""
-    cmd = ['git', 'log', '--no-merges', '--pretty=format:%s|%h|%an|%at']
-    if from_tag:
-        cmd.append(f'{from_tag}..{to_ref}')
-    else:
-        cmd.append(to_ref)
-    
+from commit_cache import CachedCommit, cached_commits
+from conventional_commits import CommitClassifier, load_type_map
+
+def get_git_log(from_tag: Optional[str], to_ref: str = 'HEAD') -> Iterator[CachedCommit]:
+    """Stream parsed commits between two references."""
     try:
-        return subprocess.check_output(cmd, text=True)
+        yield from cached_commits(f'{from_tag}..{to_ref}' if from_tag else to_ref)
     except subprocess.CalledProcessError as e:
         print(f"Error getting git log: {e}")
-        return ""
-
-def parse_conventional_commit(message: str) -> Dict[str, str]:
-    """Parse a conventional commit message."""
-    pattern = r'^(?P<type>feat|fix|docs|style|refactor|perf|test|build|ci|chore)(?:\((?P<scope>[^)]+)\))?: (?P<description>.+)$'
-    match = re.match(pattern, message)
-    
-    if match:
-        return match.groupdict()
-    return {'type': 'other', 'scope': None, 'description': message}
 
-def categorize_changes(log: str) -> Dict[str, List[Dict[str, str]]]:
+def categorize_changes(commits: Iterable[CachedCommit],
+                       classifier: Optional[CommitClassifier] = None) -> Dict[str, List[Dict[str, str]]]:
     """Categorize changes from git log."""
-    if not log:
-        return {}
+    classifier = classifier or CommitClassifier()
+    categories = classifier.empty_categories()
     
-    categories = {
-        'Features': [],
-        'Bug Fixes': [],
-        'Performance': [],
-        'Other Changes': []
-    }
-    
-    for line in log.split('\n'):
-        if not line:
-            continue
-        
-        message, commit_hash, author, timestamp = line.split('|')
-        parsed = parse_conventional_commit(message)
-        
+    for commit in commits:
         change = {
-            'description': parsed['description'],
-            'commit': commit_hash,
-            'author': author,
-            'timestamp': int(timestamp)
+            'description': commit.description,
+            'commit': commit.short_hash,
+            'author': commit.author,
+            'timestamp': commit.timestamp
         }
         
-        if parsed['scope']:
-            change['scope'] = parsed['scope']
+        if commit.scope:
+            change['scope'] = commit.scope
         
-        if parsed['type'] == 'feat':
-            categories['Features'].append(change)
-        elif parsed['type'] == 'fix':
-            categories['Bug Fixes'].append(change)
-        elif parsed['type'] == 'perf':
-            categories['Performance'].append(change)
-        else:
-            categories['Other Changes'].append(change)
+        categories[classifier.category(commit.type, commit.breaking)].append(change)
     
     return categories
 
@@ -100,19 +67,17 @@ def format_release_notes(categories: Dict[str, List[Dict[str, str]]], version: s
     
     return '\n'.join(lines)
 
-def generate_release_notes(version: str, from_tag: Optional[str] = None, is_beta: bool = False) -> str:
+def generate_release_notes(version: str, from_tag: Optional[str] = None, is_beta: bool = False,
+                           type_map: Optional[Dict[str, str]] = None) -> str:
     """Generate release notes from git history."""
     print(f"Generating release notes for version {version}...")
     
-    # Get git log
-    log = get_git_log(from_tag)
-    if not log:
+    # Categorize changes as the git log streams in
+    categories = categorize_changes(get_git_log(from_tag), CommitClassifier(type_map))
+    if not any(categories.values()):
         print("Warning: No git history found")
         return "No changes recorded for this release."
     
-    # Categorize changes
-    categories = categorize_changes(log)
-    
     # Format release notes
     return format_release_notes(categories, version, is_beta)
 
@@ -122,10 +87,13 @@ def main():
     parser.add_argument("--from-tag", help="Previous version tag to generate changes from")
     parser.add_argument("--beta", action="store_true", help="Generate beta release notes")
     parser.add_argument("--output", help="Output file (default: print to stdout)")
+    parser.add_argument("--type-map",
+                        help="Commit type to category map, as JSON or a path to a JSON file")
     
     args = parser.parse_args()
     
-    notes = generate_release_notes(args.version, args.from_tag, args.beta)
+    notes = generate_release_notes(args.version, args.from_tag, args.beta,
+                                   load_type_map(args.type_map))
     
     if args.output:
         with open(args.output, 'w') as f:
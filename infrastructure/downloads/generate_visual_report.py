@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import glob
+import hashlib
 import json
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+import plotly
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
 from plotly.subplots import make_subplots
 import pandas as pd
 import os
@@ -12,32 +22,82 @@ def load_manifest(file_path: str) -> dict:
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def create_size_comparison_chart(manifest: dict, versions: list) -> go.Figure:
-    """Create size comparison bar chart."""
-    platforms = set()
-    data = []
-    
-    # Collect all platforms and data
+@dataclass
+class ChartData:
+    """Columnar view of the manifest shared by all chart builders."""
+    platforms: pd.DataFrame  # version, platform, size_mb, architectures
+    stats: pd.DataFrame      # version, downloads, active_users
+    regions: pd.DataFrame    # version, region, users
+    tiers: pd.DataFrame      # version, tier, users
+    releases: pd.DataFrame   # version, date, type, release_notes
+
+def build_chart_data(manifest: dict, versions: list) -> ChartData:
+    """Walk the manifest once and build the columnar data for every chart."""
+    platforms = {'version': [], 'platform': [], 'size_mb': [], 'architectures': []}
+    stats = {'version': [], 'downloads': [], 'active_users': []}
+    regions = {'version': [], 'region': [], 'users': []}
+    tiers = {'version': [], 'tier': [], 'users': []}
+    releases = {'version': [], 'date': [], 'type': [], 'release_notes': []}
+
+    for release_type, section in (('stable', 'versions'), ('beta', 'beta')):
+        for version, info in manifest.get(section, {}).items():
+            releases['version'].append(version)
+            releases['date'].append(info['release_date'])
+            releases['type'].append(release_type)
+            releases['release_notes'].append(info.get('release_notes', 'No release notes available'))
+
+    stable = manifest.get('versions', {})
+    beta = manifest.get('beta', {})
     for version in versions:
-        version_info = manifest['versions'].get(version) or manifest['beta'].get(version)
-        if version_info:
-            for platform, info in version_info['platforms'].items():
-                platforms.add(platform)
-                data.append({
-                    'version': version,
-                    'platform': platform,
-                    'size': info['size'] / 1024 / 1024  # Convert to MB
-                })
-    
+        version_info = stable.get(version) or beta.get(version)
+        if not version_info:
+            continue
+
+        for platform, info in version_info['platforms'].items():
+            platforms['version'].append(version)
+            platforms['platform'].append(platform)
+            platforms['size_mb'].append(info['size'] / 1024 / 1024)
+            platforms['architectures'].append(len(info['architecture']))
+
+        version_stats = version_info.get('stats')
+        if not version_stats:
+            continue
+
+        stats['version'].append(version)
+        stats['downloads'].append(version_stats['total_downloads'])
+        stats['active_users'].append(version_stats['active_users'])
+
+        for region, count in version_stats.get('by_region', {}).items():
+            regions['version'].append(version)
+            regions['region'].append(region)
+            regions['users'].append(count)
+
+        for tier, count in version_stats.get('by_subscription', {}).items():
+            tiers['version'].append(version)
+            tiers['tier'].append(tier)
+            tiers['users'].append(count)
+
+    release_frame = pd.DataFrame(releases)
+    release_frame['date'] = pd.to_datetime(release_frame['date'])
+
+    return ChartData(
+        platforms=pd.DataFrame(platforms),
+        stats=pd.DataFrame(stats),
+        regions=pd.DataFrame(regions),
+        tiers=pd.DataFrame(tiers),
+        releases=release_frame.sort_values('date', kind='stable')
+    )
+
+def create_size_comparison_chart(platforms: pd.DataFrame) -> go.Figure:
+    """Create size comparison bar chart."""
     fig = go.Figure()
     
-    for platform in sorted(platforms):
-        platform_data = [d for d in data if d['platform'] == platform]
+    for platform, platform_data in platforms.groupby('platform', sort=True):
         fig.add_trace(go.Bar(
             name=platform,
-            x=[d['version'] for d in platform_data],
-            y=[d['size'] for d in platform_data],
-            text=[f"{size:.1f} MB" for size in [d['size'] for d in platform_data]],
+            x=platform_data['version'],
+            y=platform_data['size_mb'],
+            text=platform_data['size_mb'].map('{:.1f} MB'.format),
             textposition='auto',
         ))
     
@@ -49,57 +109,27 @@ def create_size_comparison_chart(manifest: dict, versions: list) -> go.Figure:
     )
     
     return fig
-    platforms = set(old_version['platforms'].keys()) | set(new_version['platforms'].keys())
-    old_sizes = [old_version['platforms'].get(p, {}).get('size', 0) / 1024 / 1024 for p in platforms]
-    new_sizes = [new_version['platforms'].get(p, {}).get('size', 0) / 1024 / 1024 for p in platforms]
-    
-    fig = go.Figure(data=[
-        go.Bar(name=f'Old ({next(iter(old_version["platforms"].values()))["version"]})', 
-               x=list(platforms), y=old_sizes),
-        go.Bar(name=f'New ({next(iter(new_version["platforms"].values()))["version"]})', 
-               x=list(platforms), y=new_sizes)
-    ])
-    
-    fig.update_layout(
-        title='Installer Size Comparison (MB)',
-        barmode='group',
-        yaxis_title='Size (MB)'
-    )
-    
-    return fig
 
-def create_download_stats_chart(manifest: dict, versions: list) -> go.Figure:
+def create_download_stats_chart(stats: pd.DataFrame) -> go.Figure:
     """Create download statistics visualization."""
-    data = []
-    
-    for version in versions:
-        version_info = manifest['versions'].get(version) or manifest['beta'].get(version)
-        if version_info and 'stats' in version_info:
-            stats = version_info['stats']
-            data.append({
-                'version': version,
-                'downloads': stats['total_downloads'],
-                'active_users': stats['active_users'],
-            })
-    
     fig = go.Figure()
     
     # Add total downloads bar
     fig.add_trace(go.Bar(
         name='Total Downloads',
-        x=[d['version'] for d in data],
-        y=[d['downloads'] for d in data],
-        text=[f"{d['downloads']:,}" for d in data],
+        x=stats['version'],
+        y=stats['downloads'],
+        text=stats['downloads'].map('{:,}'.format),
         textposition='auto',
     ))
     
     # Add active users line
     fig.add_trace(go.Scatter(
         name='Active Users',
-        x=[d['version'] for d in data],
-        y=[d['active_users'] for d in data],
+        x=stats['version'],
+        y=stats['active_users'],
         mode='lines+markers+text',
-        text=[f"{d['active_users']:,}" for d in data],
+        text=stats['active_users'].map('{:,}'.format),
         textposition='top center',
     ))
     
@@ -112,33 +142,16 @@ def create_download_stats_chart(manifest: dict, versions: list) -> go.Figure:
     
     return fig
 
-def create_geographic_chart(manifest: dict, versions: list) -> go.Figure:
+def create_geographic_chart(regions: pd.DataFrame) -> go.Figure:
     """Create geographic distribution visualization."""
-    data = []
-    regions = set()
-    
-    for version in versions:
-        version_info = manifest['versions'].get(version) or manifest['beta'].get(version)
-        if version_info and 'stats' in version_info:
-            stats = version_info['stats']
-            if 'by_region' in stats:
-                for region, count in stats['by_region'].items():
-                    regions.add(region)
-                    data.append({
-                        'version': version,
-                        'region': region,
-                        'users': count
-                    })
-    
     fig = go.Figure()
     
-    for region in sorted(regions):
-        region_data = [d for d in data if d['region'] == region]
+    for region, region_data in regions.groupby('region', sort=True):
         fig.add_trace(go.Bar(
             name=region,
-            x=[d['version'] for d in region_data],
-            y=[d['users'] for d in region_data],
-            text=[f"{d['users']:,}" for d in region_data],
+            x=region_data['version'],
+            y=region_data['users'],
+            text=region_data['users'].map('{:,}'.format),
             textposition='auto',
         ))
     
@@ -151,9 +164,9 @@ def create_geographic_chart(manifest: dict, versions: list) -> go.Figure:
     
     return fig
 
-def create_timeline_widget(manifest: dict, width: int = 800, height: int = 300) -> str:
+def create_timeline_widget(releases: pd.DataFrame, width: int = 800, height: int = 300) -> str:
     """Create an embeddable timeline widget."""
-    fig = create_release_timeline(manifest)
+    fig = create_release_timeline(releases)
     
     # Update layout for widget format
     fig.update_layout(
@@ -188,33 +201,16 @@ def create_timeline_widget(manifest: dict, width: int = 800, height: int = 300)
     
     return widget_html
 
-def create_subscription_chart(manifest: dict, versions: list) -> go.Figure:
+def create_subscription_chart(tiers: pd.DataFrame) -> go.Figure:
     """Create subscription distribution visualization."""
-    data = []
-    tiers = set()
-    
-    for version in versions:
-        version_info = manifest['versions'].get(version) or manifest['beta'].get(version)
-        if version_info and 'stats' in version_info:
-            stats = version_info['stats']
-            if 'by_subscription' in stats:
-                for tier, count in stats['by_subscription'].items():
-                    tiers.add(tier)
-                    data.append({
-                        'version': version,
-                        'tier': tier,
-                        'users': count
-                    })
-    
     fig = go.Figure()
     
-    for tier in sorted(tiers):
-        tier_data = [d for d in data if d['tier'] == tier]
+    for tier, tier_data in tiers.groupby('tier', sort=True):
         fig.add_trace(go.Bar(
             name=tier.title(),
-            x=[d['version'] for d in tier_data],
-            y=[d['users'] for d in tier_data],
-            text=[f"{d['users']:,}" for d in tier_data],
+            x=tier_data['version'],
+            y=tier_data['users'],
+            text=tier_data['users'].map('{:,}'.format),
             textposition='auto',
         ))
     
@@ -227,24 +223,11 @@ def create_subscription_chart(manifest: dict, versions: list) -> go.Figure:
     
     return fig
 
-def create_architecture_chart(manifest: dict, versions: list) -> go.Figure:
+def create_architecture_chart(platforms: pd.DataFrame) -> go.Figure:
     """Create architecture support chart."""
-    data = []
-    
-    for version in versions:
-        version_info = manifest['versions'].get(version) or manifest['beta'].get(version)
-        if version_info:
-            for platform, info in version_info['platforms'].items():
-                for arch in info['architecture']:
-                    data.append({
-                        'version': version,
-                        'platform': platform,
-                        'architecture': arch
-                    })
-    
     # Create heatmap data
-    df = pd.DataFrame(data)
-    pivot = pd.crosstab(df['platform'], df['version'])
+    pivot = platforms.pivot_table(index='platform', columns='version',
+                                  values='architectures', aggfunc='sum', fill_value=0)
     
     fig = go.Figure(data=go.Heatmap(
         z=pivot.values,
@@ -262,57 +245,13 @@ def create_architecture_chart(manifest: dict, versions: list) -> go.Figure:
     )
     
     return fig
-    platforms = set(old_version['platforms'].keys()) | set(new_version['platforms'].keys())
-    
-    old_archs = {p: len(old_version['platforms'].get(p, {}).get('architecture', [])) 
-                 for p in platforms}
-    new_archs = {p: len(new_version['platforms'].get(p, {}).get('architecture', [])) 
-                 for p in platforms}
-    
-    fig = go.Figure(data=[
-        go.Bar(name=f'Old ({next(iter(old_version["platforms"].values()))["version"]})', 
-               x=list(platforms), y=list(old_archs.values())),
-        go.Bar(name=f'New ({next(iter(new_version["platforms"].values()))["version"]})', 
-               x=list(platforms), y=list(new_archs.values()))
-    ])
-    
-    fig.update_layout(
-        title='Architecture Support by Platform',
-        barmode='group',
-        yaxis_title='Number of Supported Architectures'
-    )
-    
-    return fig
 
-def create_release_timeline(manifest: dict) -> go.Figure:
+def create_release_timeline(releases: pd.DataFrame) -> go.Figure:
     """Create release timeline visualization."""
-    versions = []
-    dates = []
-    types = []
-    
-    # Process stable versions
-    for version, info in manifest.get('versions', {}).items():
-        versions.append(version)
-        dates.append(info['release_date'])
-        types.append('stable')
-    
-    # Process beta versions
-    for version, info in manifest.get('beta', {}).items():
-        versions.append(version)
-        dates.append(info['release_date'])
-        types.append('beta')
-    
-    # Convert to pandas for easier plotting
-    df = pd.DataFrame({
-        'version': versions,
-        'date': pd.to_datetime(dates),
-        'type': types
-    }).sort_values('date')
-    
     fig = go.Figure()
     
     # Add stable releases
-    stable = df[df['type'] == 'stable']
+    stable = releases[releases['type'] == 'stable']
     fig.add_trace(go.Scatter(
         x=stable['date'],
         y=stable['version'],
@@ -324,7 +263,7 @@ def create_release_timeline(manifest: dict) -> go.Figure:
     ))
     
     # Add beta releases
-    beta = df[df['type'] == 'beta']
+    beta = releases[releases['type'] == 'beta']
     fig.add_trace(go.Scatter(
         x=beta['date'],
         y=beta['version'],
@@ -344,9 +283,118 @@ def create_release_timeline(manifest: dict) -> go.Figure:
     
     return fig
 
-def generate_widget(manifest: dict, output_dir: str):
+PLOTLYJS_MODES = ('cdn', 'inline')
+
+def plotlyjs_tag(mode: str = 'cdn') -> str:
+    """Return the single script tag that loads plotly.js for a report."""
+    if mode == 'inline':
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    if mode == 'cdn':
+        # Pin to the bundle plotly.py was built against so the JSON specs stay compatible
+        return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" charset="utf-8"></script>'
+    raise ValueError(f"Unknown plotly.js mode: {mode}")
+
+def figure_json(fig: go.Figure) -> str:
+    """Serialize a figure as a compact JSON spec rendered client-side."""
+    spec = fig.to_plotly_json()
+    # The shared layout template is emitted once per page by template_spec()
+    spec['layout'].pop('template', None)
+    # to_json_plotly escapes '/', so the spec cannot terminate the script element early
+    return to_json_plotly(spec)
+
+def template_spec() -> str:
+    """Embed the default plotly layout template shared by every figure."""
+    template = pio.templates[pio.templates.default]
+    return f'<script type="application/json" id="plotly-template">{to_json_plotly(template)}</script>'
+
+RENDER_SPECS_JS = """
+<script type="text/javascript">
+    var template = JSON.parse(document.getElementById('plotly-template').textContent);
+    document.querySelectorAll('script[data-chart]').forEach(function (spec) {
+        var figure = JSON.parse(spec.textContent);
+        figure.layout.template = template;
+        Plotly.newPlot(spec.dataset.chart, figure.data, figure.layout, {responsive: true});
+    });
+</script>
+"""
+
+# chart id -> (section title, builder, ChartData field, columns the chart depends on)
+REPORT_CHARTS = {
+    'timeline': ('Timeline', create_release_timeline, 'releases', ['version', 'date', 'type']),
+    'size': ('Size Comparison', create_size_comparison_chart, 'platforms', ['version', 'platform', 'size_mb']),
+    'downloads': ('Download Statistics', create_download_stats_chart, 'stats', ['version', 'downloads', 'active_users']),
+    'subscriptions': ('Subscription Distribution', create_subscription_chart, 'tiers', ['version', 'tier', 'users']),
+    'geographic': ('Geographic Distribution', create_geographic_chart, 'regions', ['version', 'region', 'users']),
+    'architecture': ('Architecture Support', create_architecture_chart, 'platforms', ['version', 'platform', 'architectures']),
+}
+
+WIDGET_COLUMNS = ['version', 'date', 'type']
+
+CHART_CACHE_DIR = '.chart-cache'
+
+def render_chart(chart_id: str, frame: pd.DataFrame) -> Tuple[str, float]:
+    """Render one chart to its output text. Runs in a worker process."""
+    start = time.perf_counter()
+    if chart_id == 'timeline-widget':
+        output = create_timeline_widget(frame)
+    else:
+        output = figure_json(REPORT_CHARTS[chart_id][1](frame))
+    return output, time.perf_counter() - start
+
+def chart_digest(chart_id: str, frame: pd.DataFrame) -> str:
+    """Hash the manifest subset a chart depends on."""
+    digest = hashlib.sha256(f"{chart_id}|{plotly.__version__}|{','.join(frame.columns)}".encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()[:16]  # cache file names rely on this fixed width
+
+def render_charts(inputs: Dict[str, pd.DataFrame], cache_dir: Optional[str] = None,
+                  jobs: Optional[int] = None, verbose: bool = False) -> Dict[str, str]:
+    """Render charts in a process pool, reusing cached output whose inputs are unchanged.
+
+    With ``verbose``, per-chart render times (or cache hits) are printed.
+    """
+    rendered = {}
+    misses = {}
+    for chart_id, frame in inputs.items():
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, f"{chart_id}-{chart_digest(chart_id, frame)}.json")
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r') as f:
+                    rendered[chart_id] = f.read()
+                if verbose:
+                    print(f"  {chart_id:<16} cached")
+                continue
+        misses[chart_id] = (frame, cache_path)
+
+    if len(misses) > 1 and jobs != 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {chart_id: executor.submit(render_chart, chart_id, frame)
+                       for chart_id, (frame, _) in misses.items()}
+            results = {chart_id: future.result() for chart_id, future in futures.items()}
+    else:
+        results = {chart_id: render_chart(chart_id, frame) for chart_id, (frame, _) in misses.items()}
+
+    for chart_id, (output, elapsed) in results.items():
+        if verbose:
+            print(f"  {chart_id:<16} {elapsed:.3f}s")
+        rendered[chart_id] = output
+        cache_path = misses[chart_id][1]
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Drop entries for inputs that no longer exist
+            for stale in glob.glob(os.path.join(cache_dir, f"{chart_id}-{'?' * 16}.json")):
+                os.remove(stale)
+            with open(cache_path, 'w') as f:
+                f.write(output)
+
+    return rendered
+
+def generate_widget(manifest: dict, output_dir: str, cache_dir: Optional[str] = None, verbose: bool = False):
     """Generate embeddable timeline widget."""
-    widget_html = create_timeline_widget(manifest)
+    releases = build_chart_data(manifest, []).releases
+    widget_html = render_charts({'timeline-widget': releases[WIDGET_COLUMNS]}, cache_dir, jobs=1,
+                                verbose=verbose)['timeline-widget']
     
     # Save widget
     os.makedirs(output_dir, exist_ok=True)
@@ -354,15 +402,20 @@ def generate_widget(manifest: dict, output_dir: str):
         f.write(widget_html)
     print(f"\nWidget generated in {output_dir}/timeline-widget.html")
 
-def generate_html_report(manifest: dict, versions: list, output_dir: str):
-    """Generate HTML report with visualizations."""
+def build_report_html(manifest: dict, versions: list, plotlyjs: str = 'cdn',
+                      cache_dir: Optional[str] = None, jobs: Optional[int] = None,
+                      verbose: bool = False) -> str:
+    """Build the comparison report with plotly.js included exactly once."""
+    data = build_chart_data(manifest, versions)
+    
     # Create charts
-    size_fig = create_size_comparison_chart(manifest, versions)
-    download_fig = create_download_stats_chart(manifest, versions)
-    subscription_fig = create_subscription_chart(manifest, versions)
-    geographic_fig = create_geographic_chart(manifest, versions)
-    arch_fig = create_architecture_chart(manifest, versions)
-    timeline_fig = create_release_timeline(manifest)
+    specs = render_charts(
+        {chart_id: getattr(data, field)[columns]
+         for chart_id, (_, _, field, columns) in REPORT_CHARTS.items()},
+        cache_dir,
+        jobs,
+        verbose
+    )
     
     # Create HTML
     html = f"""
@@ -370,7 +423,8 @@ def generate_html_report(manifest: dict, versions: list, output_dir: str):
     <html>
     <head>
         <title>RinaWarp Version Comparison</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        <meta charset="utf-8">
+        {plotlyjs_tag(plotlyjs)}
         <style>
             body {{ font-family: Arial, sans-serif; margin: 20px; }}
             .chart {{ margin: 20px 0; }}
@@ -385,37 +439,18 @@ def generate_html_report(manifest: dict, versions: list, output_dir: str):
     </head>
     <body>
         <h1>Version Comparison Report</h1>
-        
-        <div class="chart">
-            <h2>Timeline</h2>
-            {timeline_fig.to_html(full_html=False)}
-        </div>
-        
-        <div class="chart">
-            <h2>Size Comparison</h2>
-            {size_fig.to_html(full_html=False)}
-        </div>
-        
-        <div class="chart">
-            <h2>Download Statistics</h2>
-            {download_fig.to_html(full_html=False)}
-        </div>
-        
-        <div class="chart">
-            <h2>Subscription Distribution</h2>
-            {subscription_fig.to_html(full_html=False)}
-        </div>
-        
-        <div class="chart">
-            <h2>Geographic Distribution</h2>
-            {geographic_fig.to_html(full_html=False)}
-        </div>
-
+    """
+    
+    for chart_id, (title, _, _, _) in REPORT_CHARTS.items():
+        html += f"""
         <div class="chart">
-            <h2>Architecture Support</h2>
-            {arch_fig.to_html(full_html=False)}
+            <h2>{title}</h2>
+            <div id="chart-{chart_id}"></div>
+            <script type="application/json" data-chart="chart-{chart_id}">{specs[chart_id]}</script>
         </div>
-        
+        """
+    
+    html += """
         <div class="changes">
             <h2>Changes Summary</h2>
             <h3>Platform Changes</h3>
@@ -423,22 +458,33 @@ def generate_html_report(manifest: dict, versions: list, output_dir: str):
     """
     
     # Add version summary
-    for version in versions:
-        version_info = manifest['versions'].get(version) or manifest['beta'].get(version)
-        if version_info:
-            html += f'<li>{version}: {version_info.get("release_notes", "No release notes available")}</li>\n'
+    notes = data.releases.drop_duplicates('version').set_index('version')['release_notes']
+    for version, release_notes in notes.reindex(versions).dropna().items():
+        html += f'<li>{version}: {release_notes}</li>\n'
     
-    html += """
+    html += f"""
             </ul>
         </div>
+        {template_spec()}
+        {RENDER_SPECS_JS}
     </body>
     </html>
     """
     
+    return html
+
+def generate_html_report(manifest: dict, versions: list, output_dir: str, plotlyjs: str = 'cdn',
+                         cache_dir: Optional[str] = None, jobs: Optional[int] = None,
+                         verbose: bool = False) -> str:
+    """Generate HTML report with visualizations."""
+    html = build_report_html(manifest, versions, plotlyjs, cache_dir, jobs, verbose)
+    
     # Save report
     os.makedirs(output_dir, exist_ok=True)
-    with open(os.path.join(output_dir, 'report.html'), 'w') as f:
+    report_path = os.path.join(output_dir, 'report.html')
+    with open(report_path, 'w') as f:
         f.write(html)
+    return report_path
 
 def main():
     parser = argparse.ArgumentParser(description="Generate visual version comparison report")
@@ -449,6 +495,14 @@ def main():
                       help="Output directory for report")
     parser.add_argument("--generate-widget", action="store_true",
                       help="Generate embeddable timeline widget")
+    parser.add_argument("--plotlyjs", choices=PLOTLYJS_MODES, default="cdn",
+                      help="Load plotly.js from the CDN or inline it once for offline use")
+    parser.add_argument("--jobs", type=int, default=None,
+                      help="Worker processes for chart rendering (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true",
+                      help="Re-render every chart instead of reusing unchanged ones")
+    parser.add_argument("--verbose", action="store_true",
+                      help="Print per-chart render times")
     
     args = parser.parse_args()
     manifest = load_manifest(args.manifest)
@@ -459,13 +513,18 @@ def main():
             print(f"Error: Version {version} not found in manifest")
             return
     
+    cache_dir = None if args.no_cache else os.path.join(args.output_dir, CHART_CACHE_DIR)
+    
     # Generate comparison report
-    generate_html_report(manifest, args.versions, args.output_dir)
+    if args.verbose:
+        print("Rendering charts:")
+    generate_html_report(manifest, args.versions, args.output_dir, args.plotlyjs, cache_dir, args.jobs,
+                         args.verbose)
     print(f"\nReport generated in {args.output_dir}/report.html")
     
     # Generate widget if requested
     if args.generate_widget:
-        generate_widget(manifest, args.output_dir)
+        generate_widget(manifest, args.output_dir, cache_dir, args.verbose)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Streaming reader for git history shared by the release tooling."""
+import io
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional
+
+# git log -z terminates each commit with NUL; fields are split on the ASCII
+# unit separator, which cannot appear in names, subjects or bodies.
+FIELD_SEP = '\x1f'
+LOG_FORMAT = FIELD_SEP.join(['%H', '%h', '%an', '%at', '%s', '%b'])
+
+@dataclass
+class Commit:
+    hash: str
+    short_hash: str
+    author: str
+    timestamp: int
+    subject: str
+    body: str
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def parse_record(record: str) -> Commit:
+    """Parse one NUL-terminated ``git log`` record."""
+    hash, short_hash, author, timestamp, subject, body = record.split(FIELD_SEP, 5)
+    return Commit(
+        hash=hash.lstrip('\n'),
+        short_hash=short_hash,
+        author=author,
+        timestamp=int(timestamp),
+        subject=subject,
+        body=body.rstrip('\n')
+    )
+
+def iter_commits(rev_range: Optional[str] = 'HEAD', no_merges: bool = True,
+                 extra_args: Optional[List[str]] = None,
+                 chunk_size: int = 1 << 16,
+                 revs: Optional[List[str]] = None) -> Iterator[Commit]:
+    """Yield commits from ``git log`` as they are read.
+
+    Memory stays bounded by ``chunk_size`` plus the largest single commit, so
+    ranges with tens of thousands of commits can be processed incrementally.
+    Pass ``revs`` instead of ``rev_range`` to read exactly those commits, in
+    that order. Raises ``subprocess.CalledProcessError`` if git exits with an
+    error.
+    """
+    cmd = ['git', 'log', '-z', f'--format={LOG_FORMAT}']
+    if no_merges:
+        cmd.append('--no-merges')
+    cmd.extend(extra_args or [])
+    if revs is not None:
+        cmd.extend(['--no-walk=unsorted', '--stdin'])
+    elif rev_range:
+        cmd.append(rev_range)
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                               stdin=subprocess.PIPE if revs is not None else None)
+    if revs is not None:
+        # Feed revisions from a thread so a long list cannot deadlock against stdout
+        def feed():
+            try:
+                process.stdin.write(''.join(f'{rev}\n' for rev in revs).encode())
+            except BrokenPipeError:
+                pass
+            finally:
+                process.stdin.close()
+        threading.Thread(target=feed, daemon=True).start()
+
+    stream = io.TextIOWrapper(process.stdout, encoding='utf-8', errors='replace')
+    try:
+        pending = ''
+        for chunk in iter(lambda: stream.read(chunk_size), ''):
+            records = (pending + chunk).split('\0')
+            pending = records.pop()
+            for record in records:
+                yield parse_record(record)
+        if pending.strip():
+            yield parse_record(pending)
+    finally:
+        stream.close()
+        if process.poll() is None:
+            # The consumer stopped early; don't leave git blocked on a full pipe
+            process.kill()
+        returncode = process.wait()
+
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+def _iter_lines(cmd: List[str]) -> Iterator[str]:
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        for line in process.stdout:
+            yield line.strip()
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        returncode = process.wait()
+
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+def iter_revisions(rev_range: str, no_merges: bool = True) -> Iterator[str]:
+    """Yield commit hashes in ``rev_range`` (newest first) without reading commit data."""
+    cmd = ['git', 'rev-list']
+    if no_merges:
+        cmd.append('--no-merges')
+    cmd.append(rev_range)
+    return _iter_lines(cmd)
+
+def iter_parents(revs: List[str]) -> Iterator[List[str]]:
+    """Yield ``[hash, *parent_hashes]`` for every commit selected by ``revs`` (newest first).
+
+    ``revs`` are ``git rev-list`` arguments, e.g. ``['v1.2.0', 'v1.1.0', '^v1.0.0']``.
+    """
+    for line in _iter_lines(['git', 'rev-list', '--parents'] + revs):
+        yield line.split()
@@ -3,20 +3,70 @@ import argparse
 import json
 import os
 import subprocess
+import sys
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional
 import semantic_version
 from datetime import datetime
 
+from conventional_commits import load_type_map
+from generate_notes import generate_release_notes
+
+UPLOAD_WORKERS = 4
+UPLOAD_RETRIES = 3
+RETRY_STATUSES = {500, 502, 503, 504}
+PROGRESS_STEP = 25  # percent
+
+class UploadProgress:
+    """File wrapper that streams an asset and reports upload progress."""
+
+    def __init__(self, path: str, name: str):
+        self.file = open(path, 'rb')
+        self.name = name
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.sent = 0
+        self.started = time.monotonic()
+        self.next_report = PROGRESS_STEP
+
+    def __len__(self) -> int:
+        return self.size
+
+    def read(self, amount: int = -1) -> bytes:
+        chunk = self.file.read(amount)
+        self.sent += len(chunk)
+        percent = self.sent * 100 // self.size if self.size else 100
+        if percent >= self.next_report and percent < 100:
+            print(f"  {self.name}: {percent}% ({self.throughput():.1f} MB/s)")
+            self.next_report = percent - percent % PROGRESS_STEP + PROGRESS_STEP
+        return chunk
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def throughput(self) -> float:
+        return self.sent / 1024 / 1024 / max(self.elapsed(), 1e-6)
+
+    def close(self) -> None:
+        self.file.close()
+
 class GitHubRelease:
-    def __init__(self, token: str, repo: str):
+    def __init__(self, token: str, repo: str, max_workers: int = UPLOAD_WORKERS):
         self.token = token
         self.repo = repo
+        self.max_workers = max_workers
         self.api_base = f"https://api.github.com/repos/{repo}"
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # One pooled connection per concurrent upload
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
 
     def create_release(self, 
                       tag: str,
@@ -24,8 +74,13 @@ class GitHubRelease:
                       body: str,
                       files: List[str],
                       prerelease: bool = False,
-                      draft: bool = False) -> Dict:
-        """Create a GitHub release with assets."""
+                      draft: bool = False,
+                      max_workers: Optional[int] = None) -> Dict:
+        """Create a GitHub release and upload its assets concurrently.
+
+        max_workers is capped at the worker count the session pool was sized for.
+        """
+        max_workers = min(max_workers or self.max_workers, self.max_workers)
         # Create release
         release_data = {
             "tag_name": tag,
@@ -35,9 +90,8 @@ class GitHubRelease:
             "prerelease": prerelease
         }
         
-        response = requests.post(
+        response = self.session.post(
             f"{self.api_base}/releases",
-            headers=self.headers,
             json=release_data
         )
         response.raise_for_status()
@@ -45,26 +99,78 @@ class GitHubRelease:
         
         # Upload assets
         upload_url = release['upload_url'].split('{')[0]
+        uploads = []
         for file_path in files:
             if not os.path.exists(file_path):
                 print(f"Warning: File not found: {file_path}")
                 continue
+            uploads.append(file_path)
+        
+        errors = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.upload_asset, release, upload_url, file_path): file_path
+                for file_path in uploads
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error uploading {os.path.basename(futures[future])}: {e}")
+                    errors.append(e)
+        
+        if errors:
+            raise errors[0]
+        
+        return release
+
+    def upload_asset(self, release: Dict, upload_url: str, file_path: str) -> Dict:
+        """Stream one asset to the release, retrying transient server errors."""
+        filename = os.path.basename(file_path)
+        content_type = self._get_content_type(filename)
+        
+        for attempt in range(1, UPLOAD_RETRIES + 1):
+            if attempt > 1:
+                # A failed upload can leave a partial asset that blocks the name
+                self._delete_asset(release['id'], filename)
             
-            filename = os.path.basename(file_path)
-            content_type = self._get_content_type(filename)
-            
-            with open(file_path, 'rb') as f:
-                response = requests.post(
-                    f"{upload_url}?name={filename}",
+            body = UploadProgress(file_path, filename)
+            try:
+                response = self.session.post(
+                    upload_url,
+                    params={"name": filename},
                     headers={
-                        **self.headers,
-                        "Content-Type": content_type
+                        "Content-Type": content_type,
+                        "Content-Length": str(len(body))
                     },
-                    data=f.read()
+                    data=body
                 )
-                response.raise_for_status()
-        
-        return release
+            except requests.ConnectionError as e:
+                if attempt == UPLOAD_RETRIES:
+                    raise
+                print(f"Retrying {filename} after connection error ({attempt}/{UPLOAD_RETRIES}): {e}")
+                time.sleep(2 ** attempt)
+                continue
+            finally:
+                body.close()
+            
+            if response.status_code in RETRY_STATUSES and attempt < UPLOAD_RETRIES:
+                print(f"Retrying {filename} after HTTP {response.status_code} ({attempt}/{UPLOAD_RETRIES})")
+                time.sleep(2 ** attempt)
+                continue
+            
+            response.raise_for_status()
+            print(f"Uploaded {filename}: {body.size / 1024 / 1024:.1f} MB in "
+                  f"{body.elapsed():.1f}s ({body.throughput():.1f} MB/s)")
+            return response.json()
+
+    def _delete_asset(self, release_id: int, filename: str) -> None:
+        response = self.session.get(f"{self.api_base}/releases/{release_id}/assets", params={"per_page": 100})
+        if not response.ok:
+            return
+        for asset in response.json():
+            if asset['name'] == filename:
+                self.session.delete(f"{self.api_base}/releases/assets/{asset['id']}")
 
     def _get_content_type(self, filename: str) -> str:
         """Get content type based on file extension."""
@@ -134,6 +240,11 @@ def main():
                       help="Create as draft release")
     parser.add_argument("--assets-dir", default=".",
                       help="Base directory for assets")
+    parser.add_argument("--from-tag", help="Previous version tag to generate notes from")
+    parser.add_argument("--type-map",
+                      help="Commit type to category map for the notes, as JSON or a path to a JSON file")
+    parser.add_argument("--upload-workers", type=int, default=UPLOAD_WORKERS,
+                      help="Number of assets to upload in parallel")
     
     args = parser.parse_args()
     
@@ -171,16 +282,8 @@ def main():
         sys.exit(1)
     
     # Get release notes
-    notes_file = f"release-notes-{version}.md"
-    subprocess.run([
-        './generate_notes.py',
-        version,
-        '--beta' if is_beta else '',
-        '--output', notes_file
-    ])
-    
-    with open(notes_file, 'r') as f:
-        release_notes = f.read()
+    release_notes = generate_release_notes(version, args.from_tag, is_beta,
+                                           load_type_map(args.type_map))
     
     # Get assets
     assets = get_version_assets(manifest, version)
@@ -188,7 +291,7 @@ def main():
         print("Warning: No assets found for version")
     
     # Create release
-    gh = GitHubRelease(token, repo)
+    gh = GitHubRelease(token, repo, max_workers=args.upload_workers)
     try:
         release = gh.create_release(
             tag=f"v{version}",
@@ -199,10 +302,6 @@ def main():
             draft=args.draft
         )
         print(f"\nCreated release: {release['html_url']}")
-        
-        # Clean up notes file
-        os.remove(notes_file)
-        
     except Exception as e:
         print(f"Error creating release: {e}")
         sys.exit(1)
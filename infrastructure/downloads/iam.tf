@@ -64,6 +64,17 @@ resource "aws_iam_role_policy" "notify_lambda_policy" {
           "${aws_s3_bucket.reports.arn}/*"
         ]
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:ListBucket"
+        ]
+        Resource = [
+          aws_s3_bucket.downloads_archive.arn,
+          "${aws_s3_bucket.downloads_archive.arn}/*"
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -100,6 +111,6 @@ resource "aws_cloudfront_origin_access_identity" "downloads_ap" {
 # Archive Lambda function code
 data "archive_file" "notify_lambda" {
   type        = "zip"
-  source_file = "${path.module}/functions/notify_downloads.py"
+  source_dir  = "${path.module}/functions"
   output_path = "${path.module}/notify_downloads.zip"
 }
@@ -7,11 +7,26 @@ import hashlib
 import datetime
 from typing import Dict, Optional
 
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'functions'))
+from publishing import publish_manifest as publish_manifest_object
+
+S3_BUCKET = "rinawarp-downloads-production"
+DOWNLOAD_BASE_URL = "https://downloads.rinawarptech.com"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+CONTENT_TYPES = {
+    "macos": "application/x-apple-diskimage",
+    "windows": "application/vnd.microsoft.portable-executable",
+    "linux": "application/x-executable"
+}
+
 def calculate_md5(file_path: str) -> str:
     """Calculate MD5 hash of a file."""
     md5_hash = hashlib.md5()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
             md5_hash.update(chunk)
     return md5_hash.hexdigest()
 
@@ -22,10 +37,20 @@ def get_file_info(file_path: str) -> Dict[str, any]:
         "checksum": calculate_md5(file_path)
     }
 
+def artifact_key(version: str, platform: str, file_path: str, beta: bool = False) -> str:
+    """S3 key (and download URL path) for a release artifact."""
+    base_path = "beta/" if beta else ""
+    return f"{base_path}v{version}/{platform}/{os.path.basename(file_path)}"
+
 def update_manifest(version: str, files: Dict[str, str], manifest_path: str, 
                    release_notes: str = "", critical: bool = False,
-                   beta: bool = False, beta_expires: str = None) -> None:
-    """Update the version manifest with new release information."""
+                   beta: bool = False, beta_expires: str = None,
+                   file_info: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Update the version manifest with new release information.
+
+    ``file_info`` maps platform to precomputed size/checksum, so callers that
+    already hashed the artifacts don't read them again.
+    """
     try:
         with open(manifest_path, 'r') as f:
             manifest = json.load(f)
@@ -62,7 +87,7 @@ def update_manifest(version: str, files: Dict[str, str], manifest_path: str,
             print(f"Warning: File not found: {file_path}")
             continue
 
-        file_info = get_file_info(file_path)
+        info = (file_info or {}).get(platform) or get_file_info(file_path)
         
         # Platform-specific configurations
         platform_config = {
@@ -81,15 +106,13 @@ def update_manifest(version: str, files: Dict[str, str], manifest_path: str,
         }
 
         # Construct download URL with beta path if applicable
-        filename = os.path.basename(file_path)
-        base_path = "beta/" if beta else ""
-        url = f"https://downloads.rinawarptech.com/{base_path}v{version}/{platform}/{filename}"
+        url = f"{DOWNLOAD_BASE_URL}/{artifact_key(version, platform, file_path, beta)}"
 
         version_info["platforms"][platform] = {
             "version": version,
             "url": url,
-            "checksum": file_info["checksum"],
-            "size": file_info["size"],
+            "checksum": info["checksum"],
+            "size": info["size"],
             **platform_config[platform]
         }
 
@@ -105,9 +128,26 @@ def update_manifest(version: str, files: Dict[str, str], manifest_path: str,
     with open(manifest_path, 'w') as f:
         json.dump(manifest, f, indent=2)
 
+    return manifest
+
+def upload_artifact(s3_client, s3_bucket: str, version: str, platform: str,
+                    file_path: str, beta: bool = False) -> str:
+    """Upload one installer to S3 with its download metadata."""
+    filename = os.path.basename(file_path)
+    s3_key = artifact_key(version, platform, file_path, beta)
+
+    # Managed transfer: multipart and concurrent for large installers
+    s3_client.upload_file(file_path, s3_bucket, s3_key, ExtraArgs={
+        "ContentType": CONTENT_TYPES[platform],
+        "Metadata": {"version": version, "platform": platform},
+        "CacheControl": "public, max-age=31536000",
+        "ContentDisposition": f"attachment; filename={filename}"
+    })
+    return s3_key
+
 def upload_files(version: str, files: Dict[str, str], manifest_path: str, beta: bool = False) -> None:
     """Upload files to S3 and update manifest."""
-    s3_bucket = "rinawarp-downloads-production"
+    s3 = boto3.client('s3')
     
     # Upload each file
     for platform, file_path in files.items():
@@ -115,33 +155,19 @@ def upload_files(version: str, files: Dict[str, str], manifest_path: str, beta:
             print(f"Error: File not found: {file_path}")
             continue
 
-        # Determine content type
-        content_types = {
-            "macos": "application/x-apple-diskimage",
-            "windows": "application/vnd.microsoft.portable-executable",
-            "linux": "application/x-executable"
-        }
+        upload_artifact(s3, S3_BUCKET, version, platform, file_path, beta)
 
-        filename = os.path.basename(file_path)
-        base_path = "beta/" if beta else ""
-        s3_key = f"{base_path}v{version}/{platform}/{filename}"
-        
-        # Upload file to S3 with appropriate metadata
-        os.system(f"""
-        aws s3 cp "{file_path}" "s3://{s3_bucket}/{s3_key}" \
-            --content-type "{content_types[platform]}" \
-            --metadata "version={version},platform={platform}" \
-            --cache-control "public, max-age=31536000" \
-            --content-disposition "attachment; filename={filename}"
-        """)
-
-    # Upload manifest file
-    os.system(f"""
-    aws s3 cp "{manifest_path}" "s3://{s3_bucket}/manifest.json" \
-        --content-type "application/json" \
-        --cache-control "no-cache" \
-        --metadata-directive "REPLACE"
-    """)
+    publish_manifest(manifest_path, S3_BUCKET)
+
+def publish_manifest(manifest_path: str, s3_bucket: str) -> Dict:
+    """Publish the manifest as precompressed, content-addressed objects."""
+    with open(manifest_path, 'rb') as f:
+        body = f.read()
+
+    # Clients follow manifest.current.json to the immutable hashed copies
+    record = publish_manifest_object(boto3.client('s3'), s3_bucket, body)
+    print(f"Published manifest {record['key']} ({', '.join(record['encodings'])})")
+    return record
 
 def main():
     parser = argparse.ArgumentParser(description="Manage RinaWarp release uploads")
@@ -99,6 +99,9 @@ resource "aws_lambda_function" "backup_monitor" {
       })
       REPORTS_BUCKET  = aws_s3_bucket.reports.id
       SLACK_WEBHOOK_URL = var.slack_webhook_url
+      STAGE_METRICS     = var.stage_metrics_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      PROFILE_BUCKET      = aws_s3_bucket.reports.id
     }
   }
 }
@@ -106,8 +109,8 @@ resource "aws_lambda_function" "backup_monitor" {
 # Archive file for Lambda function
 data "archive_file" "backup_monitor" {
   type        = "zip"
-  source_file = "${path.module}/functions/backup_monitor.py"
-  output_path = "${path.module}/functions/backup_monitor.zip"
+  source_dir  = "${path.module}/functions"
+  output_path = "${path.module}/backup_monitor.zip"
 }
 
 # CloudWatch Event Rule for backup monitoring
@@ -27,6 +27,13 @@ resource "aws_lambda_function" "slack_notifier" {
       TOPIC_ARN       = aws_sns_topic.download_notifications.arn
       REPORTS_BUCKET  = aws_s3_bucket.reports.id
       SLACK_WEBHOOK   = var.slack_webhook_url
+      STAGE_METRICS   = var.stage_metrics_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      PROFILE_BUCKET      = aws_s3_bucket.reports.id
+      YEAR_MONTH_SHARDS   = var.year_month_shards
+      ARCHIVE_BUCKET      = aws_s3_bucket.downloads_archive.id
+      ARCHIVE_AFTER_DAYS  = var.archive_after_days
+      DOWNLOAD_TTL_DAYS   = var.archive_after_days + var.archive_grace_days
     }
   }
 }
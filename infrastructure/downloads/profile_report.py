@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Merge Lambda profile captures into a ranked hot-function report.
+
+Captures are the directories written by functions/profiling.py, either local
+or under an S3 prefix:
+
+    python profile_report.py s3://rinawarp-reports/profiles/notify_downloads/
+    python profile_report.py captures/req-1 captures/req-2 --sort tottime
+"""
+import argparse
+import json
+import os
+import pstats
+import sys
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import boto3
+
+PSTATS_NAME = 'profile.pstats'
+SNAPSHOT_NAME = 'allocations.snapshot'
+SORT_KEYS = {'cumulative': 3, 'tottime': 2, 'ncalls': 1}
+
+def download_captures(url: str, dest: str) -> List[str]:
+    """Download every capture under an s3:// prefix; returns local capture dirs."""
+    bucket, _, prefix = url[len('s3://'):].partition('/')
+    s3 = boto3.client('s3')
+    captures = set()
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            name = os.path.basename(obj['Key'])
+            if name not in (PSTATS_NAME, SNAPSHOT_NAME):
+                continue
+            local_dir = os.path.join(dest, os.path.dirname(obj['Key']))
+            os.makedirs(local_dir, exist_ok=True)
+            s3.download_file(bucket, obj['Key'], os.path.join(local_dir, name))
+            captures.add(local_dir)
+    return sorted(captures)
+
+def find_captures(paths: List[str], dest: str) -> List[str]:
+    """Resolve local paths and s3:// prefixes to capture directories."""
+    captures = []
+    for path in paths:
+        if path.startswith('s3://'):
+            captures.extend(download_captures(path, dest))
+        elif os.path.isfile(path):
+            captures.append(os.path.dirname(path) or '.')
+        else:
+            for root, _, files in os.walk(path):
+                if PSTATS_NAME in files or SNAPSHOT_NAME in files:
+                    captures.append(root)
+    return sorted(set(captures))
+
+def short_function(key: Tuple[str, int, str]) -> str:
+    filename, line, name = key
+    if filename == '~':
+        return name  # Built-in
+    parts = filename.split(os.sep)
+    return f"{os.sep.join(parts[-2:])}:{line}({name})"
+
+def hot_functions(captures: List[str], sort: str, limit: int) -> List[Dict]:
+    """Merge the pstats of every capture and rank functions."""
+    files = [os.path.join(c, PSTATS_NAME) for c in captures if os.path.exists(os.path.join(c, PSTATS_NAME))]
+    if not files:
+        return []
+    stats = pstats.Stats(*files)
+    index = SORT_KEYS[sort]
+    ranked = sorted(stats.stats.items(), key=lambda item: item[1][index], reverse=True)
+    return [
+        {
+            'function': short_function(key),
+            'ncalls': calls,
+            'tottime': tottime,
+            'cumtime': cumtime,
+            'per_capture_ms': cumtime / len(files) * 1000
+        }
+        for key, (_, calls, tottime, cumtime, _) in ranked[:limit]
+    ]
+
+def hot_allocations(captures: List[str], limit: int) -> List[Dict]:
+    """Sum allocated bytes per source line across every snapshot."""
+    sizes: Dict[str, int] = defaultdict(int)
+    counts: Dict[str, int] = defaultdict(int)
+    for capture in captures:
+        path = os.path.join(capture, SNAPSHOT_NAME)
+        if not os.path.exists(path):
+            continue
+        for stat in tracemalloc.Snapshot.load(path).statistics('lineno'):
+            location = str(stat.traceback[0])
+            sizes[location] += stat.size
+            counts[location] += stat.count
+    ranked = sorted(sizes, key=sizes.get, reverse=True)
+    return [{'location': location, 'size': sizes[location], 'count': counts[location]}
+            for location in ranked[:limit]]
+
+def format_report(captures: List[str], functions: List[Dict], allocations: List[Dict], sort: str) -> str:
+    lines = [f"Merged {len(captures)} capture(s), functions ranked by {sort}", ""]
+    lines.append(f"{'ncalls':>10} {'tottime':>9} {'cumtime':>9} {'ms/capture':>11}  function")
+    for row in functions:
+        lines.append(f"{row['ncalls']:>10} {row['tottime']:>9.3f} {row['cumtime']:>9.3f} "
+                     f"{row['per_capture_ms']:>11.2f}  {row['function']}")
+    if allocations:
+        lines.extend(["", f"{'KiB':>10} {'blocks':>9}  allocation site"])
+        for row in allocations:
+            lines.append(f"{row['size'] / 1024:>10.1f} {row['count']:>9}  {row['location']}")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge Lambda profile captures into a hot-function report")
+    parser.add_argument("paths", nargs="+", help="Capture directories, pstats files or s3:// prefixes")
+    parser.add_argument("--sort", choices=list(SORT_KEYS), default="cumulative", help="Ranking key")
+    parser.add_argument("--limit", type=int, default=25, help="Rows per section")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dest:
+        captures = find_captures(args.paths, dest)
+        if not captures:
+            print("Error: No profile captures found")
+            sys.exit(1)
+        functions = hot_functions(captures, args.sort, args.limit)
+        allocations = hot_allocations(captures, args.limit)
+
+    if args.format == 'json':
+        print(json.dumps({'captures': len(captures), 'functions': functions,
+                          'allocations': allocations}, indent=2))
+    else:
+        print(format_report(captures, functions, allocations, args.sort))
+
+if __name__ == "__main__":
+    main()
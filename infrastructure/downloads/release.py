@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Run a full release as a dependency graph of stages.
+
+Replaces running manage-release.py, test_manifest.py, validate-downloads.py,
+generate_notes.py and github_release.py by hand. Each artifact is hashed
+once; the hashes feed the manifest and the post-upload download checks. S3
+and GitHub uploads run in parallel, and the manifest is published last, only
+after every other stage has succeeded::
+
+    hash:<platform> ── manifest ── check-manifest ─┬─ s3:<platform> ── validate:<platform> ─┐
+                                                   └─ github ───────────────────────────────┴─ publish
+    notes ─────────────────────────────────────────────┘
+"""
+import argparse
+import datetime
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import boto3
+import requests
+
+from github_release import GitHubRelease, get_repo_info
+from generate_notes import generate_release_notes
+from manifest_validator import ManifestValidator
+
+manage_release = importlib.import_module('manage-release')
+validate_downloads = importlib.import_module('validate-downloads')
+
+MAX_WORKERS = 8
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[Dict], object]
+    deps: List[str] = field(default_factory=list)
+
+@dataclass
+class StageTiming:
+    name: str
+    start: float
+    duration: float
+
+def run_stages(stages: List[Stage], max_workers: int = MAX_WORKERS) -> Dict[str, object]:
+    """Run stages as soon as their dependencies finish; return results by stage name.
+
+    Each stage receives the results of all finished stages. The first failure
+    stops new stages from being scheduled and is re-raised once running
+    stages have finished.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {', '.join(unknown)}")
+
+    results: Dict[str, object] = {}
+    timings: List[StageTiming] = []
+    pending = list(stages)
+    running = {}
+    failure = None
+    started = time.monotonic()
+
+    def timed(stage: Stage):
+        start = time.monotonic()
+        try:
+            return stage.func(results)
+        finally:
+            timings.append(StageTiming(stage.name, start - started, time.monotonic() - start))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            if not failure:
+                for stage in [s for s in pending if all(dep in results for dep in s.deps)]:
+                    pending.remove(stage)
+                    running[executor.submit(timed, stage)] = stage
+            if not running:
+                if pending and not failure:
+                    raise RuntimeError(f"Dependency cycle between stages: {', '.join(s.name for s in pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    print(f"Stage {stage.name} failed: {e}")
+                    failure = failure or e
+
+    print_timings(timings, time.monotonic() - started)
+    if failure:
+        raise failure
+    return results
+
+def print_timings(timings: List[StageTiming], total: float) -> None:
+    print("\nStage timings:")
+    for timing in sorted(timings, key=lambda t: t.start):
+        print(f"  {timing.name:<24} start {timing.start:7.2f}s  took {timing.duration:7.2f}s")
+    print(f"  {'total':<24} {total:21.2f}s")
+
+def build_stages(args, files: Dict[str, str], beta_expires: Optional[str]) -> List[Stage]:
+    version = args.version
+    platforms = list(files)
+    s3 = boto3.client('s3')
+    session = requests.Session()
+
+    def update_manifest(results):
+        file_info = {platform: results[f'hash:{platform}'] for platform in platforms}
+        return manage_release.update_manifest(version, files, args.manifest, args.notes,
+                                              args.critical, args.beta, beta_expires, file_info)
+
+    def check_manifest(results):
+        validator = ManifestValidator(results['manifest'])
+        validator.validate()
+        if validator.errors:
+            raise ValueError(f"Manifest validation failed: {'; '.join(validator.errors)}")
+
+    def validate_download(platform):
+        def run(results):
+            info = results[f'hash:{platform}']
+            url = f"{args.download_base_url}/{results[f's3:{platform}']}"
+            _, valid, message = validate_downloads.validate_download(url, info['checksum'], session)
+            if not valid:
+                raise ValueError(f"{url}: {message}")
+            print(f"✅ {platform}: {url}")
+        return run
+
+    def github_release(results):
+        gh = GitHubRelease(args.token, args.repo)
+        release = gh.create_release(
+            tag=f"v{version}",
+            name=f"RinaWarp Terminal {version}",
+            body=results['notes'],
+            files=list(files.values()),
+            prerelease=args.beta,
+            draft=args.draft
+        )
+        print(f"Created release: {release['html_url']}")
+        return release
+
+    stages = [
+        Stage('notes', lambda results: generate_release_notes(version, args.from_tag, args.beta)),
+        Stage('manifest', update_manifest, [f'hash:{platform}' for platform in platforms]),
+        Stage('check-manifest', check_manifest, ['manifest'])
+    ]
+    for platform, file_path in files.items():
+        stages.append(Stage(f'hash:{platform}', lambda results, path=file_path: manage_release.get_file_info(path)))
+
+    if args.dry_run:
+        return stages
+
+    publish_deps = []
+    for platform, file_path in files.items():
+        stages.append(Stage(
+            f's3:{platform}',
+            lambda results, platform=platform, path=file_path: manage_release.upload_artifact(
+                s3, args.bucket, version, platform, path, args.beta),
+            ['check-manifest']
+        ))
+        if args.skip_validate:
+            publish_deps.append(f's3:{platform}')
+        else:
+            stages.append(Stage(f'validate:{platform}', validate_download(platform), [f's3:{platform}']))
+            publish_deps.append(f'validate:{platform}')
+
+    if not args.skip_github:
+        stages.append(Stage('github', github_release, ['check-manifest', 'notes']))
+        publish_deps.append('github')
+
+    stages.append(Stage(
+        'publish',
+        lambda results: manage_release.publish_manifest(args.manifest, args.bucket),
+        publish_deps
+    ))
+    return stages
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, upload, validate and publish a release in one run")
+    parser.add_argument("version", help="Version number (e.g., 1.0.0)")
+    parser.add_argument("--macos", help="Path to macOS installer")
+    parser.add_argument("--windows", help="Path to Windows installer")
+    parser.add_argument("--linux", help="Path to Linux installer")
+    parser.add_argument("--notes", help="Release notes for the manifest", default="")
+    parser.add_argument("--from-tag", help="Previous version tag to generate GitHub release notes from")
+    parser.add_argument("--critical", action="store_true", help="Mark as critical update")
+    parser.add_argument("--beta", action="store_true", help="Mark as beta release")
+    parser.add_argument("--beta-expires", help="Expiration date for beta (YYYY-MM-DD)")
+    parser.add_argument("--manifest", default="version-manifest.json", help="Path to manifest file")
+    parser.add_argument("--bucket", default=manage_release.S3_BUCKET, help="Downloads S3 bucket")
+    parser.add_argument("--download-base-url",
+                        help="Public URL serving --bucket, for the post-upload checks "
+                             f"(default: {manage_release.DOWNLOAD_BASE_URL} for the default bucket)")
+    parser.add_argument("--token", help="GitHub token (or set GITHUB_TOKEN env var)")
+    parser.add_argument("--repo", help="GitHub repository (owner/repo)")
+    parser.add_argument("--draft", action="store_true", help="Create the GitHub release as a draft")
+    parser.add_argument("--skip-github", action="store_true", help="Don't create a GitHub release")
+    parser.add_argument("--skip-validate", action="store_true", help="Don't re-download uploaded artifacts")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Hash, generate notes and update/check the manifest locally; upload nothing")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Stages to run in parallel")
+
+    args = parser.parse_args()
+
+    files = {k: v for k, v in {"macos": args.macos, "windows": args.windows, "linux": args.linux}.items() if v}
+    if not files:
+        print("Error: At least one platform installer must be specified")
+        sys.exit(1)
+    missing = [path for path in files.values() if not os.path.exists(path)]
+    if missing:
+        print(f"Error: File not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    if args.beta and args.beta_expires:
+        try:
+            datetime.datetime.strptime(args.beta_expires, '%Y-%m-%d')
+        except ValueError:
+            print("Error: Beta expiration date must be in YYYY-MM-DD format")
+            sys.exit(1)
+    if args.beta and not args.beta_expires:
+        beta_expires = (datetime.datetime.now() + datetime.timedelta(days=30)).strftime('%Y-%m-%d')
+    else:
+        beta_expires = args.beta_expires
+
+    if not args.download_base_url:
+        if args.bucket != manage_release.S3_BUCKET and not (args.dry_run or args.skip_validate):
+            print("Error: --download-base-url is required with --bucket (or pass --skip-validate)")
+            sys.exit(1)
+        args.download_base_url = manage_release.DOWNLOAD_BASE_URL
+    args.download_base_url = args.download_base_url.rstrip('/')
+
+    if not (args.dry_run or args.skip_github):
+        args.token = args.token or os.environ.get('GITHUB_TOKEN')
+        args.repo = args.repo or get_repo_info()
+        if not args.token or not args.repo:
+            print("Error: GitHub token and repository required (or pass --skip-github)")
+            sys.exit(1)
+
+    try:
+        run_stages(build_stages(args, files, beta_expires), args.workers)
+    except Exception as e:
+        print(f"Release {args.version} failed: {e}")
+        sys.exit(1)
+
+    print(f"Successfully released version {args.version}" + (" (dry run)" if args.dry_run else ""))
+
+if __name__ == "__main__":
+    main()
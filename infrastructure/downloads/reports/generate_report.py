@@ -4,34 +4,58 @@ import argparse
 import json
 import os
 from datetime import datetime
+from functools import lru_cache
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from stats_store import StatsStore
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+STREAM_BUFFER_SIZE = 64
+
+# Shared by every report rendered in this process; compiled templates are also
+# cached on disk so later runs skip parsing.
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache()
+)
 
 def load_json(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def create_downloads_chart(stats_data):
-    # Extract daily download data
-    dates = list(stats_data['daily_downloads'].keys())
-    versions = list(stats_data['daily_downloads'][dates[0]].keys())
-    platforms = ['macos', 'windows', 'linux']
-    
-    data = []
-    for date in dates:
-        for version in versions:
-            for platform in platforms:
-                count = stats_data['daily_downloads'][date][version][platform]
-                data.append({
-                    'date': date,
-                    'version': version,
-                    'platform': platform.title(),
-                    'downloads': count
-                })
-    
-    df = pd.DataFrame(data)
+def stats_frame(tree: dict, levels: list) -> pd.DataFrame:
+    """Flatten nested stats ({level: {level: ... count}}) into a long-format frame.
+
+    Branches that are missing, shallower or deeper than ``levels`` are dropped
+    rather than raising, and every key present at each level is kept.
+    """
+    columns = levels + ['downloads']
+    branches = [((), tree)]
+    for _ in levels:
+        branches = [
+            (keys + (key,), child)
+            for keys, node in branches if isinstance(node, dict)
+            for key, child in node.items()
+        ]
+    records = [keys + (count,) for keys, count in branches
+               if count is not None and not isinstance(count, dict)]
+
+    frame = pd.DataFrame.from_records(records, columns=columns)
+    frame['downloads'] = pd.to_numeric(frame['downloads'], errors='coerce')
+    return frame.dropna().astype({'downloads': 'int64'})
+
+def load_stats_frames(stats_data: dict) -> tuple:
+    """Return (daily, cumulative) long-format download frames."""
+    daily = stats_frame(stats_data.get('daily_downloads'), ['date', 'version', 'platform'])
+    daily['date'] = pd.to_datetime(daily['date'])
+    cumulative = stats_frame(stats_data.get('cumulative_downloads'), ['version', 'platform'])
+    return daily, cumulative
+
+def create_downloads_chart(daily):
+    df = daily.sort_values(['version', 'date'], kind='stable').assign(platform=daily['platform'].str.title())
     fig = px.line(df, x='date', y='downloads', 
                   color='platform', facet_row='version',
                   title='Daily Downloads by Version and Platform',
@@ -51,22 +75,10 @@ def create_downloads_chart(stats_data):
     )
     return fig.to_html(full_html=False, include_plotlyjs='cdn')
 
-def create_platform_distribution(stats_data):
+def create_platform_distribution(cumulative):
     # Use cumulative data for platform distribution
-    platforms = ['macos', 'windows', 'linux']
-    versions = list(stats_data['cumulative_downloads'].keys())
-    
-    data = []
-    for version in versions:
-        for platform in platforms:
-            count = stats_data['cumulative_downloads'][version][platform]
-            data.append({
-                'version': version,
-                'platform': platform.title(),
-                'downloads': count
-            })
-    
-    df = pd.DataFrame(data)
+    df = cumulative.groupby('platform', as_index=False)['downloads'].sum()
+    df['platform'] = df['platform'].str.title()
     fig = px.pie(df, values='downloads', names='platform',
                  title='Platform Distribution',
                  labels={'platform': 'Platform', 'downloads': 'Total Downloads'})
@@ -84,8 +96,32 @@ def create_platform_distribution(stats_data):
     )
     return fig.to_html(full_html=False, include_plotlyjs=False)
 
-def generate_report(manifest_path, stats_path=None, output_path='version-report.html'):
-    manifest = load_json(manifest_path)
+CHANNELS = ('all', 'stable', 'beta')
+
+def version_list(section):
+    return sorted((dict(details, version=ver) for ver, details in section.items()),
+                  key=lambda x: x['version'], reverse=True)
+
+@lru_cache(maxsize=None)
+def load_manifest(manifest_path):
+    return load_json(manifest_path)
+
+@lru_cache(maxsize=None)
+def stats_context(stats_path):
+    """Charts and totals for a stats file or store, computed once per process."""
+    if os.path.isdir(stats_path):
+        daily, cumulative = StatsStore(stats_path).read()
+    else:
+        daily, cumulative = load_stats_frames(load_json(stats_path))
+    return {
+        'has_stats': True,
+        'downloads_chart': create_downloads_chart(daily),
+        'platform_chart': create_platform_distribution(cumulative),
+        'total_downloads': int(cumulative['downloads'].sum())
+    }
+
+def build_context(manifest_path, stats_path=None, channel='all'):
+    manifest = load_manifest(manifest_path)
     
     # Basic version info
     context = {
@@ -97,53 +133,54 @@ def generate_report(manifest_path, stats_path=None, output_path='version-report.
     }
     
     # Version details
-    versions = []
-    for ver, details in manifest['versions'].items():
-        details['version'] = ver
-        versions.append(details)
-    context['versions'] = sorted(versions, key=lambda x: x['version'], reverse=True)
+    context['versions'] = version_list(manifest['versions']) if channel != 'beta' else []
     
     # Beta versions
-    if 'beta' in manifest:
-        beta_versions = []
-        for ver, details in manifest['beta'].items():
-            details['version'] = ver
-            beta_versions.append(details)
-        context['beta_versions'] = sorted(beta_versions, 
-                                        key=lambda x: x['version'],
-                                        reverse=True)
+    if 'beta' in manifest and channel != 'stable':
+        context['beta_versions'] = version_list(manifest['beta'])
     
     # Add download statistics if available
     if stats_path and os.path.exists(stats_path):
-        stats_data = load_json(stats_path)
-        context['has_stats'] = True
-        context['downloads_chart'] = create_downloads_chart(stats_data)
-        context['platform_chart'] = create_platform_distribution(stats_data)
-        
-        # Calculate total downloads
-        total = 0
-        for version in stats_data['cumulative_downloads']:
-            for platform in stats_data['cumulative_downloads'][version]:
-                total += stats_data['cumulative_downloads'][version][platform]
-        context['total_downloads'] = total
-    
-    # Load template and render
-    env = Environment(loader=FileSystemLoader('templates'))
-    template = env.get_template('report.html')
-    output = template.render(context)
+        context.update(stats_context(stats_path))
     
-    with open(output_path, 'w') as f:
-        f.write(output)
+    return context
+
+def generate_stream(context, output_path, template_name='report.html'):
+    """Render a template straight into the output file."""
+    template = env.get_template(template_name)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        # Buffered so the file sees a handful of writes rather than one per template node
+        stream = template.stream(context)
+        stream.enable_buffering(STREAM_BUFFER_SIZE)
+        stream.dump(f)
+
+def generate_report(manifest_path, stats_path=None, output_path='version-report.html', channel='all'):
+    generate_stream(build_context(manifest_path, stats_path, channel), output_path)
+
+def generate_batch(jobs):
+    """Render many reports in one process, reusing the environment, manifests and stats."""
+    for job in jobs:
+        generate_report(job['manifest'], job.get('stats'), job['output'], job.get('channel', 'all'))
+        print(f"Report written to {job['output']}")
 
 def main():
     parser = argparse.ArgumentParser(description='Generate version report')
-    parser.add_argument('manifest', help='Path to version manifest JSON')
-    parser.add_argument('--stats', help='Path to download statistics JSON')
+    parser.add_argument('manifest', nargs='?', help='Path to version manifest JSON')
+    parser.add_argument('--stats', help='Path to download statistics JSON or a stats store directory')
     parser.add_argument('--output', default='version-report.html',
                        help='Output path for HTML report')
+    parser.add_argument('--channel', choices=CHANNELS, default='all',
+                       help='Limit the report to stable or beta versions')
+    parser.add_argument('--batch',
+                       help='JSON list of {"manifest", "stats", "output", "channel"} jobs to render')
     
     args = parser.parse_args()
-    generate_report(args.manifest, args.stats, args.output)
+    if args.batch:
+        generate_batch(load_json(args.batch))
+    elif args.manifest:
+        generate_report(args.manifest, args.stats, args.output, args.channel)
+    else:
+        parser.error('a manifest path or --batch is required')
 
 if __name__ == '__main__':
     main()
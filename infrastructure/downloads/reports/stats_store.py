@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Columnar, append-only download statistics store.
+
+A store is a directory of raw little-endian int32 column files plus a small
+``meta.json`` holding the version and platform dictionaries and row counts::
+
+    stats-store/
+        meta.json
+        daily.date.i32          days since 1970-01-01
+        daily.version.i32       index into meta["versions"]
+        daily.platform.i32      index into meta["platforms"]
+        daily.downloads.i32
+        cumulative.version.i32
+        cumulative.platform.i32
+        cumulative.downloads.i32
+
+Columns are memory-mapped on read, so loading years of daily stats costs a
+few page faults instead of parsing a nested JSON document. Appends write the
+column files first and bump the row counts in ``meta.json`` last, so readers
+never see a partially written row.
+"""
+import argparse
+import json
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+COLUMN_DTYPE = np.dtype('<i4')
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+DAILY_COLUMNS = ['date', 'version', 'platform', 'downloads']
+CUMULATIVE_COLUMNS = ['version', 'platform', 'downloads']
+
+class StatsStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = self._load_meta()
+
+    def _load_meta(self) -> Dict:
+        try:
+            with open(os.path.join(self.path, 'meta.json'), 'r') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return {
+                'format': FORMAT_VERSION,
+                'versions': [],
+                'platforms': [],
+                'rows': {'daily': 0, 'cumulative': 0}
+            }
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported stats store format: {meta.get('format')}")
+        return meta
+
+    def _save_meta(self) -> None:
+        meta_path = os.path.join(self.path, 'meta.json')
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def _column_path(self, table: str, column: str) -> str:
+        return os.path.join(self.path, f"{table}.{column}.i32")
+
+    def _encode(self, values: pd.Series, dictionary: str) -> np.ndarray:
+        """Dictionary-encode values, extending the stored dictionary with new keys."""
+        known = self.meta[dictionary]
+        new = pd.Index(values.unique()).difference(known, sort=False)
+        known.extend(str(value) for value in new)
+        return pd.Categorical(values, categories=known).codes.astype(COLUMN_DTYPE)
+
+    def _column(self, table: str, column: str, mmap: bool) -> np.ndarray:
+        rows = self.meta['rows'][table]
+        path = self._column_path(table, column)
+        if rows == 0:
+            return np.empty(0, dtype=COLUMN_DTYPE)
+        if mmap:
+            return np.memmap(path, dtype=COLUMN_DTYPE, mode='r', shape=(rows,))
+        return np.fromfile(path, dtype=COLUMN_DTYPE, count=rows)
+
+    def _write(self, table: str, columns: Dict[str, np.ndarray], mode: str) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        for column, values in columns.items():
+            path = self._column_path(table, column)
+            if mode == 'ab' and os.path.exists(path):
+                # Drop any tail left by an append that never reached meta.json
+                with open(path, 'r+b') as f:
+                    f.truncate(self.meta['rows'][table] * COLUMN_DTYPE.itemsize)
+            with open(path, mode) as f:
+                f.write(np.ascontiguousarray(values, dtype=COLUMN_DTYPE).tobytes())
+
+    def _counts(self, downloads: pd.Series) -> np.ndarray:
+        counts = downloads.to_numpy(dtype='int64')
+        if counts.size and (counts.min() < 0 or counts.max() > np.iinfo(COLUMN_DTYPE).max):
+            raise ValueError("Download counts must be non-negative and fit in int32")
+        return counts.astype(COLUMN_DTYPE)
+
+    def append_daily(self, daily: pd.DataFrame) -> int:
+        """Append long-format daily rows (date, version, platform, downloads)."""
+        if daily.empty:
+            return 0
+        days = (pd.to_datetime(daily['date']).to_numpy().astype('datetime64[D]') - EPOCH).astype(COLUMN_DTYPE)
+        self._write('daily', {
+            'date': days,
+            'version': self._encode(daily['version'], 'versions'),
+            'platform': self._encode(daily['platform'], 'platforms'),
+            'downloads': self._counts(daily['downloads'])
+        }, 'ab')
+        self.meta['rows']['daily'] += len(daily)
+        self._save_meta()
+        return len(daily)
+
+    def replace_cumulative(self, cumulative: pd.DataFrame) -> None:
+        """Replace the cumulative (version, platform, downloads) snapshot."""
+        self._write('cumulative', {
+            'version': self._encode(cumulative['version'], 'versions'),
+            'platform': self._encode(cumulative['platform'], 'platforms'),
+            'downloads': self._counts(cumulative['downloads'])
+        }, 'wb')
+        self.meta['rows']['cumulative'] = len(cumulative)
+        self._save_meta()
+
+    def stored_dates(self) -> np.ndarray:
+        """Distinct dates already present in the daily table."""
+        return np.unique(self._column('daily', 'date', mmap=True)) + EPOCH
+
+    def import_stats(self, daily: pd.DataFrame, cumulative: pd.DataFrame) -> int:
+        """Append daily rows for dates not yet stored and refresh the cumulative snapshot."""
+        stored = self.stored_dates().astype('datetime64[ns]')
+        added = self.append_daily(daily[~pd.to_datetime(daily['date']).isin(stored)])
+        if not cumulative.empty:
+            self.replace_cumulative(cumulative)
+        return added
+
+    def read(self, mmap: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return (daily, cumulative) long-format frames backed by the column files."""
+        versions = self.meta['versions']
+        platforms = self.meta['platforms']
+
+        def decode(table: str) -> Dict[str, object]:
+            return {
+                'version': pd.Categorical.from_codes(self._column(table, 'version', mmap), categories=versions),
+                'platform': pd.Categorical.from_codes(self._column(table, 'platform', mmap), categories=platforms),
+                'downloads': self._column(table, 'downloads', mmap)
+            }
+
+        daily = pd.DataFrame({
+            'date': (self._column('daily', 'date', mmap) + EPOCH).astype('datetime64[ns]'),
+            **decode('daily')
+        }, columns=DAILY_COLUMNS)
+        cumulative = pd.DataFrame(decode('cumulative'), columns=CUMULATIVE_COLUMNS)
+        return daily, cumulative
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the columnar download stats store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Append a stats JSON file to a store')
+    import_parser.add_argument('stats', help='Path to download statistics JSON')
+    import_parser.add_argument('store', help='Path to the stats store directory')
+
+    show_parser = subparsers.add_parser('show', help='Summarize a stats store')
+    show_parser.add_argument('store', help='Path to the stats store directory')
+
+    args = parser.parse_args()
+    store = StatsStore(args.store)
+
+    if args.command == 'import':
+        from generate_report import load_json, load_stats_frames
+        daily, cumulative = load_stats_frames(load_json(args.stats))
+        added = store.import_stats(daily, cumulative)
+        print(f"Appended {added} daily rows to {args.store}")
+    else:
+        daily, cumulative = store.read()
+        print(f"Daily rows: {len(daily)}")
+        if len(daily):
+            print(f"Dates: {daily['date'].min().date()} to {daily['date'].max().date()}")
+        print(f"Versions: {', '.join(store.meta['versions'])}")
+        print(f"Platforms: {', '.join(store.meta['platforms'])}")
+        print(f"Cumulative downloads: {int(cumulative['downloads'].sum()):,}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import gzip
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, 'functions'), os.path.join(HERE, 'benchmarks')]
+from aws_stubs import FakeAWS
+from download_records import archive_key, encode_download, partition_keys
+
+AWS = FakeAWS()
+with AWS.installed(), mock.patch.dict(os.environ, {'DOWNLOADS_TABLE': 'downloads', 'ARCHIVE_BUCKET': 'archive'}):
+    import archive_downloads
+
+def epoch(timestamp: str) -> int:
+    return int(datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp())
+
+class TestArchiveDownloads(unittest.TestCase):
+    def setUp(self):
+        # The module's Table resource holds on to this dict, so empty it in place
+        self.table = AWS.tables.setdefault('downloads', {})
+        self.table.clear()
+        AWS.objects.clear()
+        AWS.reset_calls()
+        for download_id, timestamp in [('b', '2024-05-31T23:00:00'), ('a', '2024-05-31T01:00:00'),
+                                       ('c', '2024-06-01T00:00:00')]:
+            self.table[download_id] = encode_download(download_id, '1.0.0', 'macos', epoch(timestamp),
+                                                      'US', 'h', ttl_days=104)
+        self.table['legacy'] = {'download_id': 'legacy', 'year_month': '2024-06', 'platform': 'linux',
+                                'version': '0.9.0', 'timestamp': '2024-06-01T08:00:00', 'country': 'DE'}
+
+    def partition(self, day):
+        body = AWS.objects[('archive', archive_key(day))]['Body']
+        return [json.loads(line) for line in gzip.decompress(body).splitlines()]
+
+    def test_daily_partitions(self):
+        """Test each day across a month boundary gets its own sorted partition without TTLs."""
+        summary = archive_downloads.archive_days(['2024-05-30', '2024-05-31', '2024-06-01'])
+        self.assertEqual(summary, {'days': 3, 'downloads': 4, 'legacy_expired': 1})
+
+        self.assertEqual(self.partition('2024-05-30'), [])  # Empty days are marked done too
+        self.assertEqual([d['download_id'] for d in self.partition('2024-05-31')], ['a', 'b'])
+        june = self.partition('2024-06-01')
+        self.assertEqual([d['download_id'] for d in june], ['c', 'legacy'])
+        self.assertFalse(any('exp' in d for d in june))
+        self.assertEqual(june[0]['timestamp'], '2024-06-01T00:00:00')
+        # One scatter-gather per month
+        self.assertEqual(AWS.calls['dynamodb:Query'], 2 * len(partition_keys('2024-06-01', '2024-06-01')))
+
+    def test_gaps_between_pending_days(self):
+        """Test downloads on already-archived days between pending days are left alone."""
+        self.table['mid'] = encode_download('mid', '1.0.0', 'macos', epoch('2024-05-15T12:00:00'),
+                                            'US', 'h', ttl_days=104)
+        summary = archive_downloads.archive_days(['2024-05-01', '2024-05-31'])
+        self.assertEqual(summary, {'days': 2, 'downloads': 2, 'legacy_expired': 0})
+        self.assertEqual([d['download_id'] for d in self.partition('2024-05-31')], ['a', 'b'])
+        self.assertFalse(archive_downloads.is_archived('2024-05-15'))
+
+    def test_legacy_items_get_ttl(self):
+        """Test items written before TTLs carry one after archiving."""
+        archive_downloads.archive_days(['2024-06-01'])
+        self.assertIn('exp', self.table['legacy'])
+
+    def test_failed_backfill_is_retried(self):
+        """Test a day whose TTL backfill fails is not marked archived."""
+        with mock.patch.object(archive_downloads.downloads_table, 'update_item', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_downloads.archive_days(['2024-06-01'])
+        self.assertFalse(archive_downloads.is_archived('2024-06-01'))
+
+    def test_handler_skips_archived_days(self):
+        """Test a second run writes nothing."""
+        cutoff = datetime.utcnow().date() - timedelta(days=archive_downloads.ARCHIVE_AFTER_DAYS)
+        since = (cutoff - timedelta(days=3)).isoformat()
+
+        first = json.loads(archive_downloads.lambda_handler({'since': since}, None)['body'])
+        self.assertEqual(first['days'], 3)
+        AWS.reset_calls()
+        second = json.loads(archive_downloads.lambda_handler({'since': since}, None)['body'])
+        self.assertEqual(second['days'], 0)
+        self.assertEqual(AWS.calls['s3:PutObject'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+import add_cloudflare_record
+from add_cloudflare_record import API_BASE, DOMAIN, MAX_RETRIES, CloudflareClient, CloudflareError
+
+def response(status: int, body=None, headers=None) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status
+    result._content = json.dumps(body).encode() if body is not None else b'<html>bad gateway</html>'
+    result.headers.update(headers or {})
+    return result
+
+def page(records, page_number, total_pages):
+    return response(200, {'success': True, 'result': records,
+                          'result_info': {'page': page_number, 'total_pages': total_pages}})
+
+def dns_record(record_id, name, record_type='CNAME'):
+    return {'id': record_id, 'name': name, 'type': record_type, 'content': 'target.example.com'}
+
+class TestCloudflareClient(unittest.TestCase):
+    def setUp(self):
+        self.client = CloudflareClient('token')
+        self.sleep = mock.patch.object(add_cloudflare_record.time, 'sleep').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def script(self, *responses):
+        return mock.patch.object(self.client.session, 'request', side_effect=list(responses)).start()
+
+    def test_retry_after(self):
+        """Test 429 responses wait for Retry-After before retrying."""
+        request = self.script(response(429, {'success': False}, {'Retry-After': '7'}),
+                              response(200, {'success': True, 'result': []}))
+        self.assertEqual(self.client.request('GET', '/zones')['result'], [])
+        self.assertEqual(request.call_count, 2)
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_server_error_backoff(self):
+        """Test 5xx responses, including non-JSON ones, are retried with exponential backoff."""
+        request = self.script(response(502), response(503, {'success': False}),
+                              response(200, {'success': True, 'result': []}))
+        self.client.request('GET', '/zones')
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1, 2])
+
+    def test_gives_up(self):
+        """Test the last error is raised with its status once retries run out."""
+        self.script(*[response(503, {'success': False, 'errors': [{'message': 'unavailable'}]})] * MAX_RETRIES)
+        with self.assertRaises(CloudflareError) as raised:
+            self.client.request('GET', '/zones')
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertIn('unavailable', str(raised.exception))
+        self.assertEqual(self.sleep.call_count, MAX_RETRIES - 1)
+
+    def test_no_retry_on_client_error(self):
+        """Test 4xx responses other than 429 fail immediately."""
+        request = self.script(response(403, {'success': False, 'errors': [{'message': 'forbidden'}]}))
+        with self.assertRaises(CloudflareError) as raised:
+            self.client.request('GET', '/zones')
+        self.assertEqual(raised.exception.status_code, 403)
+        self.assertEqual(request.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_pagination(self):
+        """Test records are collected across every page and indexed by name and type."""
+        request = self.script(
+            page([dns_record('1', f'downloads.{DOMAIN}'), dns_record('2', DOMAIN, 'A')], 1, 3),
+            page([dns_record('3', f'_abc.{DOMAIN}')], 2, 3),
+            page([dns_record('4', f'_abc.{DOMAIN}')], 3, 3)
+        )
+        records = self.client.list_dns_records('zone')
+        self.assertEqual(sorted(record['id'] for record in records), ['1', '2', '3', '4'])
+        self.assertEqual([call.kwargs['params']['page'] for call in request.call_args_list], [1, 2, 3])
+        self.assertEqual(request.call_args_list[0].args, ('GET', f'{API_BASE}/zones/zone/dns_records'))
+        self.assertEqual(len(self.client.records('zone')[(f'_abc.{DOMAIN}', 'CNAME')]), 2)
+
+        # The index is cached per zone
+        self.assertEqual(self.client.find_record('zone', 'downloads', 'CNAME')['id'], '1')
+        self.assertEqual(request.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
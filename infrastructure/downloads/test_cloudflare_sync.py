@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import unittest
+
+from add_cloudflare_record import (
+    DOMAIN, MANAGED_COMMENT, CloudflareError, apply_sync, desired_records_from_tfstate,
+    plan_sync, record_key
+)
+
+def zone_record(record_id, name, record_type, content, proxied=False, comment=MANAGED_COMMENT, ttl=1):
+    return {'id': record_id, 'name': name, 'type': record_type, 'content': content,
+            'proxied': proxied, 'ttl': ttl, 'comment': comment}
+
+class FakeClient:
+    """Serves a fixed zone index and records the calls apply_sync makes."""
+
+    def __init__(self, records, batch_status=None):
+        self.index = {}
+        for record in records:
+            self.index.setdefault(record_key(record['name'], record['type']), []).append(record)
+        self.batch_status = batch_status
+        self.calls = []
+
+    def records(self, zone_id, refresh=False):
+        return self.index
+
+    def batch_dns_records(self, zone_id, posts, puts, deletes):
+        if self.batch_status:
+            raise CloudflareError('batch', self.batch_status)
+        self.calls.append(('batch', len(posts), len(puts), len(deletes)))
+
+    def add_dns_record(self, zone_id, name, record_type, content, proxied, **fields):
+        self.calls.append(('add', name))
+
+    def update_dns_record(self, zone_id, record, content, proxied, **fields):
+        self.calls.append(('update', record['id']))
+
+    def delete_dns_record(self, zone_id, record):
+        self.calls.append(('delete', record['id']))
+
+class TestRecordKey(unittest.TestCase):
+    def test_qualifies_names(self):
+        """Test short, dotted and mixed-case names index the same way."""
+        self.assertEqual(record_key('downloads', 'cname'), (f'downloads.{DOMAIN}', 'CNAME'))
+        self.assertEqual(record_key(f'Downloads.{DOMAIN}.', 'CNAME'), (f'downloads.{DOMAIN}', 'CNAME'))
+        self.assertEqual(record_key(DOMAIN, 'A'), (DOMAIN, 'A'))
+
+class TestPlanSync(unittest.TestCase):
+    def setUp(self):
+        self.zone = [
+            zone_record('1', f'downloads.{DOMAIN}', 'CNAME', 'd111.cloudfront.net', proxied=True),
+            zone_record('2', f'_abc.{DOMAIN}', 'CNAME', 'old.acm-validations.aws'),
+            zone_record('3', f'_stale.{DOMAIN}', 'CNAME', 'gone.acm-validations.aws'),
+            zone_record('4', f'www.{DOMAIN}', 'CNAME', 'site.example.com', comment=None),
+        ]
+        self.desired = [
+            {'name': 'downloads', 'type': 'CNAME', 'content': 'D111.cloudfront.net.', 'proxied': True},
+            {'name': f'_abc.{DOMAIN}.', 'type': 'CNAME', 'content': 'new.acm-validations.aws'},
+            {'name': '_new', 'type': 'CNAME', 'content': 'x.acm-validations.aws'},
+        ]
+
+    def test_diff(self):
+        """Test unchanged records are left alone and changes are detected."""
+        plan = plan_sync(FakeClient(self.zone), 'zone', self.desired)
+        self.assertEqual([p['name'] for p in plan.creates], [f'_new.{DOMAIN}'])
+        self.assertEqual([(e['id'], p['content']) for e, p in plan.updates], [('2', 'new.acm-validations.aws')])
+        self.assertEqual([r['id'] for r in plan.deletes], ['3'])
+
+    def test_prune_guard(self):
+        """Test only records carrying the managed comment are ever deleted."""
+        plan = plan_sync(FakeClient(self.zone), 'zone', [])
+        self.assertEqual(sorted(r['id'] for r in plan.deletes), ['1', '2', '3'])
+        self.assertNotIn('4', [r['id'] for r in plan.deletes])
+
+    def test_no_prune(self):
+        """Test prune=False never deletes."""
+        self.assertEqual(plan_sync(FakeClient(self.zone), 'zone', [], prune=False).deletes, [])
+
+    def test_adopts_unmanaged(self):
+        """Test a matching record without the managed comment is updated to carry it."""
+        desired = [{'name': 'www', 'type': 'CNAME', 'content': 'site.example.com'}]
+        plan = plan_sync(FakeClient(self.zone), 'zone', desired, prune=False)
+        self.assertEqual([e['id'] for e, _ in plan.updates], ['4'])
+        self.assertEqual(plan.updates[0][1]['comment'], MANAGED_COMMENT)
+
+    def test_in_sync(self):
+        """Test an empty plan is falsy."""
+        zone = [zone_record('1', f'downloads.{DOMAIN}', 'CNAME', 'd111.cloudfront.net', proxied=True)]
+        self.assertFalse(plan_sync(FakeClient(zone), 'zone', self.desired[:1]))
+
+class TestApplySync(unittest.TestCase):
+    def setUp(self):
+        self.zone = [zone_record('3', f'_stale.{DOMAIN}', 'CNAME', 'gone.acm-validations.aws')]
+        self.desired = [{'name': '_new', 'type': 'CNAME', 'content': 'x.acm-validations.aws'}]
+
+    def test_batch(self):
+        """Test a plan is applied in one batch call."""
+        client = FakeClient(self.zone)
+        apply_sync(client, 'zone', plan_sync(client, 'zone', self.desired))
+        self.assertEqual(client.calls, [('batch', 1, 0, 1)])
+
+    def test_fallback(self):
+        """Test individual calls are used when the batch endpoint is unavailable."""
+        client = FakeClient(self.zone, batch_status=404)
+        apply_sync(client, 'zone', plan_sync(client, 'zone', self.desired))
+        self.assertEqual(sorted(client.calls), [('add', f'_new.{DOMAIN}'), ('delete', '3')])
+
+    def test_batch_error(self):
+        """Test other batch errors are raised, not retried individually."""
+        client = FakeClient(self.zone, batch_status=400)
+        with self.assertRaises(CloudflareError):
+            apply_sync(client, 'zone', plan_sync(client, 'zone', self.desired))
+        self.assertEqual(client.calls, [])
+
+class TestDesiredRecords(unittest.TestCase):
+    def test_from_tfstate(self):
+        """Test validation CNAMEs and the downloads alias are read from Terraform state."""
+        state = {'resources': [
+            {'type': 'aws_acm_certificate', 'name': 'downloads', 'instances': [{'attributes': {
+                'domain_validation_options': [{
+                    'resource_record_name': f'_abc.downloads.{DOMAIN}.',
+                    'resource_record_type': 'CNAME',
+                    'resource_record_value': '_xyz.acm-validations.aws.'
+                }] * 2  # Duplicate options for the apex and wildcard collapse to one
+            }}]},
+            {'type': 'aws_cloudfront_distribution', 'name': 'downloads', 'instances': [{'attributes': {
+                'domain_name': 'd111.cloudfront.net', 'aliases': [f'downloads.{DOMAIN}']
+            }}]}
+        ]}
+        records = desired_records_from_tfstate(state)
+        self.assertEqual([(r['name'], r['proxied']) for r in records],
+                         [(f'_abc.downloads.{DOMAIN}.', False), ('downloads', True)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import commit_cache
+from commit_cache import CommitCache
+from conventional_commits import PARSER_VERSION
+from test_git_history import git, make_repo
+
+class TestCommitCache(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        make_repo(['feat: first', 'fix(api)!: second', 'perf: third\n\nBREAKING CHANGE: cache moved'])
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def read(self, rev_range='HEAD'):
+        cache = CommitCache(self.path)
+        try:
+            return list(cache.commits(rev_range))
+        finally:
+            cache.close()
+
+    def test_parsed_columns(self):
+        """Test commits come back classified, newest first."""
+        commits = self.read()
+        self.assertEqual([(c.type, c.scope, c.breaking) for c in commits],
+                         [('perf', None, True), ('fix', 'api', True), ('feat', None, False)])
+        self.assertEqual(commits[0].hash, git('rev-parse', 'HEAD'))
+
+    def test_only_misses_are_read(self):
+        """Test cached commits are not read from git again; new ones are."""
+        self.read('HEAD~1')
+        with mock.patch.object(commit_cache, 'iter_commits', wraps=commit_cache.iter_commits) as reader:
+            commits = self.read()
+        self.assertEqual(len(commits), 3)
+        reader.assert_called_once()
+        self.assertEqual(reader.call_args.kwargs['revs'], [git('rev-parse', 'HEAD')])
+
+        with mock.patch.object(commit_cache, 'iter_commits') as reader:
+            self.assertEqual([c.hash for c in self.read()], [c.hash for c in commits])
+        reader.assert_not_called()
+
+    def test_parser_version_invalidation(self):
+        """Test a cache written by an older parser is re-classified on open."""
+        self.read()
+        db = sqlite3.connect(self.path)
+        with db:
+            db.execute("UPDATE commits SET type = 'stale', breaking = 0")
+            db.execute("UPDATE meta SET value = ? WHERE key = 'parser_version'", (str(PARSER_VERSION - 1),))
+        db.close()
+
+        with mock.patch.object(commit_cache, 'iter_commits') as reader:
+            commits = self.read()
+        reader.assert_not_called()  # Rebuilt from the stored subjects and bodies
+        self.assertEqual([(c.type, c.breaking) for c in commits],
+                         [('perf', True), ('fix', True), ('feat', False)])
+
+    def test_current_version_kept(self):
+        """Test an up-to-date cache is not rebuilt."""
+        self.read()
+        db = sqlite3.connect(self.path)
+        with db:
+            db.execute("UPDATE commits SET type = 'kept'")
+        db.close()
+        self.assertEqual({c.type for c in self.read()}, {'kept'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from compare_versions import bucket_commits, compare_version_matrix, diff_version_details, parse_version
+from test_git_history import git, make_repo
+
+def commit(message: str) -> str:
+    git('commit', '-q', '--allow-empty', '-m', message)
+    return git('rev-parse', 'HEAD')
+
+class TestParseVersion(unittest.TestCase):
+    def test_prerelease_ordering(self):
+        """Test numeric beta identifiers sort numerically and before the release."""
+        versions = ['1.1.0', '1.1.0-beta.10', '1.0.9', '1.1.0-beta.2']
+        self.assertEqual(sorted(versions, key=parse_version),
+                         ['1.0.9', '1.1.0-beta.2', '1.1.0-beta.10', '1.1.0'])
+
+    def test_invalid(self):
+        """Test non-semver strings are rejected."""
+        with self.assertRaises(ValueError):
+            parse_version('v1.0')
+
+class TestDiffVersionDetails(unittest.TestCase):
+    def test_changes(self):
+        """Test notes, critical flag, platform and size changes are reported."""
+        old = {'release_notes': 'a', 'critical': False, 'platforms': {
+            'macos': {'size': 100, 'min_os': '11'}, 'linux': {'size': 50}}}
+        new = {'release_notes': 'b', 'critical': True, 'platforms': {
+            'macos': {'size': 120, 'min_os': '12'}, 'windows': {'size': 80}}}
+        descriptions = sorted(change.description for change in diff_version_details(old, new))
+        self.assertEqual(descriptions, [
+            'Added support for windows',
+            'Critical flag changed: False → True',
+            'Release notes updated',
+            'Removed support for linux',
+            'Size changed by +20 bytes',
+            'Updated min_os: 11 → 12'
+        ])
+
+    def test_identical(self):
+        """Test identical entries produce no changes."""
+        details = {'release_notes': 'a', 'platforms': {'macos': {'size': 1}}}
+        self.assertEqual(diff_version_details(details, dict(details)), [])
+
+class TestBucketCommits(unittest.TestCase):
+    """History with a feature branch merged between two tags::
+
+        base (v1.0.0) - a - b (v1.1.0-beta.2) - c (v1.1.0-beta.10) - merge - d (v1.1.0)
+                             \\                                      /
+                              side ----------------------------------
+    """
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        make_repo(['feat: base'])
+        git('tag', 'v1.0.0')
+        self.a = commit('feat: a')
+        self.b = commit('fix: b')
+        git('tag', 'v1.1.0-beta.2')
+        git('checkout', '-q', '-b', 'side')
+        self.side = commit('feat: side')
+        git('checkout', '-q', '-')
+        self.c = commit('perf: c')
+        git('tag', 'v1.1.0-beta.10')
+        git('merge', '-q', '--no-ff', '-m', 'Merge branch side', 'side')
+        self.d = commit('fix: d')
+        git('tag', 'v1.1.0')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_each_commit_in_one_bucket(self):
+        """Test every non-merge commit lands in exactly one bucket: the first tag containing it."""
+        buckets = bucket_commits(['v1.0.0', 'v1.1.0-beta.2', 'v1.1.0-beta.10', 'v1.1.0'])
+        self.assertEqual(buckets['v1.1.0-beta.2'], [self.b, self.a])
+        self.assertEqual(buckets['v1.1.0-beta.10'], [self.c])
+        self.assertEqual(sorted(buckets['v1.1.0']), sorted([self.d, self.side]))
+
+        assigned = [rev for revs in buckets.values() for rev in revs]
+        self.assertEqual(len(assigned), len(set(assigned)))
+        self.assertEqual(set(assigned), set(git('rev-list', '--no-merges', 'v1.0.0..v1.1.0').split()))
+
+    def test_missing_tag(self):
+        """Test tags that don't exist are skipped; remaining tags still get their commits."""
+        buckets = bucket_commits(['v1.0.0', 'v1.0.5', 'v1.1.0-beta.2'])
+        self.assertEqual(buckets, {'v1.0.5': [], 'v1.1.0-beta.2': [self.b, self.a]})
+
+    def test_matrix(self):
+        """Test the matrix sorts versions semantically and pairs each with its own commits."""
+        entry = {'release_notes': '', 'critical': False, 'platforms': {}}
+        manifest_path = os.path.join(self.tmp.name, 'manifest.json')
+        with open(manifest_path, 'w') as f:
+            json.dump({'versions': {'1.0.0': entry, '1.1.0': entry},
+                       'beta': {'1.1.0-beta.2': entry, '1.1.0-beta.10': entry}}, f)
+
+        with mock.patch.dict(os.environ, {'COMMIT_CACHE_PATH': os.path.join(self.tmp.name, 'cache.sqlite')}):
+            matrix = compare_version_matrix(['1.1.0', '1.1.0-beta.10', '1.0.0', '1.1.0-beta.2'], manifest_path)
+
+        self.assertEqual([(old, new) for old, new, _, _ in matrix],
+                         [('1.0.0', '1.1.0-beta.2'), ('1.1.0-beta.2', '1.1.0-beta.10'), ('1.1.0-beta.10', '1.1.0')])
+        self.assertEqual([[c['subject'] for c in commits] for _, _, _, commits in matrix][:2],
+                         [['fix: b', 'feat: a'], ['perf: c']])
+        self.assertEqual(sorted(c['subject'] for c in matrix[2][3]), ['feat: side', 'fix: d'])
+
+if __name__ == '__main__':
+    unittest.main()
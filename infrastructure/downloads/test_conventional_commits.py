@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import json
+import os
+import tempfile
+import unittest
+
+from conventional_commits import (
+    BREAKING_CATEGORY, DEFAULT_CATEGORY, CommitClassifier, load_type_map, parse_conventional_commit
+)
+
+class TestParseConventionalCommit(unittest.TestCase):
+    def test_fields(self):
+        """Test type, scope and description are split out."""
+        self.assertEqual(parse_conventional_commit('fix(ui): tabs | crash'),
+                         {'type': 'fix', 'scope': 'ui', 'description': 'tabs | crash', 'breaking': False})
+
+    def test_breaking(self):
+        """Test both the '!' marker and a BREAKING CHANGE footer mark a commit breaking."""
+        self.assertTrue(parse_conventional_commit('feat!: new config')['breaking'])
+        self.assertTrue(parse_conventional_commit('feat(api): x', 'Details\n\nBREAKING CHANGE: moved')['breaking'])
+        self.assertTrue(parse_conventional_commit('Update deps', 'BREAKING-CHANGE: node 20')['breaking'])
+        self.assertFalse(parse_conventional_commit('feat: x', 'mentions BREAKING CHANGE: inline')['breaking'])
+
+    def test_non_conventional(self):
+        """Test other subjects fall back to the 'other' type."""
+        for subject in ['Merge branch main', 'feature: x', 'fix:missing space', 'fix(): empty scope']:
+            parsed = parse_conventional_commit(subject)
+            self.assertEqual((parsed['type'], parsed['description']), ('other', subject))
+
+class TestCommitClassifier(unittest.TestCase):
+    def test_default_categories(self):
+        """Test categories are ordered breaking first, default last."""
+        classifier = CommitClassifier()
+        self.assertEqual(classifier.categories,
+                         [BREAKING_CATEGORY, 'Features', 'Bug Fixes', 'Performance', DEFAULT_CATEGORY])
+        categories = classifier.classify(['feat: a', 'fix!: b', 'docs: c', 'perf: d'])
+        self.assertEqual({name: [c['description'] for c in commits] for name, commits in categories.items()},
+                         {BREAKING_CATEGORY: ['b'], 'Features': ['a'], 'Bug Fixes': [],
+                          'Performance': ['d'], DEFAULT_CATEGORY: ['c']})
+
+    def test_type_map(self):
+        """Test a custom map merges types into shared categories."""
+        classifier = CommitClassifier({'feat': 'Changes', 'fix': 'Changes', 'docs': 'Docs'}, breaking_category=None)
+        self.assertEqual(classifier.categories, ['Changes', 'Docs', DEFAULT_CATEGORY])
+        self.assertEqual(classifier.category('fix', breaking=True), 'Changes')
+        self.assertEqual(classifier.category('ci'), DEFAULT_CATEGORY)
+
+    def test_load_type_map(self):
+        """Test type maps load from inline JSON or a file."""
+        self.assertEqual(load_type_map('{"feat": "New"}'), {'feat': 'New'})
+        self.assertIsNone(load_type_map(None))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'types.json')
+            with open(path, 'w') as f:
+                json.dump({'fix': 'Fixed'}, f)
+            self.assertEqual(load_type_map(path), {'fix': 'Fixed'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+import gzip
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, 'functions'), os.path.join(HERE, 'benchmarks')]
+import download_records
+from aws_stubs import FakeAWS
+from download_records import (
+    archive_key, days_between, decode_download, encode_download, get_downloads, months_between,
+    partition_keys, shard_key, user_agent_hash
+)
+
+class TestShardKeys(unittest.TestCase):
+    def test_shard_key(self):
+        """Test shard keys are stable, in range and spread downloads across shards."""
+        keys = [shard_key('2024-06', f'macos#1.0.0#{i}', shards=8) for i in range(400)]
+        self.assertEqual(keys[0], shard_key('2024-06', 'macos#1.0.0#0', shards=8))
+        shards = {int(key.split('#')[1]) for key in keys}
+        self.assertEqual(shards, set(range(8)))
+        self.assertTrue(all(key.startswith('2024-06#') for key in keys))
+
+    def test_months_between(self):
+        """Test month ranges span year boundaries and include both ends."""
+        self.assertEqual(months_between('2023-11-15T00:00:00', '2024-02-01T00:00:00'),
+                         ['2023-11', '2023-12', '2024-01', '2024-02'])
+        self.assertEqual(months_between('2024-06-01T00:00:00', '2024-06-30T23:59:59'), ['2024-06'])
+
+    def test_partition_keys(self):
+        """Test every shard and the pre-sharding key are queried for each month."""
+        keys = partition_keys('2024-05-20T00:00:00', '2024-06-02T00:00:00', shards=2)
+        self.assertEqual(keys, ['2024-05', '2024-05#0', '2024-05#1', '2024-06', '2024-06#0', '2024-06#1'])
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        """Test compact items decode back to the long form."""
+        ua_hash = user_agent_hash('Mozilla/5.0')
+        item = encode_download('macos#1.0.0#abc', '1.0.0', 'macos', 1718000000, 'DE', ua_hash, ttl_days=0)
+        self.assertEqual(set(item), {'download_id', 'year_month', 'platform', 'version', 't', 'c', 'uah'})
+        self.assertEqual(item['year_month'], shard_key('2024-06', 'macos#1.0.0#abc'))
+        self.assertEqual(decode_download(item), {
+            'download_id': 'macos#1.0.0#abc',
+            'platform': 'macos',
+            'version': '1.0.0',
+            'timestamp': '2024-06-10T06:13:20',
+            'country': 'DE',
+            'user_agent_hash': ua_hash
+        })
+
+    def test_ttl(self):
+        """Test the TTL is set from the download time and survives decoding."""
+        item = encode_download('id', '1.0.0', 'linux', 1718000000, 'US', 'h', ttl_days=2)
+        self.assertEqual(item['exp'], 1718000000 + 2 * 86400)
+        self.assertEqual(decode_download(item)['exp'], item['exp'])
+
+    def test_decimal_attributes(self):
+        """Test numbers read back from DynamoDB as Decimal decode to ints."""
+        item = encode_download('id', '1.0.0', 'linux', 1718000000, 'US', 'h', ttl_days=2)
+        item.update(t=Decimal(item['t']), exp=Decimal(item['exp']))
+        download = decode_download(item)
+        self.assertEqual(download['timestamp'], '2024-06-10T06:13:20')
+        self.assertIsInstance(download['exp'], int)
+
+    def test_legacy_passthrough(self):
+        """Test items written before compaction are returned unchanged."""
+        legacy = {'download_id': 'id', 'year_month': '2024-06', 'platform': 'windows', 'version': '0.9.0',
+                  'timestamp': '2024-06-01T12:00:00', 'user_agent': 'Mozilla/5.0', 'country': 'FR'}
+        self.assertEqual(decode_download(legacy), legacy)
+        self.assertIsNot(decode_download(legacy), legacy)
+
+    def test_user_agent_hash(self):
+        """Test user-agent hashes are 16 stable hex digits."""
+        self.assertEqual(user_agent_hash('curl/8.0'), user_agent_hash('curl/8.0'))
+        self.assertNotEqual(user_agent_hash('curl/8.0'), user_agent_hash('curl/8.1'))
+        self.assertRegex(user_agent_hash('curl/8.0'), r'^[0-9a-f]{16}$')
+
+class TestGetDownloads(unittest.TestCase):
+    """Reads across the archive and the table, with ARCHIVE_AFTER_DAYS=90 and a 104-day TTL."""
+
+    def setUp(self):
+        self.aws = FakeAWS()
+        self.client = self.aws.client('dynamodb')
+        self.s3 = self.aws.client('s3')
+        self.now = datetime(2024, 9, 30, 12, 0, 0)
+        patcher = mock.patch.multiple(download_records, TTL_DAYS=104, ARCHIVE_AFTER_DAYS=90)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.recent = self.download('recent', days_ago=5)
+        self.grace = self.download('grace', days_ago=95)  # Archived, not yet expired
+        self.old = self.download('old', days_ago=120)  # Archived and expired
+        self.put_table(self.recent, self.grace)
+        self.put_archive(self.grace, self.old)
+
+    def download(self, download_id, days_ago):
+        epoch = int((self.now - timedelta(days=days_ago)).replace(tzinfo=timezone.utc).timestamp())
+        return encode_download(download_id, '1.0.0', 'macos', epoch, 'US', 'h', ttl_days=104)
+
+    def put_table(self, *items):
+        table = self.aws.tables.setdefault('downloads', {})
+        for item in items:
+            table[item['download_id']] = item
+
+    def put_archive(self, *items):
+        for item in items:
+            download = decode_download(item)
+            download.pop('exp')
+            key = archive_key(download['timestamp'][:10])
+            self.aws.objects[('archive', key)] = {'Body': gzip.compress(json.dumps(download).encode())}
+
+    def read(self, start, end):
+        downloads = get_downloads(self.client, 'downloads', self.s3, 'archive',
+                                  start.isoformat(), end.isoformat(), now=self.now)
+        return sorted(d['download_id'] for d in downloads)
+
+    def test_both_tiers(self):
+        """Test a range spanning the archive and the table returns each download once."""
+        self.assertEqual(self.read(self.now - timedelta(days=130), self.now), ['grace', 'old', 'recent'])
+
+    def test_recent_range_skips_archive(self):
+        """Test ranges newer than ARCHIVE_AFTER_DAYS never read S3."""
+        self.assertEqual(self.read(self.now - timedelta(days=7), self.now), ['recent'])
+        self.assertFalse([call for call in self.aws.calls if call.startswith('s3:')])
+
+    def test_expired_range_skips_table(self):
+        """Test ranges older than the TTL never query DynamoDB."""
+        self.assertEqual(self.read(self.now - timedelta(days=125), self.now - timedelta(days=110)), ['old'])
+        self.assertFalse([call for call in self.aws.calls if call.startswith('dynamodb:')])
+
+    def test_no_archive_bucket(self):
+        """Test the table alone is read when no archive is configured."""
+        downloads = get_downloads(self.client, 'downloads', self.s3, None,
+                                  (self.now - timedelta(days=100)).isoformat(), self.now.isoformat(), now=self.now)
+        self.assertEqual(sorted(d['download_id'] for d in downloads), ['grace', 'recent'])
+
+    def test_days_between(self):
+        """Test day ranges include both ends across a month boundary."""
+        self.assertEqual(days_between('2024-02-28T10:00:00', '2024-03-01T00:00:00'),
+                         ['2024-02-28', '2024-02-29', '2024-03-01'])
+
+if __name__ == '__main__':
+    unittest.main()
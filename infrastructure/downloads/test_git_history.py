@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import os
+import subprocess
+import tempfile
+import unittest
+
+from git_history import FIELD_SEP, iter_commits, iter_parents, iter_revisions, parse_record
+
+def git(*args: str) -> str:
+    return subprocess.check_output(['git', *args], text=True).strip()
+
+def make_repo(messages):
+    """Create a repository in the current directory with one commit per message."""
+    git('init', '-q')
+    git('config', 'user.name', 'Test Author')
+    git('config', 'user.email', 'test@example.com')
+    for index, message in enumerate(messages):
+        with open('file.txt', 'w') as f:
+            f.write(str(index))
+        git('add', 'file.txt')
+        git('commit', '-q', '-m', message)
+
+class TestParseRecord(unittest.TestCase):
+    def test_fields(self):
+        """Test a record splits into fields, keeping separators out of the body."""
+        record = FIELD_SEP.join(['\nabc123', 'abc', 'Ann', '1700000000', 'fix: a | b', 'line 1\nline 2\n'])
+        commit = parse_record(record)
+        self.assertEqual(commit.hash, 'abc123')
+        self.assertEqual(commit.timestamp, 1700000000)
+        self.assertEqual(commit.subject, 'fix: a | b')
+        self.assertEqual(commit.body, 'line 1\nline 2')
+
+class TestIterCommits(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        make_repo(['feat: first', 'fix(ui): pipe | in subject\n\nBody with | and\nseveral lines', 'chore: third'])
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_stream(self):
+        """Test commits stream newest first with subjects and bodies intact, across small chunks."""
+        commits = list(iter_commits('HEAD', chunk_size=16))
+        self.assertEqual([c.subject for c in commits], ['chore: third', 'fix(ui): pipe | in subject', 'feat: first'])
+        self.assertEqual(commits[1].body, 'Body with | and\nseveral lines')
+        self.assertEqual(commits[1].author, 'Test Author')
+        self.assertEqual(commits[0].hash, git('rev-parse', 'HEAD'))
+
+    def test_revs(self):
+        """Test explicit revisions are read in the order given."""
+        hashes = list(iter_revisions('HEAD'))
+        self.assertEqual(len(hashes), 3)
+        commits = list(iter_commits(revs=[hashes[2], hashes[0]]))
+        self.assertEqual([c.hash for c in commits], [hashes[2], hashes[0]])
+
+    def test_parents(self):
+        """Test parent listing for a range."""
+        hashes = list(iter_revisions('HEAD'))
+        parents = list(iter_parents(['HEAD', f'^{hashes[2]}']))
+        self.assertEqual(parents, [[hashes[0], hashes[1]], [hashes[1], hashes[2]]])
+
+    def test_early_stop(self):
+        """Test abandoning the generator does not raise or hang."""
+        stream = iter_commits('HEAD', chunk_size=1)
+        self.assertEqual(next(stream).subject, 'chore: third')
+        stream.close()
+
+    def test_bad_range(self):
+        """Test git errors surface as CalledProcessError."""
+        with self.assertRaises(subprocess.CalledProcessError):
+            list(iter_commits('no-such-ref'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+import github_release
+from github_release import GitHubRelease, UploadProgress
+
+UPLOAD_URL = 'https://uploads.github.com/repos/owner/repo/releases/1/assets'
+RELEASE = {'id': 1, 'upload_url': UPLOAD_URL + '{?name,label}', 'html_url': 'https://github.com/owner/repo/releases/1'}
+BLOCK_SIZE = 16384
+
+def response(status: int, body=None) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status
+    result._content = json.dumps(body if body is not None else {}).encode()
+    return result
+
+class FakeSession:
+    """Answers uploads from a script of outcomes and streams request bodies like urllib3."""
+
+    def __init__(self, outcomes, assets=()):
+        self.outcomes = list(outcomes)
+        self.assets = list(assets)
+        self.calls = []
+        self.uploaded = []
+
+    def post(self, url, data=None, **kwargs):
+        if url.endswith('/releases'):
+            self.calls.append(('create', url))
+            return response(201, RELEASE)
+        self.calls.append(('upload', kwargs['params']['name']))
+        chunks = list(iter(lambda: data.read(BLOCK_SIZE), b''))
+        self.uploaded.append(chunks)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return response(outcome, {'name': kwargs['params']['name']})
+
+    def get(self, url, **kwargs):
+        self.calls.append(('list', url))
+        return response(200, self.assets)
+
+    def delete(self, url, **kwargs):
+        self.calls.append(('delete', url))
+        return response(204)
+
+class TestUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'RinaWarp.dmg')
+        with open(self.path, 'wb') as f:
+            f.write(os.urandom(5 * BLOCK_SIZE + 123))
+        self.gh = GitHubRelease('token', 'owner/repo')
+        patcher = mock.patch.object(github_release.time, 'sleep')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def upload(self, outcomes, assets=()):
+        self.gh.session = FakeSession(outcomes, assets)
+        return self.gh.upload_asset(RELEASE, UPLOAD_URL, self.path)
+
+    def test_retries_server_errors(self):
+        """Test 5xx responses and connection errors are retried until the upload succeeds."""
+        self.assertEqual(self.upload([502, requests.ConnectionError('reset'), 201]), {'name': 'RinaWarp.dmg'})
+        self.assertEqual([call for call in self.gh.session.calls if call[0] == 'upload'],
+                         [('upload', 'RinaWarp.dmg')] * 3)
+
+    def test_gives_up_after_retries(self):
+        """Test the last server error is raised once retries run out."""
+        with self.assertRaises(requests.HTTPError):
+            self.upload([503] * github_release.UPLOAD_RETRIES)
+        self.assertEqual(len(self.gh.session.uploaded), github_release.UPLOAD_RETRIES)
+
+    def test_no_retry_on_client_error(self):
+        """Test 4xx responses fail immediately."""
+        with self.assertRaises(requests.HTTPError):
+            self.upload([422, 201])
+        self.assertEqual(len(self.gh.session.uploaded), 1)
+
+    def test_partial_asset_deleted_before_retry(self):
+        """Test a partial asset left by a failed attempt is deleted before the next one."""
+        assets = [{'id': 7, 'name': 'RinaWarp.dmg'}, {'id': 8, 'name': 'other.exe'}]
+        self.upload([500, 201], assets)
+        self.assertEqual([call[0] for call in self.gh.session.calls], ['upload', 'list', 'delete', 'upload'])
+        self.assertTrue(self.gh.session.calls[2][1].endswith('/releases/assets/7'))
+
+    def test_streams_in_chunks(self):
+        """Test the body is read in blocks, in full, and never as one read of the whole file."""
+        self.upload([201])
+        chunks = self.gh.session.uploaded[0]
+        self.assertEqual(len(chunks), 6)
+        self.assertTrue(all(len(chunk) <= BLOCK_SIZE for chunk in chunks))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(b''.join(chunks), f.read())
+
+    def test_create_release_uploads_all(self):
+        """Test create_release uploads every existing file and skips missing ones."""
+        other = os.path.join(self.tmp.name, 'RinaWarp-Setup.exe')
+        with open(other, 'wb') as f:
+            f.write(b'exe')
+        self.gh.session = FakeSession([201, 201])
+        self.gh.create_release('v1.0.0', 'RinaWarp 1.0.0', '', [self.path, other, 'missing.AppImage'])
+        self.assertEqual(sorted(name for kind, name in self.gh.session.calls if kind == 'upload'),
+                         ['RinaWarp-Setup.exe', 'RinaWarp.dmg'])
+
+class TestUploadProgress(unittest.TestCase):
+    def test_tracks_reads(self):
+        """Test the wrapper reports the file size up front and counts bytes as they are read."""
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'x' * 1000)
+            f.flush()
+            body = UploadProgress(f.name, 'asset')
+            self.assertEqual(len(body), 1000)
+            self.assertEqual(len(body.read(400)), 400)
+            self.assertEqual(body.sent, 400)
+            body.read(1000)
+            self.assertEqual(body.sent, 1000)
+            self.assertEqual(body.read(10), b'')
+            body.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, 'functions'), os.path.join(HERE, 'benchmarks')]
+from aws_stubs import FakeAWS
+from download_records import user_agent_hash
+
+AWS = FakeAWS()
+ENVIRONMENT = {'DOWNLOADS_TABLE': 'downloads', 'USER_AGENTS_TABLE': 'user-agents', 'MANIFEST_BUCKET': 'manifest'}
+with AWS.installed(), mock.patch.dict(os.environ, ENVIRONMENT):
+    import process_download_logs
+from process_download_logs import SeenEvents, event_id, lambda_handler, put_user_agent
+
+def cloudfront_record(request_id=None, uri='/v1.0.0/macos/RinaWarp-Terminal.dmg', user_agent='Mozilla/5.0'):
+    record = {'cf': {'request': json.dumps({'uri': uri, 'headers': {
+        'user-agent': [{'value': user_agent}],
+        'cloudfront-viewer-country': [{'value': 'US'}]
+    }})}}
+    if request_id:
+        record['cf']['config'] = {'requestId': request_id}
+    return record
+
+class TestSeenEvents(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Test the least recently seen ID is evicted first, counting lookups as use."""
+        seen = SeenEvents(2)
+        seen.add('a')
+        seen.add('b')
+        self.assertIn('a', seen)  # 'b' is now least recent
+        seen.add('c')
+        self.assertNotIn('b', seen)
+        self.assertIn('a', seen)
+        self.assertIn('c', seen)
+
+class TestEventId(unittest.TestCase):
+    def test_request_id(self):
+        """Test the CloudFront request ID is the key when present."""
+        self.assertEqual(event_id(cloudfront_record('req-1')), 'req-1')
+
+    def test_content_hash_fallback(self):
+        """Test records without a request ID are keyed by a stable hash of their content."""
+        first, second = cloudfront_record(), cloudfront_record()
+        self.assertEqual(event_id(first), event_id(second))
+        self.assertRegex(event_id(first), r'^[0-9a-f]{64}$')
+        self.assertNotEqual(event_id(first), event_id(cloudfront_record(user_agent='curl/8.0')))
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        # The module's Table resources hold on to these dicts, so empty them in place
+        self.downloads = AWS.tables.setdefault('downloads', {})
+        self.user_agents = AWS.tables.setdefault('user-agents', {})
+        self.downloads.clear()
+        self.user_agents.clear()
+        AWS.metrics.clear()
+        AWS.reset_calls()
+        for name in ('seen_events', 'known_user_agents'):
+            patcher = mock.patch.object(process_download_logs, name, SeenEvents(100))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def ingest(self, *records):
+        lambda_handler({'Records': list(records)}, None)
+
+    def test_warm_retry_dropped(self):
+        """Test a redelivery to the same instance is dropped before any AWS call."""
+        self.ingest(cloudfront_record('req-1'))
+        AWS.reset_calls()
+        self.ingest(cloudfront_record('req-1'))
+        self.assertEqual(AWS.total_calls(), 0)
+        self.assertEqual(len(AWS.metrics), 1)
+
+    def test_conditional_failure_is_duplicate(self):
+        """Test a redelivery to a cold instance hits the conditional write and emits no metric."""
+        self.ingest(cloudfront_record('req-1'))
+        process_download_logs.seen_events = SeenEvents(100)  # Another instance
+        self.ingest(cloudfront_record('req-1'))
+        self.assertEqual(len(self.downloads), 1)
+        self.assertEqual(len(AWS.metrics), 1)
+        self.assertIn('req-1', process_download_logs.seen_events)
+
+    def test_failed_write_is_retried(self):
+        """Test a failed write still counts the download but is not marked seen, so a retry writes it."""
+        error = ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': ''}}, 'PutItem')
+        with mock.patch.object(process_download_logs.downloads_table, 'put_item', side_effect=error):
+            self.ingest(cloudfront_record('req-1'))
+        self.assertNotIn('req-1', process_download_logs.seen_events)
+        self.assertEqual(len(self.downloads), 0)
+        self.assertEqual(len(AWS.metrics), 1)
+
+        self.ingest(cloudfront_record('req-1'))
+        self.assertEqual(len(self.downloads), 1)
+        self.assertIn('req-1', process_download_logs.seen_events)
+
+    def test_user_agent_written_once(self):
+        """Test each user agent is written once, then served from the cache."""
+        self.ingest(*(cloudfront_record(f'req-{i}') for i in range(3)))
+        self.assertEqual(AWS.calls['dynamodb:PutItem'], 3 + 1)
+        self.assertEqual(self.user_agents[user_agent_hash('Mozilla/5.0')]['user_agent'], 'Mozilla/5.0')
+
+    def test_user_agent_known_elsewhere(self):
+        """Test a user agent another instance already stored is cached after one conditional write."""
+        ua_hash = user_agent_hash('curl/8.0')
+        self.user_agents[ua_hash] = {'ua_hash': ua_hash, 'user_agent': 'curl/8.0'}
+        self.assertEqual(put_user_agent('curl/8.0'), ua_hash)
+        self.assertEqual(put_user_agent('curl/8.0'), ua_hash)
+        self.assertEqual(AWS.calls['dynamodb:PutItem'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import gzip
+import hashlib
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'functions'))
+import publishing
+
+class RecordingS3:
+    """Keeps put_object calls by key."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, **kwargs):
+        self.objects[kwargs['Key']] = kwargs
+
+class TestPublishing(unittest.TestCase):
+    def setUp(self):
+        self.s3 = RecordingS3()
+        self.body = json.dumps({'latest': '1.0.0'}) * 50
+        self.digest = hashlib.sha256(self.body.encode()).hexdigest()
+
+    def test_hashed_key(self):
+        """Test the content hash goes before the extension."""
+        self.assertEqual(publishing.hashed_key('reports/manifest.json', 'ab' * 32),
+                         'reports/manifest.' + 'ab' * 8 + '.json')
+
+    def test_pointer_key(self):
+        """Test the pointer sits next to the object."""
+        self.assertEqual(publishing.pointer_key('reports/manifest.json'), 'reports/manifest.current.json')
+
+    def test_publish_layout(self):
+        """Test every encoding is stored immutably and the pointer references them."""
+        record = publishing.publish_object(self.s3, 'bucket', 'manifest.json', self.body, 'application/json')
+
+        base_key = f"manifest.{self.digest[:16]}.json"
+        self.assertEqual(record['key'], base_key)
+        self.assertEqual(record['sha256'], self.digest)
+
+        expected = {'identity': base_key, 'gzip': base_key + '.gz'}
+        if publishing.brotli is not None:
+            expected['br'] = base_key + '.br'
+        self.assertEqual({encoding: info['key'] for encoding, info in record['encodings'].items()}, expected)
+
+        for encoding, key in expected.items():
+            stored = self.s3.objects[key]
+            self.assertEqual(stored['CacheControl'], publishing.IMMUTABLE_CACHE_CONTROL)
+            self.assertEqual(stored['ContentType'], 'application/json')
+            self.assertEqual(stored.get('ContentEncoding'), None if encoding == 'identity' else encoding)
+            self.assertEqual(record['encodings'][encoding]['size'], len(stored['Body']))
+        self.assertEqual(gzip.decompress(self.s3.objects[base_key + '.gz']['Body']), self.body.encode())
+
+        pointer = self.s3.objects['manifest.current.json']
+        self.assertEqual(pointer['CacheControl'], publishing.POINTER_CACHE_CONTROL)
+        self.assertEqual(json.loads(pointer['Body']), record)
+
+    def test_custom_pointer(self):
+        """Test an explicit pointer key replaces the default one."""
+        publishing.publish_object(self.s3, 'bucket', 'a.html', '<html></html>', 'text/html', pointer='latest.json')
+        self.assertIn('latest.json', self.s3.objects)
+        self.assertNotIn('a.current.json', self.s3.objects)
+
+    def test_stable_keys(self):
+        """Test republishing identical content reuses the same keys."""
+        first = publishing.publish_object(self.s3, 'bucket', 'manifest.json', self.body, 'application/json')
+        second = publishing.publish_object(self.s3, 'bucket', 'manifest.json', self.body.encode(), 'application/json')
+        self.assertEqual(first, second)
+
+    def test_publish_manifest(self):
+        """Test a manifest publish writes the hashed copies, the pointer and the legacy manifest.json."""
+        record = publishing.publish_manifest(self.s3, 'bucket', self.body)
+        self.assertEqual(json.loads(self.s3.objects['manifest.current.json']['Body']), record)
+        self.assertIn(record['encodings']['gzip']['key'], self.s3.objects)
+
+        legacy = self.s3.objects['manifest.json']
+        self.assertEqual(legacy['Body'], self.body.encode())
+        self.assertEqual(legacy['CacheControl'], publishing.POINTER_CACHE_CONTROL)
+        self.assertEqual(list(self.s3.objects)[-1], 'manifest.json')  # Written last
+
+if __name__ == '__main__':
+    unittest.main()
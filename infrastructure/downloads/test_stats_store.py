@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports'))
+from stats_store import StatsStore
+
+def daily_frame(rows):
+    return pd.DataFrame(rows, columns=['date', 'version', 'platform', 'downloads'])
+
+class TestStatsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'store')
+        self.daily = daily_frame([
+            ('2024-06-01', '1.0.0', 'macos', 10),
+            ('2024-06-01', '1.0.0', 'windows', 7),
+            ('2024-06-02', '1.1.0-beta.1', 'linux', 3)
+        ])
+        self.cumulative = pd.DataFrame({
+            'version': ['1.0.0', '1.1.0-beta.1'],
+            'platform': ['macos', 'linux'],
+            'downloads': [100, 3]
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_daily(self, frame, rows):
+        self.assertEqual(
+            [(d.strftime('%Y-%m-%d'), v, p, int(n)) for d, v, p, n in frame.itertuples(index=False)],
+            rows
+        )
+
+    def test_round_trip(self):
+        """Test rows read back as written, from a fresh instance, with and without mmap."""
+        store = StatsStore(self.path)
+        self.assertEqual(store.import_stats(self.daily, self.cumulative), 3)
+
+        for mmap in (True, False):
+            daily, cumulative = StatsStore(self.path).read(mmap=mmap)
+            self.assert_daily(daily, list(self.daily.itertuples(index=False, name=None)))
+            self.assertEqual(list(cumulative['version']), ['1.0.0', '1.1.0-beta.1'])
+            self.assertEqual(list(cumulative['downloads']), [100, 3])
+
+    def test_import_skips_stored_dates(self):
+        """Test re-importing only appends dates not yet stored and extends the dictionaries."""
+        StatsStore(self.path).import_stats(self.daily, self.cumulative)
+        more = pd.concat([self.daily, daily_frame([('2024-06-03', '1.1.0', 'macos', 5)])])
+
+        store = StatsStore(self.path)
+        self.assertEqual(store.import_stats(more, self.cumulative), 1)
+        daily, _ = StatsStore(self.path).read()
+        self.assertEqual(len(daily), 4)
+        self.assert_daily(daily.tail(1), [('2024-06-03', '1.1.0', 'macos', 5)])
+        self.assertEqual(store.meta['versions'], ['1.0.0', '1.1.0-beta.1', '1.1.0'])
+
+    def test_empty_store(self):
+        """Test a missing store reads as empty frames."""
+        daily, cumulative = StatsStore(self.path).read()
+        self.assertTrue(daily.empty)
+        self.assertTrue(cumulative.empty)
+
+    def test_unfinished_append_is_dropped(self):
+        """Test column bytes past the committed row count are truncated on the next append."""
+        store = StatsStore(self.path)
+        store.append_daily(self.daily)
+        with open(store._column_path('daily', 'downloads'), 'ab') as f:
+            f.write(b'\xff' * 8)  # An append that never reached meta.json
+
+        store.append_daily(daily_frame([('2024-06-04', '1.0.0', 'macos', 1)]))
+        daily, _ = StatsStore(self.path).read(mmap=False)
+        self.assertEqual(list(daily['downloads']), [10, 7, 3, 1])
+
+    def test_rejects_negative_counts(self):
+        """Test counts outside int32 range are refused."""
+        with self.assertRaises(ValueError):
+            StatsStore(self.path).append_daily(daily_frame([('2024-06-01', '1.0.0', 'macos', -1)]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,29 +6,39 @@ import requests
 import sys
 import time
 import concurrent.futures
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 
 def get_manifest(manifest_url: str) -> dict:
-    """Fetch and parse the version manifest."""
-    response = requests.get(manifest_url)
-    response.raise_for_status()
-    return response.json()
+    """Fetch and parse the version manifest.
 
-def download_file(url: str) -> bytes:
-    """Download a file and return its contents."""
-    response = requests.get(url, stream=True)
+    A ``*.current.json`` pointer is followed to the immutable gzip copy.
+    """
+    response = requests.get(manifest_url)
     response.raise_for_status()
-    return response.content
+    data = response.json()
+    if manifest_url.endswith('.current.json'):
+        encodings = data['encodings']
+        key = encodings.get('gzip', encodings['identity'])['key']
+        response = requests.get(urljoin(manifest_url, f"/{key}"))
+        response.raise_for_status()
+        data = response.json()
+    return data
 
-def calculate_md5(content: bytes) -> str:
-    """Calculate MD5 hash of content."""
-    return hashlib.md5(content).hexdigest()
+def download_checksum(url: str, session: Optional[requests.Session] = None) -> str:
+    """Download a file and return its MD5, hashing chunks as they arrive."""
+    md5_hash = hashlib.md5()
+    with (session or requests).get(url, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
+            md5_hash.update(chunk)
+    return md5_hash.hexdigest()
 
-def validate_download(url: str, expected_checksum: str) -> Tuple[str, bool, str]:
+def validate_download(url: str, expected_checksum: str,
+                      session: Optional[requests.Session] = None) -> Tuple[str, bool, str]:
     """Validate a single download."""
     try:
-        content = download_file(url)
-        actual_checksum = calculate_md5(content)
+        actual_checksum = download_checksum(url, session)
         is_valid = actual_checksum == expected_checksum
         message = "OK" if is_valid else f"Checksum mismatch: expected {expected_checksum}, got {actual_checksum}"
         return url, is_valid, message
@@ -82,7 +92,7 @@ def validate_version(manifest: dict, version: str, include_beta: bool = False) -
 
 def main():
     parser = argparse.ArgumentParser(description="Validate RinaWarp downloads")
-    parser.add_argument("--manifest", default="https://downloads.rinawarptech.com/manifest.json",
+    parser.add_argument("--manifest", default="https://downloads.rinawarptech.com/manifest.current.json",
                       help="URL to version manifest")
     parser.add_argument("--version", help="Specific version to validate")
     parser.add_argument("--include-beta", action="store_true",
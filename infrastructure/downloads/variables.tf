@@ -67,3 +67,33 @@ variable "monitor_schedule" {
   type        = string
   default     = "rate(1 day)"
 }
+
+variable "stage_metrics_enabled" {
+  description = "Emit per-stage Lambda timings as CloudWatch embedded metrics"
+  type        = bool
+  default     = true
+}
+
+variable "profile_sample_rate" {
+  description = "Fraction of Lambda invocations to profile with cProfile and tracemalloc (0 disables)"
+  type        = number
+  default     = 0
+}
+
+variable "year_month_shards" {
+  description = "Write shards per month in the downloads YearMonthIndex (may be raised, never lowered)"
+  type        = number
+  default     = 8
+}
+
+variable "archive_after_days" {
+  description = "Age in days at which download records are exported to the S3 archive"
+  type        = number
+  default     = 90
+}
+
+variable "archive_grace_days" {
+  description = "Days archived download records stay in DynamoDB before TTL expiry"
+  type        = number
+  default     = 14
+}